@@ -0,0 +1,139 @@
+"""
+Load test of the micro-batching bid service.
+
+Starts ``src.utils.bid_server`` on localhost (or targets ``--url``), then
+runs concurrent keep-alive clients that each send ``--requests`` random
+``POST /bid`` calls. Reports throughput, latency percentiles, errors and the
+server's batch statistics, once per ``--max-batch-size`` given, so batching
+can be compared against one-request-per-evaluation (``--max-batch-size 1``).
+
+    python benchmarks/bid_service_load_test.py --clients 32 --requests 200 --max-batch-size 1 64
+    python -m src.utils.bid_server --port 8810 &  python benchmarks/bid_service_load_test.py --url http://127.0.0.1:8810
+
+Clients and an in-process server share one interpreter (and its GIL); run the
+server separately with ``--url`` for numbers closer to production.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def run_client(url, agents, requests, seed, latencies, errors):
+    """Sends `requests` bids over one keep-alive connection, appending per-call latencies in ms."""
+    address = urlparse(url)
+    connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+    rng = random.Random(seed)
+    try:
+        for _ in range(requests):
+            body = json.dumps({"agent": rng.choice(agents), "market_threshold": rng.uniform(50, 150),
+                               "rounds_remaining": rng.randint(0, 20)})
+            start = time.perf_counter()
+            try:
+                connection.request("POST", "/bid", body, {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+            except (OSError, http.client.HTTPException) as e:
+                errors.append(repr(e))
+                connection.close()
+                connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        connection.close()
+
+
+def health(url):
+    address = urlparse(url)
+    connection = http.client.HTTPConnection(address.hostname, address.port, timeout=10)
+    try:
+        connection.request("GET", "/health")
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def load_test(url, clients, requests, seed):
+    """Runs the clients against `url` and returns the throughput/latency summary."""
+    agents = health(url)["agents"]
+    before = health(url)
+    latencies, errors = [], []
+    threads = [threading.Thread(target=run_client, args=(url, agents, requests, seed + i, latencies, errors))
+               for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    after = health(url)
+
+    samples = np.array(latencies)
+    batches = after["batches"] - before["batches"]
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p90_ms": float(np.percentile(samples, 90)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "mean_batch": (after["requests"] - before["requests"]) / batches if batches else 0.0,
+        "largest_batch": after["largest_batch"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency/throughput load test of the bid service")
+    parser.add_argument("--url", default=None, help="Running bid service to test (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent keep-alive client connections")
+    parser.add_argument("--requests", type=int, default=200, help="Bids per client")
+    parser.add_argument("--agents", type=int, default=5, help="Agents served by the in-process service")
+    parser.add_argument("--max-batch-size", type=int, nargs="+", default=[1, 64],
+                        help="Batch sizes to compare with the in-process service")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Micro-batching window of the in-process service")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = {}
+    if args.url:
+        results[args.url] = load_test(args.url, args.clients, args.requests, args.seed)
+    else:
+        import torch
+        from src.utils.logger import configure_logging
+        from src.utils.bid_server import load_agents, start_bid_server
+
+        configure_logging("bench")
+        torch.manual_seed(args.seed)
+        agents = load_agents(count=args.agents)
+        for max_batch_size in args.max_batch_size:
+            server = start_bid_server(agents, max_batch_size=max_batch_size, max_wait=args.max_wait_ms / 1000)
+            try:
+                results[f"max_batch_size={max_batch_size}"] = load_test(server.url, args.clients, args.requests,
+                                                                        args.seed)
+            finally:
+                server.stop()
+
+    print(f"\n{'service':<22}{'req/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'batch':>8}{'errors':>8}")
+    for name, result in results.items():
+        print(f"{name:<22}{result['requests_per_s']:>10.0f}{result['p50_ms']:>9.2f}{result['p90_ms']:>9.2f}"
+              f"{result['p99_ms']:>9.2f}{result['mean_batch']:>8.1f}{result['errors']:>8}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"clients": args.clients, "requests": args.requests, "results": results}, file, indent=4)
+        print(f" Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Convergence benchmark for DQN training modes.
+
+Runs the bidding loop with several training configurations and reports how
+many rounds (and optimizer steps) each agent needs before its policy is
+stable, i.e. the Q-values at the probe states used by ``summarize_results``
+stop moving by more than a relative tolerance for a number of consecutive
+rounds.
+
+    python benchmarks/convergence_benchmark.py --seeds 3 --max-rounds 1500
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.market.market_threshold import MarketStatistics, dynamic_market_threshold
+
+MODES = {
+    "legacy": {},
+    "replay": {"replay_capacity": 2000, "batch_size": 32},
+    "td_hard": {"replay_capacity": 2000, "batch_size": 32, "td_target": True, "target_sync_every": 50},
+    "td_polyak": {"replay_capacity": 2000, "batch_size": 32, "td_target": True, "target_tau": 0.05},
+}
+
+
+def rounds_to_stable(q_trace, tolerance, window):
+    """First round after which Q-values stay within `tolerance` (relative) for `window` rounds."""
+    q_trace = np.asarray(q_trace)
+    change = np.abs(np.diff(q_trace, axis=0)) / (np.abs(q_trace[:-1]) + 1.0)
+    stable = change.max(axis=1) < tolerance
+
+    run = 0
+    for round_num, is_stable in enumerate(stable, start=2):
+        run = run + 1 if is_stable else 0
+        if run >= window:
+            return round_num - window + 1
+    return None
+
+
+def run_episode(mode_kwargs, seed, num_agents, max_rounds, tolerance, window):
+    """Runs one seeded episode and returns per-agent convergence results."""
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    agents = [DQNBiddingAgent(name=f"Agent {i}", **mode_kwargs) for i in range(1, num_agents + 1)]
+    threshold = 100
+    market_stats = MarketStatistics()
+    q_traces = {agent.name: [] for agent in agents}
+    step_traces = {agent.name: [] for agent in agents}
+
+    for round_num in range(1, max_rounds + 1):
+        bids = {agent.name: agent.generate_bid(threshold, max_rounds - round_num) for agent in agents}
+        winning_bid = min(bids.values())
+
+        for agent in agents:
+            agent.update_reward(10 if bids[agent.name] == winning_bid else -5)
+            q_traces[agent.name].append(agent.sample_q_values())
+            step_traces[agent.name].append(agent.train_steps)
+
+        market_stats.update(list(bids.values()))
+        threshold = dynamic_market_threshold(threshold, market_stats)
+
+    results = []
+    for agent in agents:
+        stable_round = rounds_to_stable(q_traces[agent.name], tolerance, window)
+        steps = step_traces[agent.name][stable_round - 1] if stable_round else None
+        results.append({"agent": agent.name, "rounds_to_stable": stable_round, "steps_to_stable": steps})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rounds-to-stable-policy benchmark for DQN training modes")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--max-rounds", type=int, default=1500)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="Relative Q-value change counted as stable")
+    parser.add_argument("--window", type=int, default=50, help="Consecutive stable rounds required")
+    parser.add_argument("--output", help="Optional JSON file for the raw results")
+    args = parser.parse_args()
+
+    report = {}
+    for mode in args.modes:
+        results = []
+        for seed in range(args.seeds):
+            results.extend(run_episode(MODES[mode], seed, args.agents, args.max_rounds, args.tolerance, args.window))
+
+        converged = [r for r in results if r["rounds_to_stable"] is not None]
+        report[mode] = {
+            "converged_agents": len(converged),
+            "total_agents": len(results),
+            "mean_rounds_to_stable": float(np.mean([r["rounds_to_stable"] for r in converged])) if converged else None,
+            "mean_steps_to_stable": float(np.mean([r["steps_to_stable"] for r in converged])) if converged else None,
+            "agents": results,
+        }
+
+    baseline = report.get("legacy", {}).get("mean_steps_to_stable")
+    print(f"\n{'mode':<12}{'converged':>12}{'rounds':>12}{'opt steps':>12}{'steps saved':>14}")
+    for mode, summary in report.items():
+        rounds = summary["mean_rounds_to_stable"]
+        steps = summary["mean_steps_to_stable"]
+        saved = baseline - steps if baseline is not None and steps is not None else None
+        print(f"{mode:<12}{summary['converged_agents']:>6}/{summary['total_agents']:<5}"
+              f"{rounds if rounds is not None else '-':>12}"
+              f"{steps if steps is not None else '-':>12}"
+              f"{saved if saved is not None else '-':>14}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+        print(f"\n Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Micro-benchmarks for the simulation hot paths.
+
+Times each path in isolation (``generate_bid``, ``update_reward``,
+``dynamic_market_threshold``, ``save_bid_data``, ``NegotiationLogic.negotiate_bids``)
+and a full ``BiddingSimulation`` round, with AI disabled or answered by the
+in-process stub. Reports per-call latency percentiles and calls (rounds) per
+second, and compares the p50 against a stored JSON baseline.
+
+    python benchmarks/hot_paths_benchmark.py --save-baseline          # record a baseline
+    python benchmarks/hot_paths_benchmark.py --threshold 0.2          # exit 1 on a >20% p50 regression
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.logger import configure_logging
+from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.core.negotiation_logic import NegotiationLogic
+from src.market.market_threshold import MarketStatistics, dynamic_market_threshold
+from src.utils.data_handler import BidHistoryWriter
+from src.utils.llm_client import LLMClient, set_llm_client
+from src.utils.llm_providers import StubProvider
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines", "hot_paths.json")
+
+
+def measure(call, iterations, warmup, setup=None):
+    """Per-call wall times in microseconds; `setup` runs untimed before every call."""
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        call()
+
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        call()
+        samples[i] = time.perf_counter_ns() - start
+    return samples / 1000
+
+
+def summarize(samples_us):
+    return {
+        "calls": len(samples_us),
+        "mean_us": float(samples_us.mean()),
+        "p50_us": float(np.percentile(samples_us, 50)),
+        "p90_us": float(np.percentile(samples_us, 90)),
+        "p99_us": float(np.percentile(samples_us, 99)),
+        "per_sec": float(1e6 / samples_us.mean()),
+    }
+
+
+def make_agents(count, ai_enabled, cls=DQNBiddingAgent):
+    return [cls(name=f"Agent {i}", ai_enabled=ai_enabled) for i in range(1, count + 1)]
+
+
+def bench_generate_bid(args):
+    agent = make_agents(1, args.ai)[0]
+    return {"call": lambda: agent.generate_bid(100.0, 10)}
+
+
+def bench_update_reward(args):
+    agent = make_agents(1, args.ai)[0]
+    return {"call": lambda: agent.update_reward(10), "setup": lambda: agent.generate_bid(100.0, 10)}
+
+
+def bench_dynamic_market_threshold(args):
+    stats = MarketStatistics()
+    stats.update(list(np.random.uniform(80, 120, args.agents)))
+    return {"call": lambda: dynamic_market_threshold(100.0, stats)}
+
+
+def bench_save_bid_data(args):
+    tmp_dir = tempfile.mkdtemp()
+    writer = BidHistoryWriter(os.path.join(tmp_dir, "bid_history.csv"))  # Default batching: flushes amortised
+    simulation = BiddingSimulation(agents=make_agents(args.agents, False), persist=True, verbose=False, writer=writer)
+    bids = {f"Agent {i}": 100.0 - i for i in range(1, args.agents + 1)}
+    round_num = iter(range(1, 10 ** 9))
+
+    def teardown():
+        writer.close()
+        shutil.rmtree(tmp_dir)
+
+    return {"call": lambda: simulation.save_bid_data(next(round_num), bids, min(bids.values())),
+            "teardown": teardown}
+
+
+def bench_negotiate_bids(args):
+    logic = NegotiationLogic(make_agents(args.agents, args.ai, NegotiationAgent))
+    initial = {f"Agent {i}": float(v) for i, v in enumerate(np.random.uniform(80, 120, args.agents), start=1)}
+    return {"call": lambda: logic.negotiate_bids(100.0, dict(initial))}
+
+
+def bench_simulation_round(args):
+    simulation = BiddingSimulation(agents=make_agents(args.agents, args.ai), rounds=10 ** 9, persist=False,
+                                   verbose=False)
+    round_num = iter(range(1, 10 ** 9))
+    return {"call": lambda: simulation.run_round(next(round_num))}
+
+
+CASES = {
+    "generate_bid": bench_generate_bid,
+    "update_reward": bench_update_reward,
+    "dynamic_market_threshold": bench_dynamic_market_threshold,
+    "save_bid_data": bench_save_bid_data,
+    "negotiate_bids": bench_negotiate_bids,
+    "simulation_round": bench_simulation_round,
+}
+
+
+def compare(results, baseline, threshold):
+    """Relative p50 change per case against the baseline; cases slower by more than `threshold` are flagged."""
+    report = {}
+    for case, result in results.items():
+        reference = baseline.get("cases", {}).get(case)
+        if reference is None:
+            continue
+        change = result["p50_us"] / reference["p50_us"] - 1
+        report[case] = {"baseline_p50_us": reference["p50_us"], "change": change, "regression": change > threshold}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the bidding simulation hot paths")
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--iterations", type=int, default=2000, help="Timed calls per case")
+    parser.add_argument("--warmup", type=int, default=200, help="Untimed calls per case")
+    parser.add_argument("--round-iterations", type=int, default=300, help="Timed calls for negotiate_bids / simulation_round")
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--llm", choices=["off", "stub"], default="off",
+                        help="off: AI disabled; stub: AI enabled and answered by the in-process stub")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON to compare against / save to")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative p50 slowdown flagged as a regression")
+    parser.add_argument("--output", help="Optional JSON file for the raw results")
+    args = parser.parse_args()
+    args.ai = args.llm == "stub"
+
+    configure_logging("bench")  # Keep log formatting out of the timings
+    set_llm_client(LLMClient(provider=StubProvider()) if args.ai else LLMClient(api_key=""))
+    results = {}
+    try:
+        for case in args.cases:
+            random.seed(args.seed)
+            np.random.seed(args.seed)
+            torch.manual_seed(args.seed)
+            bench = CASES[case](args)
+            heavy = case in ("negotiate_bids", "simulation_round")
+            iterations = args.round_iterations if heavy else args.iterations
+            warmup = max(1, args.warmup // 10) if heavy else args.warmup
+            try:
+                results[case] = summarize(measure(bench["call"], iterations, warmup, bench.get("setup")))
+            finally:
+                if "teardown" in bench:
+                    bench["teardown"]()
+    finally:
+        set_llm_client(None)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if (baseline.get("llm"), baseline.get("agents")) != (args.llm, args.agents):
+            print(f" ⚠️ Baseline {args.baseline} was recorded with different --llm/--agents settings; not comparing")
+            baseline = {}
+    comparison = compare(results, baseline, args.threshold)
+
+    print(f"\n{'case':<26}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'calls/s':>12}{'vs base':>10}")
+    for case, result in results.items():
+        change = comparison.get(case)
+        flag = f"{change['change']:>+9.0%}{' ⚠️ REGRESSION' if change['regression'] else ''}" if change else f"{'-':>9}"
+        print(f"{case:<26}{result['p50_us']:>10.1f}{result['p90_us']:>10.1f}{result['p99_us']:>10.1f}"
+              f"{result['per_sec']:>12.0f} {flag}")
+    if "simulation_round" in results:
+        print(f"\n Full round: {results['simulation_round']['per_sec']:.1f} rounds/s")
+
+    run = {"llm": args.llm, "agents": args.agents, "python": platform.python_version(),
+           "torch": torch.__version__, "machine": platform.machine(), "cases": results}
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(run, file, indent=4)
+        print(f" Baseline written to {args.baseline}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({**run, "comparison": comparison}, file, indent=4)
+        print(f" Results written to {args.output}")
+
+    regressions = [case for case, change in comparison.items() if change["regression"]]
+    if regressions:
+        print(f" ⚠️ Regressions above {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
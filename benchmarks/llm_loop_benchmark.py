@@ -0,0 +1,117 @@
+"""
+Offline benchmark of the LLM-in-the-loop simulation.
+
+Starts the local stub chat-completions server with a configurable latency,
+jitter and error rate, then runs the AI-enabled bidding loop in sync and
+async mode against it and reports rounds per second, per-round latency
+percentiles, response-cache statistics and the error rate the server
+actually injected. SDK retries are off unless ``--max-retries`` is given, so
+failures and latencies are measured as configured. No API key or network
+needed.
+
+    python benchmarks/llm_loop_benchmark.py --rounds 20 --latency 0.05 --jitter 0.02
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.utils.llm_client import LLMClient, ResponseCache, set_llm_client
+from src.utils.llm_stub_server import start_stub_server
+
+
+class TimedSimulation(BiddingSimulation):
+    """Records the wall time of every round."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_times = []
+
+    def settle_round(self, *args, **kwargs):
+        result = super().settle_round(*args, **kwargs)
+        now = time.perf_counter()
+        self.round_times.append(now - self.round_started)
+        self.round_started = now
+        return result
+
+
+def run_mode(async_llm, args, server):
+    """Runs one seeded AI-enabled simulation and returns its timing report."""
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    torch.manual_seed(args.seed)
+
+    cache = ResponseCache(max_entries=args.cache_size)
+    llm = LLMClient(api_key="offline", base_url=server.url, cache=cache, bucket=args.bucket,
+                    max_retries=args.max_retries)
+    requests, errors = server.requests, server.errors
+    set_llm_client(llm)
+
+    agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=True) for i in range(1, args.agents + 1)]
+    simulation = TimedSimulation(agents=agents, rounds=args.rounds, persist=False, verbose=False,
+                                 async_llm=async_llm, llm_concurrency=args.concurrency, llm_timeout=args.timeout)
+    start = time.perf_counter()
+    simulation.round_started = start
+    simulation.run_simulation()
+    elapsed = time.perf_counter() - start
+
+    round_ms = np.asarray(simulation.round_times) * 1000
+    return {
+        "rounds_per_sec": args.rounds / elapsed,
+        "p50_ms": float(np.percentile(round_ms, 50)),
+        "p95_ms": float(np.percentile(round_ms, 95)),
+        "p99_ms": float(np.percentile(round_ms, 99)),
+        "llm": llm.stats(),
+        "server_requests": server.requests - requests,  # Includes SDK retries
+        "error_rate": (server.errors - errors) / max(1, server.requests - requests),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline sync vs async LLM-in-the-loop benchmark")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub round trip in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub calls failing with HTTP 500")
+    parser.add_argument("--max-retries", type=int, default=0, help="SDK retries of failed requests")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--cache-size", type=int, default=1024, help="LRU entries (0 disables the cache)")
+    parser.add_argument("--bucket", type=float, default=1.0, help="Prompt price quantisation bucket")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional JSON file for the raw results")
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed)
+    try:
+        report = {mode: run_mode(mode == "async", args, server) for mode in ("sync", "async")}
+    finally:
+        set_llm_client(None)
+        server.stop()
+
+    print(f"\n{'mode':<8}{'rounds/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'requests':>10}{'hits':>8}"
+          f"{'errors':>8}")
+    for mode, result in report.items():
+        print(f"{mode:<8}{result['rounds_per_sec']:>10.2f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+              f"{result['p99_ms']:>10.1f}{result['llm']['requests']:>10}{result['llm']['hits']:>8}"
+              f"{result['error_rate']:>8.1%}")
+    print(f" SDK retries per request: {args.max_retries}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"max_retries": args.max_retries, "error_rate": args.error_rate, "results": report}, file,
+                      indent=4)
+        print(f"\n Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
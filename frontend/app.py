@@ -1,22 +1,23 @@
 import os
+import sys
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import seaborn as sns
 import matplotlib.pyplot as plt
-from openai import OpenAI
-from dotenv import load_dotenv
 
-#  Load OpenAI API Key
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Make the project root importable when launched via `streamlit run frontend/app.py`
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-#  Initialize OpenAI Client
-client = OpenAI(api_key=OPENAI_API_KEY)
+from src.utils.llm_client import get_llm_client
+from src.utils.llm_background import BackgroundLLM
+from src.utils.bid_rollups import BidRollups
+from src.utils.bid_stream import BidStreamConsumer
 
 #  File path for bid data
 DATA_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../data/bid_history.csv"))
+PARQUET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../data/bid_history"))
 
 #  Streamlit UI Setup
 st.set_page_config(
@@ -40,52 +41,104 @@ if theme == "Dark Mode":
         unsafe_allow_html=True,
     )
 
-#  Load Bid Data Function
-@st.cache_data
-def load_bid_data():
-    """Loads bid data from CSV."""
-    if not os.path.exists(DATA_FILE):
-        return pd.DataFrame()
-    return pd.read_csv(DATA_FILE)
+#  Bid-history rollups: one shared instance per file, tailed on every rerun
+@st.cache_resource
+def bid_rollups():
+    """Aggregates from the Parquet store if present, otherwise from the CSV."""
+    return BidRollups(PARQUET_DIR if os.path.isdir(PARQUET_DIR) else DATA_FILE)
+
+#  Derived views are cached on the rollup version (file mtime, byte offset), so reruns
+#  that only change widgets reuse them and new rows invalidate them
+@st.cache_data(max_entries=64)
+def trend_data(version, rounds, agents, max_points):
+    return bid_rollups().trend(rounds, list(agents), max_points)
+
+@st.cache_data(max_entries=64)
+def summary_data(version, rounds, agents):
+    return bid_rollups().agent_summary(rounds, list(agents))
+
+@st.cache_data(max_entries=64)
+def sample_data(version, rounds, agents):
+    return bid_rollups().bid_sample(rounds, list(agents))
+
+@st.cache_data(max_entries=8)
+def csv_export(version, rounds, agents):
+    return bid_rollups().rows(rounds, list(agents)).to_csv(index=False)
+
+#  Live stream consumer: one socket listener shared by all sessions (`python main.py --stream`)
+@st.cache_resource
+def bid_stream():
+    return BidStreamConsumer()
+
+def live_rounds(consumer, points=500):
+    """Latest streamed rounds; a background thread receives, so a slow page never blocks the simulation."""
+    frame = consumer.bids_frame().tail(points)
+    if frame.empty:
+        st.info("📡 Waiting for rounds... start a run with `python main.py --stream`.")
+        return
+    latest = consumer.latest()[-1]
+    st.metric("Latest Round", latest["round"], f"Winning bid {latest['winning_bid']:.2f}", delta_color="off")
+    st.line_chart(frame)
+
+def long_form(trend):
+    """Wide (Round x Agent) trend frame to the long Round/Agent/Bid layout used by the plots."""
+    return trend.reset_index().melt(id_vars="Round", var_name="Agent", value_name="Bid").dropna()
+
+#  LLM calls run on a background pool: reruns never wait on them, replies are cached per prompt
+@st.cache_resource
+def background_llm():
+    return BackgroundLLM(timeout=20.0)
 
 #  Fetch AI-Powered Bidding Insights
 def get_ai_bid_suggestion(market_threshold):
-    """Fetch AI-powered bidding advice."""
-    if not OPENAI_API_KEY:
+    """Fetch AI-powered bidding advice (None while the reply is on its way)."""
+    llm = get_llm_client()
+    if not llm.enabled:
         return "⚠️ OpenAI API Key is missing."
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an AI expert in market bidding strategies."},
-                {"role": "user", "content": f"The current market threshold is {market_threshold}. Suggest an optimal bid."}
-            ]
-        )
-        return response.choices[0].message.content.strip()
+        #  Quantised threshold: nearby thresholds share one cached answer
+        return background_llm().get([
+            {"role": "system", "content": "You are an AI expert in market bidding strategies."},
+            {"role": "user", "content": f"The current market threshold is {llm.quantize(market_threshold)}. Suggest an optimal bid."}
+        ])
     except Exception as e:
         return f"⚠️ OpenAI API Error: {e}"
 
 #  AI Chatbot Function
 def chat_with_ai(user_input):
-    """Chatbot to answer user questions about bidding strategies."""
-    if not OPENAI_API_KEY:
+    """Chatbot to answer user questions about bidding strategies (None while the reply is on its way)."""
+    llm = get_llm_client()
+    if not llm.enabled:
         return "⚠️ OpenAI API Key is missing."
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an AI chatbot specialized in market bidding, auctions, and competitive bidding strategies."},
-                {"role": "user", "content": user_input}
-            ]
-        )
-        return response.choices[0].message.content.strip()
+        return background_llm().get([
+            {"role": "system", "content": "You are an AI chatbot specialized in market bidding, auctions, and competitive bidding strategies."},
+            {"role": "user", "content": user_input}
+        ])
     except Exception as e:
         return f"⚠️ AI Chatbot Error: {e}"
 
-#  Load Data
-df = load_bid_data()
+def fill_in(fetch, show, waiting):
+    """Renders `show(fetch())` once the reply is there; a fragment polls every second until then."""
+    def body():
+        result = fetch()
+        if result is None:
+            st.caption(waiting)
+        else:
+            show(result)
+
+    if hasattr(st, "fragment"):
+        st.fragment(run_every=1.0)(body)()
+    else:
+        body()
+
+#  Load Data: only rows appended since the last rerun are parsed
+rollups = bid_rollups()
+rollups.refresh()
+version = rollups.version
+round_range = rollups.round_range()
 
 #  Header
 st.title(" AI Multi-Agent Bidding Dashboard")
@@ -96,54 +149,68 @@ st.sidebar.subheader("💬 AI Bidding Chatbot")
 user_query = st.sidebar.text_input("Ask me anything about market bidding!")
 
 if user_query:
-    ai_response = chat_with_ai(user_query)
-    st.sidebar.write(f"🤖 AI: {ai_response}")
+    with st.sidebar:
+        fill_in(lambda: chat_with_ai(user_query), lambda reply: st.write(f"🤖 AI: {reply}"), "🤖 Thinking...")
+
+#  Live Bid Stream: redrawn on its own every second when fragments are available
+st.sidebar.header("📡 Live Stream")
+if st.sidebar.checkbox("Show Live Rounds", value=False):
+    st.subheader("📡 Live Rounds")
+    consumer = bid_stream()
+    if hasattr(st, "fragment"):
+        st.fragment(run_every=1.0)(live_rounds)(consumer)
+    else:
+        live_rounds(consumer)
 
 #  No Data Warning
-if df.empty:
+if round_range is None:
     st.warning("⚠️ No bid data available. Please run the bidding simulation first.")
 else:
     #  Sidebar: Filters
     st.sidebar.header("🔍 Filters")
     rounds = st.sidebar.slider(
         "Select Rounds:",
-        min_value=int(df["Round"].min()),
-        max_value=int(df["Round"].max()),
-        value=(int(df["Round"].min()), int(df["Round"].max())),
+        min_value=round_range[0],
+        max_value=round_range[1],
+        value=round_range,
     )
-    agents = st.sidebar.multiselect("Select Agents:", options=df["Agent"].unique(), default=df["Agent"].unique())
+    agents = tuple(st.sidebar.multiselect("Select Agents:", options=rollups.agents, default=rollups.agents))
+    max_points = st.sidebar.slider("Max Points per Line:", min_value=100, max_value=5000, value=1000, step=100)
 
     #  AI Insights Toggle
     st.sidebar.header("🤖 AI Insights")
     enable_ai = st.sidebar.checkbox("Enable AI-powered Bidding Advice", value=True)
 
-    #  Filter Data
-    filtered_df = df[(df["Round"].between(rounds[0], rounds[1])) & (df["Agent"].isin(agents))]
+    #  Filtered rollups
+    trend = trend_data(version, rounds, agents, max_points)
+    summary = summary_data(version, rounds, agents)
 
-    # Data Table with Search
+    # Data Table: most recent rounds of the selection
     st.subheader(" Bid Data Table")
-    st.dataframe(filtered_df)
+    st.dataframe(rollups.rows((max(rounds[0], rounds[1] - 99), rounds[1]), list(agents)))
 
     # AI-Powered Insights
     if enable_ai:
         st.subheader("🤖 AI-Powered Bidding Advice")
-        latest_round = df["Round"].max()
-        market_threshold = df[df["Round"] == latest_round]["Bid"].mean()
-        ai_suggestion = get_ai_bid_suggestion(market_threshold)
-        st.info(f" AI Suggestion for Next Round: {ai_suggestion}")
+        latest_round = round_range[1]
+        market_threshold = trend_data(version, (latest_round, latest_round), tuple(rollups.agents), 1).stack().mean()
+        fill_in(lambda: get_ai_bid_suggestion(market_threshold),
+                lambda suggestion: st.info(f" AI Suggestion for Next Round: {suggestion}"),
+                "⏳ Fetching AI advice...")
 
-    #  Data Visualizations
+    #  Data Visualizations (rendered from rollups, never from raw rows)
 
-    def plot_bid_trends(df):
+    def plot_bid_trends(trend):
         """Visualizes bidding trends over rounds."""
-        if df.empty:
+        if trend.empty:
             st.warning("⚠️ No bid data available for visualization.")
             return
 
         st.subheader("📈 Bidding Trends Over Rounds")
 
         fig, ax = plt.subplots(figsize=(10, 5))
-        sns.lineplot(data=df, x="Round", y="Bid", hue="Agent", marker="o", ax=ax)
+        marker = "o" if len(trend) <= 100 else None  # Markers only while they stay readable
+        sns.lineplot(data=long_form(trend), x="Round", y="Bid", hue="Agent", marker=marker, ax=ax)
 
         ax.set_title(" Bidding Trends Over Rounds")
         ax.set_xlabel("Round Number")
@@ -151,77 +218,80 @@ else:
         ax.legend(title="Agent")
 
         st.pyplot(fig)
+        plt.close(fig)
 
-    def plot_heatmap(df):
+    def plot_heatmap(heatmap_data):
         """Creates a heatmap of winning bids over rounds."""
-        if df.empty:
+        if heatmap_data.empty:
             st.warning("⚠️ No bid data available for heatmap.")
             return
 
         st.subheader(" Winning Bids Heatmap")
 
-        df_unique = df.groupby(["Round", "Agent"], as_index=False)["Bid"].mean()
-        heatmap_data = df_unique.pivot(index="Round", columns="Agent", values="Bid")
-
         fig, ax = plt.subplots(figsize=(10, 6))
-        sns.heatmap(heatmap_data, cmap="coolwarm", annot=True, fmt=".1f", linewidths=0.5, ax=ax)
+        annotate = heatmap_data.size <= 400  # Per-cell labels only for small grids
+        sns.heatmap(heatmap_data, cmap="coolwarm", annot=annotate, fmt=".1f",
+                    linewidths=0.5 if annotate else 0, ax=ax)
 
         st.pyplot(fig)
+        plt.close(fig)
 
-    def plot_bid_distribution(df):
-        """Displays a box plot of bid distribution."""
-        if df.empty:
+    def plot_bid_distribution(sample):
+        """Displays a box plot of bid distribution (from a bounded per-agent sample)."""
+        if sample.empty:
             st.warning("⚠️ No bid data available for box plot.")
             return
 
         st.subheader("📦 Bid Distribution Analysis")
 
         fig, ax = plt.subplots(figsize=(10, 6))
-        sns.boxplot(x="Agent", y="Bid", data=df, palette="coolwarm", ax=ax)
+        sns.boxplot(x="Agent", y="Bid", data=sample, palette="coolwarm", ax=ax)
         st.pyplot(fig)
+        plt.close(fig)
 
-    def plot_agent_performance(df):
+    def plot_agent_performance(summary):
         """Visualizes agent performance based on winning bids."""
-        if df.empty:
+        if summary.empty:
             st.warning("⚠️ No bid data available for performance analysis.")
             return
 
         st.subheader("🏆 Agent Performance")
 
-        performance_df = df.groupby("Agent")["Winning_Bid"].sum().reset_index()
+        performance_df = summary["wins"].rename("Winning_Bid").reset_index()
         fig = px.bar(performance_df, x="Agent", y="Winning_Bid", title="Winning Bids per Agent", color="Agent")
 
         st.plotly_chart(fig)
 
-    def plot_market_dynamics(df):
+    def plot_market_dynamics(trend):
         """Visualizes market bidding dynamics over rounds."""
-        if df.empty:
+        if trend.empty:
             st.warning("⚠️ No bid data available for market dynamics.")
             return
 
         st.subheader("📊 Market Dynamics Over Time")
 
-        fig = px.line(df, x="Round", y="Bid", color="Agent", title="Market Bidding Behavior")
+        fig = px.line(long_form(trend), x="Round", y="Bid", color="Agent", title="Market Bidding Behavior")
         st.plotly_chart(fig)
 
     #  Run Visualizations
-    plot_bid_trends(filtered_df)
-    plot_heatmap(filtered_df)
-    plot_bid_distribution(filtered_df)
-    plot_agent_performance(filtered_df)
-    plot_market_dynamics(filtered_df)
+    plot_bid_trends(trend)
+    plot_heatmap(trend_data(version, rounds, agents, 50))  # At most 50 round buckets
+    plot_bid_distribution(sample_data(version, rounds, agents))
+    plot_agent_performance(summary)
+    plot_market_dynamics(trend)
 
     # Summary Stats
     st.sidebar.subheader(" Summary Statistics")
-    st.sidebar.write(filtered_df.describe())
-
-    # Download CSV
-    st.sidebar.download_button(
-        label="📥 Download Bid Data",
-        data=filtered_df.to_csv(index=False),
-        file_name="bid_data.csv",
-        mime="text/csv",
-    )
+    st.sidebar.write(summary)
+
+    # Download CSV (built on request: the selection can span millions of rows)
+    if st.sidebar.checkbox("Prepare Bid Data Download"):
+        st.sidebar.download_button(
+            label="📥 Download Bid Data",
+            data=csv_export(version, rounds, agents),
+            file_name="bid_data.csv",
+            mime="text/csv",
+        )
 
     #  Real-Time Updates Simulation
     if st.sidebar.button("🔄 Refresh Data"):
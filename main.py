@@ -1,62 +1,185 @@
 import sys
 import os
-import torch
 import argparse
-import openai
-from dotenv import load_dotenv
 
 # Ensure the src module is available
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
 
-from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
-from src.core.bidding_simulation import BiddingSimulation
-from src.utils.data_handler import DataHandler
-
-# Load OpenAI API Key
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+#  Heavy modules (torch, openai, pandas) are imported inside main() after argument parsing,
+#  so `python main.py --help` returns immediately.
 
 def check_openai_api():
-    """Checks if OpenAI API is working before running the simulation."""
-    if not OPENAI_API_KEY:
+    """Checks if the strategy LLM endpoint is reachable before running the simulation."""
+    from src.utils.llm_client import get_llm_client
+
+    llm = get_llm_client()
+    if not llm.enabled:
         print("No OpenAI API key found. AI-enhanced bidding will be disabled.")
         return False
     try:
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "system", "content": "Test OpenAI connection"}]
-        )
+        # ✅ Fix: a models listing authenticates without spending a GPT-4 completion
+        llm.ping()
         print("✅ OpenAI API Key is working!")
         return True
     except Exception as e:
         print(f"⚠️ OpenAI API Error: {e}")
         return False
 
+def start_offline_llm(latency, jitter, error_rate):
+    """Starts the local stub LLM server and points every AI path at it."""
+    from src.utils.llm_client import LLMClient, set_llm_client
+    from src.utils.llm_stub_server import start_stub_server
+
+    server = start_stub_server(latency=latency, jitter=jitter, error_rate=error_rate)
+    os.environ["OPENAI_BASE_URL"] = server.url
+    os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY") or "offline"
+    #  No SDK retries: injected errors and latencies reach the simulation as configured
+    set_llm_client(LLMClient(api_key=os.environ["OPENAI_API_KEY"], base_url=server.url, max_retries=0))
+    print(f" Offline mode: strategy LLM calls go to the stub server at {server.url}")
+    return server
+
+def print_metrics(snapshot, metrics_file=None):
+    """Prints where the run's time went and optionally writes it as a Prometheus textfile."""
+    counters = snapshot["counters"]
+    print(f"\n⏱️ {counters.get('rounds', 0)} rounds in {snapshot['elapsed_seconds']:.2f}s "
+          f"({counters.get('llm_requests', 0)} LLM requests, {counters.get('llm_cache_hits', 0)} cache hits, "
+          f"{counters.get('optimizer_steps', 0)} optimizer steps)")
+    for name, phase in sorted(snapshot["phases"].items(), key=lambda item: -item[1]["seconds"]):
+        print(f"   {name:<12}{phase['seconds']:>9.3f}s {phase['share']:>6.1%}")
+    if metrics_file:
+        from src.utils.metrics import write_prometheus_textfile
+
+        write_prometheus_textfile(snapshot, metrics_file)
+        print(f" Metrics written to {metrics_file}")
+
 def main():
     parser = argparse.ArgumentParser(description="Run AI-powered Multi-Agent Bidding Simulation")
     parser.add_argument("--visualize", action="store_true", help="Visualize bid trends after simulation")
+    parser.add_argument("--vectorized", action="store_true", help="Generate all agents' bids in one batched DQN pass per round")
+    parser.add_argument("--population-training", action="store_true",
+                        help="Train all agents' DQNs in one backward pass and one Adam step per round")
+    parser.add_argument("--replay-size", type=int, default=None, help="Enable experience replay with this buffer capacity")
+    parser.add_argument("--batch-size", type=int, default=32, help="Replay minibatch size")
+    parser.add_argument("--train-every", type=int, default=1, help="Train on a replay minibatch every N rounds")
+    parser.add_argument("--td-target", action="store_true", help="Train on bootstrapped TD targets from a frozen target network")
+    parser.add_argument("--target-sync-every", type=int, default=100, help="Hard-sync the target network every K optimizer steps")
+    parser.add_argument("--target-tau", type=float, default=None, help="Polyak-average the target network with this factor instead")
+    parser.add_argument("--episodes", type=int, default=None, help="Run N independent seeded episodes per threshold (Monte Carlo)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --episodes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="First seed for --episodes")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[100], help="Initial market thresholds for --episodes")
+    parser.add_argument("--storage", choices=["csv", "parquet"], default="csv", help="Bid-history storage backend")
+    parser.add_argument("--run-id", default="default", help="Run id partition for --storage parquet")
+    parser.add_argument("--async-llm", action="store_true", help="Issue each round's per-agent LLM calls concurrently")
+    parser.add_argument("--llm-concurrency", type=int, default=16, help="Max concurrent LLM requests in --async-llm mode")
+    parser.add_argument("--llm-timeout", type=float, default=30.0, help="Per-call LLM timeout in seconds for --async-llm")
+    parser.add_argument("--batch-llm", action="store_true", help="One batched AI request per round for all agents' bids (and one for counter-offers)")
+    parser.add_argument("--rounds", type=int, default=50, help="Bidding rounds to simulate")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: data/checkpoint.pt)")
+    parser.add_argument("--history-window", type=int, default=10_000,
+                        help="Rounds of bid history kept in memory (0 = all); older rounds stay in the bid-history file")
+    parser.add_argument("--checkpoint-every", type=int, default=0, help="Save a checkpoint every N rounds (0 = off)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint file")
+    parser.add_argument("--event-log", default=None, help="Also record every round to this binary event log")
+    parser.add_argument("--stream", action="store_true",
+                        help="Publish every round to the dashboard's live stream (dropped when nobody listens)")
+    parser.add_argument("--export-weights", default=None, metavar="DIR",
+                        help="Write each agent's trained DQN to DIR/<agent>.npz for the NumPy inference agent")
+    parser.add_argument("--metrics-file", default=None,
+                        help="Write per-phase timings and counters to this Prometheus textfile after the run")
+    parser.add_argument("--profile", nargs="?", const="data/profile.folded", default=None,
+                        help="Run under cProfile and write collapsed stacks for a flamegraph (default: data/profile.folded)")
+    parser.add_argument("--verbosity", choices=["normal", "quiet", "bench"], default="normal",
+                        help="quiet/bench drop per-bid prints and logging from the round loop")
+    parser.add_argument("--async-logging", action="store_true", help="Write logs from a background queue listener")
+    parser.add_argument("--offline", action="store_true", help="Answer all LLM calls from a local deterministic stub server")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Simulated LLM round trip in seconds for --offline")
+    parser.add_argument("--stub-jitter", type=float, default=0.0, help="Uniform +/- latency jitter in seconds for --offline")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="Fraction of failed LLM calls for --offline")
     args = parser.parse_args()
 
+    from dotenv import load_dotenv
+    from src.utils.logger import configure_logging
+    from src.agents.bidding_agent import DQNBiddingAgent
+    from src.core.bidding_simulation import BiddingSimulation, PARQUET_DIR
+    from src.utils.data_handler import ParquetBidHistoryWriter
+    from src.utils.event_log import EventLogWriter
+    from src.core.checkpoint import CHECKPOINT_FILE, CheckpointWriter, load_checkpoint
+
+    # Load OpenAI API Key
+    load_dotenv()
+    configure_logging(args.verbosity, async_mode=args.async_logging)
+
+    if args.offline:
+        start_offline_llm(args.stub_latency, args.stub_jitter, args.stub_error_rate)
+
+    agent_kwargs = {"replay_capacity": args.replay_size, "batch_size": args.batch_size, "train_every": args.train_every,
+                    "td_target": args.td_target, "target_sync_every": args.target_sync_every, "target_tau": args.target_tau}
+
+    #  Monte Carlo what-if analysis: many episodes across a process pool
+    if args.episodes:
+        from src.core.monte_carlo import run_many, scenario_grid
+
+        configs = scenario_grid(range(args.seed, args.seed + args.episodes), args.thresholds, rounds=args.rounds,
+                                agent_kwargs=agent_kwargs, vectorized=args.vectorized,
+                                population_training=args.population_training)
+        for summary in run_many(configs, workers=args.workers):
+            print(f"Episode seed={summary['seed']} threshold={summary['initial_threshold']}: "
+                  f"final threshold {summary['final_threshold']:.2f}, wins {summary['wins']}, "
+                  f"{summary['elapsed']:.2f}s")
+        return
+
     # Check if OpenAI API is working
     ai_enabled = check_openai_api()
 
     # Initialize bidding agents with OpenAI support
-    agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=ai_enabled) for i in range(1, 6)]
-    simulation = BiddingSimulation(agents=agents, rounds=50)
+    agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=ai_enabled, **agent_kwargs) for i in range(1, 6)]
+    writer = ParquetBidHistoryWriter(PARQUET_DIR, run_id=args.run_id) if args.storage == "parquet" else None
+    event_log = EventLogWriter(args.event_log, [agent.name for agent in agents]) if args.event_log else None
+    checkpoint_file = args.checkpoint or CHECKPOINT_FILE
+    publisher = None
+    if args.stream:
+        from src.utils.bid_stream import BidStreamPublisher
+        publisher = BidStreamPublisher()
+    checkpoint = CheckpointWriter(checkpoint_file, args.checkpoint_every) if args.checkpoint_every else None
+    simulation = BiddingSimulation(agents=agents, rounds=args.rounds, vectorized=args.vectorized, writer=writer,
+                                   population_training=args.population_training,
+                                   async_llm=args.async_llm, llm_concurrency=args.llm_concurrency,
+                                   llm_timeout=args.llm_timeout, batch_llm=args.batch_llm, event_log=event_log,
+                                   checkpoint=checkpoint, history_window=args.history_window or None,
+                                   publisher=publisher)
+    if args.resume:
+        simulation.load_state_dict(load_checkpoint(checkpoint_file))
+        print(f" Resuming from {checkpoint_file} at round {simulation.start_round}")
 
     # Run Simulation
-    simulation.run_simulation()
+    if args.profile:
+        from src.utils.profiling import profile_call
+        profile_call(simulation.run_simulation, args.profile)
+        print(f" Profile written to {args.profile} (collapsed stacks) and {args.profile}.prof")
+    else:
+        simulation.run_simulation()
+    snapshot = simulation.metrics_snapshot()
     simulation.summarize_results()
+    print_metrics(snapshot, args.metrics_file)
+    if event_log is not None:
+        event_log.close()
+    if checkpoint is not None:
+        checkpoint.close()
+    if publisher is not None:
+        print(f" Streamed {publisher.sent} rounds ({publisher.dropped} dropped)")
+        publisher.close()
     
     # Log Q-Values for Analysis
     for agent in agents:
-        sample_states = [torch.tensor([100, 10], dtype=torch.float32),
-                         torch.tensor([80, 5], dtype=torch.float32),
-                         torch.tensor([50, 1], dtype=torch.float32)]
-        q_values = [agent.model(state).item() for state in sample_states]
+        q_values = agent.sample_q_values()
         print(f"Agent {agent.name} Sample Q-Values: {q_values}")
 
+    if args.export_weights:
+        for agent in agents:
+            agent.export_weights(os.path.join(args.export_weights, f"{agent.name.replace(' ', '_')}.npz"))
+        print(f" Exported {len(agents)} agents' weights to {args.export_weights}")
+
     # Visualization (if enabled)
     if args.visualize and hasattr(simulation, "visualize_bidding_trends"):
         simulation.visualize_bidding_trends()
@@ -0,0 +1,72 @@
+from src.utils.llm_client import get_llm_client
+from src.utils.logger import logger
+
+
+class AIBiddingMixin:
+    """
+    AI bid strategy and bid finalisation shared by the torch DQN agents and the
+    NumPy inference agent (kept free of torch imports).
+
+    Expects `name` and `ai_enabled` attributes and an `observe(market_threshold,
+    rounds_remaining, bid)` hook called with every final bid.
+    """
+
+    @staticmethod
+    def bid_strategy_messages(llm, market_threshold, rounds_remaining):
+        return [
+            {"role": "system", "content": "You are an AI market bidding expert. Return only a number."},
+            {"role": "user", "content": f"Market threshold is {llm.quantize(market_threshold)}, {rounds_remaining} rounds remain out of 20. Suggest an optimal bid."}
+        ]
+
+    def get_ai_bid_strategy(self, market_threshold, rounds_remaining):
+        """AI-powered bidding strategy using OpenAI GPT."""
+        llm = get_llm_client()
+        if not llm.enabled:
+            return None  
+
+        try:
+            reply = llm.complete(self.bid_strategy_messages(llm, market_threshold, rounds_remaining))
+
+            # Ensure AI returns only numbers (avoids 'string to float' conversion errors)
+            ai_bid = float(reply)
+            return ai_bid
+
+        except ValueError:
+            print(f"⚠️ AI Error: Could not convert response to number.")
+            return None
+        except Exception as e:
+            print(f"⚠️ OpenAI API Error: {e}")
+            return None
+
+    async def aget_ai_bid_strategy(self, market_threshold, rounds_remaining, timeout=None):
+        """Async variant of `get_ai_bid_strategy` for concurrent per-round fan-out."""
+        llm = get_llm_client()
+        if not llm.enabled:
+            return None
+
+        try:
+            reply = await llm.acomplete(self.bid_strategy_messages(llm, market_threshold, rounds_remaining), timeout=timeout)
+            return float(reply)
+        except ValueError:
+            print(f"⚠️ AI Error: Could not convert response to number.")
+            return None
+        except Exception as e:
+            print(f"⚠️ OpenAI API Error: {e!r}")
+            return None
+
+    def finalize_bid(self, bid, market_threshold, rounds_remaining):
+        """Blend a raw policy bid with the AI strategy, log it and clamp it."""
+        #  AI-Powered Bidding Optimization
+        ai_bid = self.get_ai_bid_strategy(market_threshold, rounds_remaining) if self.ai_enabled else None
+        return self.blend_bid(bid, ai_bid, market_threshold, rounds_remaining)
+
+    def blend_bid(self, bid, ai_bid, market_threshold, rounds_remaining):
+        """Average in an (already fetched) AI bid, then log and clamp."""
+        if ai_bid is not None:
+            bid = (bid + ai_bid) / 2  
+        
+        logger.info("Agent %s placed a bid: %s", self.name, bid)  #  Lazy args: no formatting when INFO is off
+
+        bid = max(1, round(bid, 2))  #  Ensuring valid bid
+        self.observe(market_threshold, rounds_remaining, bid)
+        return bid
@@ -1,19 +1,43 @@
+import os
+import copy
 import random
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
-import openai
-import os
-from dotenv import load_dotenv
+from src.agents.ai_strategy import AIBiddingMixin
+from src.agents.replay_buffer import ReplayBuffer
+from src.utils.llm_client import get_llm_client
 from src.utils.logger import logger
 
-    
-#  Load OpenAI API Key
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+#  Probe states used to track Q-value evolution (threshold, rounds remaining)
+SAMPLE_STATES = [(100, 10), (80, 5), (50, 1)]
+
+
+def dense(x, weight, bias):
+    """Dense layer written as an explicit multiply-and-reduce.
+
+    Unlike ``F.linear`` the reduction order does not depend on whether a
+    leading population dimension is present, so one agent and a stacked
+    population of agents produce bit-identical outputs.
+    """
+    return (weight * x.unsqueeze(-2)).sum(-1) + bias
+
+
+def dqn_greedy(x, params):
+    """Inference forward pass of the 2-64-64-1 DQN from raw parameter tensors."""
+    x = torch.relu(dense(x, params["fc1.weight"], params["fc1.bias"]))
+    x = torch.relu(dense(x, params["fc2.weight"], params["fc2.bias"]))
+    return dense(x, params["fc3.weight"], params["fc3.bias"])
+
+
+def export_dqn(model, path):
+    """Saves a DQN's parameters as float32 arrays in an .npz keyed by parameter name ("fc1.weight", ...)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with torch.no_grad():
+        arrays = {name: param.detach().cpu().numpy().astype(np.float32) for name, param in model.named_parameters()}
+    np.savez(path, **arrays)
 
-#  Initialize OpenAI Client
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
 
 class DQN(nn.Module):
     """Deep Q-Network for bidding."""
@@ -28,9 +52,15 @@ class DQN(nn.Module):
         x = torch.relu(self.fc2(x))
         return self.fc3(x)
 
-class DQNBiddingAgent:
+    def greedy(self, x):
+        """Bid-time forward pass, shared with the batched population engine."""
+        return dqn_greedy(x, dict(self.named_parameters()))
+
+class DQNBiddingAgent(AIBiddingMixin):
     """Deep Q-Learning-based Bidding Agent with AI-powered strategy."""
-    def __init__(self, name, learning_rate=0.01, discount_factor=0.9, exploration_rate=0.2, ai_enabled=False):
+    def __init__(self, name, learning_rate=0.01, discount_factor=0.9, exploration_rate=0.2, ai_enabled=False,
+                 replay_capacity=None, batch_size=32, train_every=1,
+                 td_target=False, target_sync_every=100, target_tau=None):
         self.name = name
         self.model = DQN(input_dim=2, output_dim=1)
         self.optimizer = optim.Adam(self.model.parameters(), lr=learning_rate)
@@ -40,77 +70,194 @@ class DQNBiddingAgent:
         self.reward = 0
         self.history = []
         self.ai_enabled = ai_enabled  
-        logger.info(f"Agent {self.name} initialized.")  #
+
+        #  Experience replay (disabled when replay_capacity is None)
+        self.replay = ReplayBuffer(replay_capacity) if replay_capacity else None
+        self.batch_size = batch_size
+        self.train_every = train_every
+        self.updates = 0
+        self.train_steps = 0
+        self.last_state = None
+        self.last_bid = None
+        self.pending_transition = None
+
+        #  TD-target mode: bootstrap from a frozen target copy of the DQN
+        if td_target and self.replay is None:
+            raise ValueError("td_target requires experience replay (set replay_capacity).")
+        self.td_target = td_target
+        self.target_sync_every = target_sync_every
+        self.target_tau = target_tau  # Polyak averaging factor; hard sync every K steps when None
+        self.target_model = None
+        if td_target:
+            self.target_model = copy.deepcopy(self.model)
+            self.target_model.requires_grad_(False)
+        logger.info("Agent %s initialized.", self.name)
 
     def generate_bid(self, market_threshold, rounds_remaining):
         """Generate a bid using deep Q-learning or AI-powered reasoning."""
+        bid = self.policy_bid(market_threshold, rounds_remaining)
+        return self.finalize_bid(bid, market_threshold, rounds_remaining)
+
+    def policy_bid(self, market_threshold, rounds_remaining):
+        """Raw epsilon-greedy RL bid, before AI blending and clamping."""
         state = torch.tensor([market_threshold, rounds_remaining], dtype=torch.float32)
 
         if random.random() < self.exploration_rate:
-            bid = random.uniform(market_threshold * 0.9, market_threshold * 1.1)
-        else:
-            bid = self.model(state).item()
+            return random.uniform(market_threshold * 0.9, market_threshold * 1.1)
+        with torch.inference_mode():  # No autograd bookkeeping (cheaper than no_grad) on the bid path
+            return self.model.greedy(state).item()
 
-        #  AI-Powered Bidding Optimization
-        if self.ai_enabled:
-            ai_bid = self.get_ai_bid_strategy(market_threshold, rounds_remaining)
-            if ai_bid is not None:
-                bid = (bid + ai_bid) / 2  
-        
-        logger.info(f"Agent {self.name} placed a bid: {bid}") #
+    def observe(self, market_threshold, rounds_remaining, bid):
+        """Records the state that was bid on and closes the previous transition."""
+        state = (market_threshold, rounds_remaining)
+        if self.pending_transition is not None:
+            self.replay.push(*self.pending_transition, state)
+            self.pending_transition = None
+        self.last_state = state
+        self.last_bid = bid
 
-        return max(1, round(bid, 2))  #  Ensuring valid bid
+    def update_reward(self, reward, next_state=None):
+        """Train the DQN model using rewards.
 
-    def get_ai_bid_strategy(self, market_threshold, rounds_remaining):
-        """AI-powered bidding strategy using OpenAI GPT."""
-        if not OPENAI_API_KEY:
-            return None  
+        With experience replay enabled the real (state, bid, reward) transition
+        is stored and the model is trained on a sampled minibatch every
+        ``train_every`` updates. The transition is completed by ``next_state``
+        or, if not given, by the state of the next bid.
+        """
+        batch = self.record_reward(reward, next_state)
+        if batch is not None:
+            self.fit(*batch)
 
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an AI market bidding expert. Return only a number."},
-                    {"role": "user", "content": f"Market threshold is {market_threshold}, {rounds_remaining} rounds remain out of 20. Suggest an optimal bid."}
-                ]
-            )
-
-            # Ensure AI returns only numbers (avoids 'string to float' conversion errors)
-            ai_bid = float(response.choices[0].message.content.strip())
-            return ai_bid
-
-        except ValueError:
-            print(f"⚠️ AI Error: Could not convert response to number.")
-            return None
-        except Exception as e:
-            print(f"⚠️ OpenAI API Error: {e}")
-            return None
+    def record_reward(self, reward, next_state=None):
+        """Books a reward and returns the (states, targets) batch due for training now, or None.
 
-    def update_reward(self, reward):
-        """Train the DQN model using rewards."""
+        Shared with `PopulationTrainer`, which fits the batches of all agents
+        in one step instead of calling `fit` per agent.
+        """
         self.reward += reward  
 
-        target = torch.tensor([reward], dtype=torch.float32)
-        prediction = self.model(torch.tensor([random.uniform(50, 100), random.randint(1, 2000)], dtype=torch.float32))
+        if self.replay is not None:
+            batch = self.replay_batch() if self.store_transition(reward, next_state) else None
+        else:
+            batch = self.random_state_batch(reward)
+
+        self.exploration_rate *= 0.98  
+        return batch
+
+    def store_transition(self, reward, next_state=None):
+        """Stores the latest transition; True when a minibatch update is due."""
+        if self.last_state is not None:
+            self.pending_transition = (self.last_state, self.last_bid, reward)
+            if next_state is not None:
+                self.replay.push(*self.pending_transition, next_state)
+                self.pending_transition = None
 
-        loss = self.loss_fn(prediction, target)
+        self.updates += 1
+        return self.updates % self.train_every == 0 and len(self.replay) >= self.batch_size
+
+    def replay_batch(self):
+        """Minibatch from replay memory as (states, targets) tensors."""
+        states, bids, rewards, next_states = self.replay.sample(self.batch_size)
+        states = torch.from_numpy(states)
+        return states, self.compute_targets(torch.from_numpy(rewards), states, torch.from_numpy(next_states))
+
+    def random_state_batch(self, reward):
+        """Legacy single-sample batch: a synthetic random state with the reward as target."""
+        state = torch.tensor([[random.uniform(50, 100), random.randint(1, 2000)]], dtype=torch.float32)
+        return state, torch.tensor([reward], dtype=torch.float32)
+
+    def fit(self, states, targets):
+        """Runs one optimizer step of this agent's own optimizer on a (states, targets) batch."""
+        prediction = self.model(states).squeeze(-1)
+
+        loss = self.loss_fn(prediction, targets)
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
+        self.finish_train_step()
 
-        self.exploration_rate *= 0.98  
+    def finish_train_step(self):
+        """Step bookkeeping, whether the step ran here or in a `PopulationTrainer`."""
+        self.train_steps += 1
+        if self.td_target:
+            self.sync_target()
+
+    def compute_targets(self, rewards, states, next_states):
+        """Immediate rewards, or r + gamma * Q_target(s') in TD-target mode.
+
+        The last round of an episode (no rounds remaining) is terminal and
+        does not bootstrap.
+        """
+        if not self.td_target:
+            return rewards
+
+        with torch.no_grad():
+            next_q = self.target_model(next_states).squeeze(-1)
+        not_terminal = (states[:, 1] > 0).float()
+        return rewards + self.discount_factor * next_q * not_terminal
+
+    def sync_target(self):
+        """Polyak-averages or periodically hard-copies the online weights into the target network."""
+        with torch.no_grad():
+            if self.target_tau is not None:
+                for target, online in zip(self.target_model.parameters(), self.model.parameters()):
+                    target.lerp_(online, self.target_tau)
+            elif self.train_steps % self.target_sync_every == 0:
+                self.target_model.load_state_dict(self.model.state_dict())
+
+    def state_dict(self):
+        """Snapshot of everything that evolves during training, safe to hand to another thread."""
+        return {
+            "name": self.name,
+            "model": copy.deepcopy(self.model.state_dict()),
+            "optimizer": copy.deepcopy(self.optimizer.state_dict()),
+            "target_model": copy.deepcopy(self.target_model.state_dict()) if self.target_model is not None else None,
+            "replay": self.replay.state_dict() if self.replay is not None else None,
+            "exploration_rate": self.exploration_rate,
+            "reward": self.reward,
+            "updates": self.updates,
+            "train_steps": self.train_steps,
+            "last_state": self.last_state,
+            "last_bid": self.last_bid,
+            "pending_transition": self.pending_transition,
+        }
+
+    def load_state_dict(self, state):
+        """Restores a snapshot taken with `state_dict`."""
+        self.model.load_state_dict(state["model"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        if self.target_model is not None and state["target_model"] is not None:
+            self.target_model.load_state_dict(state["target_model"])
+        if self.replay is not None and state["replay"] is not None:
+            self.replay.load_state_dict(state["replay"])
+        for key in ("exploration_rate", "reward", "updates", "train_steps", "last_state", "last_bid",
+                    "pending_transition"):
+            setattr(self, key, state[key])
+
+    def sample_q_values(self, states=SAMPLE_STATES):
+        """Q-values of the model at the given (threshold, rounds remaining) probe states."""
+        with torch.inference_mode():
+            return self.model(torch.tensor(states, dtype=torch.float32)).squeeze(-1).tolist()
+
+    def export_weights(self, path):
+        """Writes the DQN weights to `path` (.npz) for the torch-free `NumpyBiddingAgent`."""
+        export_dqn(self.model, path)
 
 class NegotiationAgent(DQNBiddingAgent):
     """Agent that can negotiate bids using RL and AI-powered strategy."""
-    def __init__(self, name):
-        super().__init__(name)  
+    def __init__(self, name, **kwargs):
+        super().__init__(name, **kwargs)  
+
+    def negotiate(self, competitor_bids, market_threshold, use_ai=True):
+        """Negotiate a lower bid strategically with AI support.
 
-    def negotiate(self, competitor_bids, market_threshold):
-        """Negotiate a lower bid strategically with AI support."""
+        `use_ai=False` skips the agent's own AI request (batched negotiation
+        fetches every agent's AI counter-offer in one request instead).
+        """
         min_competitor_bid = min(competitor_bids.values())
 
         #  AI-powered negotiation support
-        ai_negotiation = self.get_ai_negotiation_strategy(min_competitor_bid, market_threshold)
+        ai_negotiation = self.get_ai_negotiation_strategy(min_competitor_bid, market_threshold) if use_ai else None
         if ai_negotiation:
             return ai_negotiation
 
@@ -118,18 +265,16 @@ class NegotiationAgent(DQNBiddingAgent):
 
     def get_ai_negotiation_strategy(self, min_competitor_bid, market_threshold):
         """Use OpenAI GPT for market negotiation strategies."""
-        if not OPENAI_API_KEY:
+        llm = get_llm_client()
+        if not llm.enabled:
             return None  
 
         try:
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an AI specializing in market negotiations. Return only a number."},
-                    {"role": "user", "content": f"Lowest competitor bid is {min_competitor_bid}, market threshold is {market_threshold}. Suggest a counter-offer."}
-                ]
-            )
-            return float(response.choices[0].message.content.strip())
+            reply = llm.complete([
+                {"role": "system", "content": "You are an AI specializing in market negotiations. Return only a number."},
+                {"role": "user", "content": f"Lowest competitor bid is {llm.quantize(min_competitor_bid)}, market threshold is {llm.quantize(market_threshold)}. Suggest a counter-offer."}
+            ])
+            return float(reply)
         except Exception as e:
             print(f"⚠️ OpenAI API Error: {e}")
             return None
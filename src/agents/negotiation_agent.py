@@ -1,17 +1,6 @@
 import os
 import re
-import openai
-from dotenv import load_dotenv
-from langchain.chat_models import ChatOpenAI
-
-# Load OpenAI API Key Securely
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
-if not OPENAI_API_KEY:
-    print("⚠️ WARNING: OpenAI API Key not found. AI-powered bidding will be disabled.")
-else:
-    openai.api_key = OPENAI_API_KEY  # Set OpenAI API Key globally
+from src.utils.llm_client import get_llm_client
 
 
 class BiddingAgent:
@@ -19,7 +8,9 @@ class BiddingAgent:
     
     def __init__(self, name, llm_model="gpt-4", temperature=0.7):
         self.name = name
-        self.model = ChatOpenAI(model_name=llm_model, temperature=temperature)
+        self.llm_model = llm_model
+        self.temperature = temperature
+        self._model = None
         self.previous_bids = []
         self.reward = 0
 
@@ -42,9 +33,19 @@ class BiddingAgent:
         """Updates agent reward based on bid outcome."""
         self.reward += 1 if success else -1
 
+    @property
+    def model(self):
+        """LangChain chat model, created on first use (langchain is slow to import)."""
+        if self._model is None:
+            from langchain.chat_models import ChatOpenAI
+            # OPENAI_BASE_URL lets this agent talk to the local stub server as well
+            self._model = ChatOpenAI(model_name=self.llm_model, temperature=self.temperature,
+                                     openai_api_base=os.getenv("OPENAI_BASE_URL") or None)
+        return self._model
+
     def invoke_ai(self, prompt):
         """Sends a prompt to OpenAI and processes the response."""
-        if not OPENAI_API_KEY:
+        if not get_llm_client().enabled:
             print("⚠️ AI disabled, falling back to random bidding.")
             return 100  # Default fallback bid
 
@@ -0,0 +1,94 @@
+import random
+import numpy as np
+from src.agents.ai_strategy import AIBiddingMixin
+
+#  Parameter layout of the 2-64-64-1 DQN, as written by `export_dqn`
+PARAM_NAMES = ("fc1.weight", "fc1.bias", "fc2.weight", "fc2.bias", "fc3.weight", "fc3.bias")
+PARAM_SHAPES = {"fc1.weight": (64, 2), "fc1.bias": (64,), "fc2.weight": (64, 64), "fc2.bias": (64,),
+                "fc3.weight": (1, 64), "fc3.bias": (1,)}
+
+#  Same probe states as `DQNBiddingAgent.sample_q_values`
+SAMPLE_STATES = [(100, 10), (80, 5), (50, 1)]
+
+
+def load_dqn_weights(path):
+    """Reads an .npz written by `export_dqn` as float32 arrays, checking the 2-64-64-1 layout."""
+    with np.load(path) as data:
+        missing = [name for name in PARAM_NAMES if name not in data]
+        if missing:
+            raise ValueError(f"{path} is missing DQN parameters: {missing}")
+        weights = {name: np.ascontiguousarray(data[name], dtype=np.float32) for name in PARAM_NAMES}
+
+    for name, shape in PARAM_SHAPES.items():
+        if weights[name].shape != shape:
+            raise ValueError(f"{path}: {name} has shape {weights[name].shape}, expected {shape}")
+    return weights
+
+
+def dqn_forward(states, layers):
+    """
+    Q-values for an (n, 2) array of (threshold, rounds remaining) states.
+
+    `layers` are (weight.T, bias) pairs, so every layer is a single matmul
+    over the whole batch.
+    """
+    x = np.asarray(states, dtype=np.float32)
+    (w1, b1), (w2, b2), (w3, b3) = layers
+    x = np.maximum(x @ w1 + b1, 0)
+    x = np.maximum(x @ w2 + b2, 0)
+    return (x @ w3 + b3)[..., 0]
+
+
+class NumpyBiddingAgent(AIBiddingMixin):
+    """
+    Inference-only bidding agent running an exported DQN in NumPy.
+
+    - Same `generate_bid` / `policy_bid` / `blend_bid` interface as
+      `DQNBiddingAgent`, so it can stand in for one in a simulation; rewards
+      are booked but never trained on.
+    - `q_values(states)` scores thousands of states in one matmul per layer.
+    - Imports neither torch nor the torch agents, so serving processes can
+      load it without them.
+    """
+
+    def __init__(self, name, weights, exploration_rate=0.0, ai_enabled=False):
+        self.name = name
+        self.weights = weights
+        self.layers = [(np.ascontiguousarray(weights[f"{layer}.weight"].T), weights[f"{layer}.bias"])
+                       for layer in ("fc1", "fc2", "fc3")]
+        self.exploration_rate = exploration_rate
+        self.ai_enabled = ai_enabled
+        self.reward = 0
+        self.last_state = None
+        self.last_bid = None
+
+    @classmethod
+    def from_file(cls, name, path, **kwargs):
+        return cls(name, load_dqn_weights(path), **kwargs)
+
+    def q_values(self, states):
+        """Greedy Q-values (raw bids) for an (n, 2) array of states."""
+        return dqn_forward(states, self.layers)
+
+    def generate_bid(self, market_threshold, rounds_remaining):
+        """Generate a bid from the exported DQN, blended with the AI strategy when enabled."""
+        bid = self.policy_bid(market_threshold, rounds_remaining)
+        return self.finalize_bid(bid, market_threshold, rounds_remaining)
+
+    def policy_bid(self, market_threshold, rounds_remaining):
+        """Raw epsilon-greedy bid, drawing random numbers exactly like `DQNBiddingAgent.policy_bid`."""
+        if random.random() < self.exploration_rate:
+            return random.uniform(market_threshold * 0.9, market_threshold * 1.1)
+        return float(self.q_values([(market_threshold, rounds_remaining)])[0])
+
+    def observe(self, market_threshold, rounds_remaining, bid):
+        self.last_state = (market_threshold, rounds_remaining)
+        self.last_bid = bid
+
+    def update_reward(self, reward, next_state=None):
+        """Books the reward; the exported model is frozen."""
+        self.reward += reward
+        self.exploration_rate *= 0.98
+
+    def sample_q_values(self, states=SAMPLE_STATES):
+        return self.q_values(states).tolist()
@@ -0,0 +1,185 @@
+import random
+import torch
+from src.agents.bidding_agent import dqn_greedy
+from src.agents.numpy_agent import PARAM_NAMES
+
+
+class DQNPopulation:
+    """Evaluates every agent's DQN in one batched forward pass per round.
+
+    Weights of all agents are stacked along a leading population dimension
+    and pushed through the same multiply-and-reduce kernel the per-agent
+    path uses, so with a fixed seed the bids match
+    ``DQNBiddingAgent.generate_bid`` bit for bit.
+    """
+
+    def __init__(self, agents, shared_params=None):
+        self.agents = list(agents)
+        #  Stacked weights a `PopulationTrainer` updates in place; nothing to re-stack then
+        self.shared_params = shared_params
+        self.params = {}
+        self.refresh()
+
+    def refresh(self):
+        """Re-stack agent weights (agents train between rounds)."""
+        if self.shared_params is not None:
+            self.params = {name: param.detach() for name, param in self.shared_params.items()}
+            return
+        with torch.no_grad():
+            models = [dict(agent.model.named_parameters()) for agent in self.agents]
+            self.params = {name: torch.stack([m[name] for m in models]) for name in PARAM_NAMES}
+
+    def policy_bids(self, market_threshold, rounds_remaining):
+        """Raw RL bids for every agent, before AI blending and clamping."""
+        #  Exploration draws are consumed in agent order, exactly like the per-agent loop
+        bids = []
+        exploit = []
+        for i, agent in enumerate(self.agents):
+            if random.random() < agent.exploration_rate:
+                bids.append(random.uniform(market_threshold * 0.9, market_threshold * 1.1))
+            else:
+                bids.append(None)
+                exploit.append(i)
+
+        if exploit:
+            state = torch.tensor([market_threshold, rounds_remaining], dtype=torch.float32)
+            with torch.inference_mode():
+                q_values = dqn_greedy(state.expand(len(self.agents), 2), self.params).squeeze(-1).tolist()
+            for i in exploit:
+                bids[i] = q_values[i]
+
+        return bids
+
+    def generate_bids(self, market_threshold, rounds_remaining):
+        """Generate the bids of all agents for one round, keyed by agent name."""
+        self.refresh()
+        raw_bids = self.policy_bids(market_threshold, rounds_remaining)
+        return {
+            agent.name: agent.finalize_bid(bid, market_threshold, rounds_remaining)
+            for agent, bid in zip(self.agents, raw_bids)
+        }
+
+
+def batched_dense(x, weight, bias):
+    """Dense layer applied per agent: x (agents, batch, in), weight (agents, out, in)."""
+    return torch.baddbmm(bias.unsqueeze(1), x, weight.transpose(1, 2))
+
+
+def dqn_batched(x, params):
+    """Training forward pass of every agent's DQN on its own minibatch in one graph."""
+    x = torch.relu(batched_dense(x, params["fc1.weight"], params["fc1.bias"]))
+    x = torch.relu(batched_dense(x, params["fc2.weight"], params["fc2.bias"]))
+    return batched_dense(x, params["fc3.weight"], params["fc3.bias"])
+
+
+class PopulationTrainer:
+    """Trains every agent's DQN with one backward pass and one Adam step per round.
+
+    - Agent weights are moved into stacked (agents, ...) tensors and each
+      agent's parameters become views of its row, so bids, checkpoints and
+      `DQNPopulation` keep reading the agents' own models.
+    - The loss is the sum of the agents' MSE losses, so each row's gradient is
+      exactly that agent's own gradient; Adam is element-wise with per-agent
+      step counts and learning rates, so the agents stay independent.
+    - Agents not due for training in a round (replay still filling,
+      `train_every`) are left out of the step entirely.
+    - Adam moments start from, and are written back to, the agents' own
+      optimizers (`write_back`), so checkpoints stay interchangeable with
+      per-agent training.
+    """
+
+    def __init__(self, agents):
+        self.agents = list(agents)
+        groups = [agent.optimizer.param_groups[0] for agent in self.agents]
+        if len({(agent.replay is None, agent.batch_size) for agent in self.agents}) > 1:
+            raise ValueError("PopulationTrainer needs agents with the same replay and batch_size settings.")
+        if len({(group["betas"], group["eps"], group["weight_decay"]) for group in groups}) > 1:
+            raise ValueError("PopulationTrainer needs agents with the same Adam betas, eps and weight decay.")
+        self.betas = groups[0]["betas"]
+        self.eps = groups[0]["eps"]
+        self.weight_decay = groups[0]["weight_decay"]
+        self.lr = torch.tensor([group["lr"] for group in groups], dtype=torch.float32)
+
+        with torch.no_grad():
+            models = [dict(agent.model.named_parameters()) for agent in self.agents]
+            self.params = {name: torch.stack([m[name] for m in models]).requires_grad_() for name in PARAM_NAMES}
+            for i, model in enumerate(models):
+                for name in PARAM_NAMES:
+                    model[name].data = self.params[name][i]  # Shares storage with the stacked row
+        self.exp_avg = {name: torch.zeros_like(param) for name, param in self.params.items()}
+        self.exp_avg_sq = {name: torch.zeros_like(param) for name, param in self.params.items()}
+        self.steps = torch.zeros(len(self.agents))
+        self.load_from_agents()
+
+    def load_from_agents(self):
+        """Reads Adam state from the agents' optimizers (after construction or a checkpoint restore)."""
+        for i, agent in enumerate(self.agents):
+            named = dict(agent.model.named_parameters())
+            states = [agent.optimizer.state.get(named[name], {}) for name in PARAM_NAMES]
+            self.steps[i] = float(states[0].get("step", 0))
+            for name, state in zip(PARAM_NAMES, states):
+                for moments, key in ((self.exp_avg, "exp_avg"), (self.exp_avg_sq, "exp_avg_sq")):
+                    moments[name][i] = state[key] if key in state else 0
+
+    def write_back(self):
+        """Copies the Adam state into each agent's optimizer so `agent.state_dict()` is current."""
+        for i, agent in enumerate(self.agents):
+            named = dict(agent.model.named_parameters())
+            for name in PARAM_NAMES:
+                agent.optimizer.state[named[name]] = {
+                    "step": torch.tensor(float(self.steps[i])),
+                    "exp_avg": self.exp_avg[name][i].clone(),
+                    "exp_avg_sq": self.exp_avg_sq[name][i].clone(),
+                }
+
+    def update_rewards(self, rewards, next_states=None):
+        """Population counterpart of calling `agent.update_reward(reward)` for every agent."""
+        next_states = next_states or [None] * len(self.agents)
+        batches = [agent.record_reward(reward, next_state)
+                   for agent, reward, next_state in zip(self.agents, rewards, next_states)]
+        due = [i for i, batch in enumerate(batches) if batch is not None]
+        if due:
+            self.step(due, [batches[i] for i in due])
+
+    def step(self, due, batches):
+        """One forward/backward pass and Adam step over the agents in `due`."""
+        full = len(due) == len(self.agents)
+        index = None if full else torch.tensor(due)
+        params = self.params if full else {name: param.index_select(0, index) for name, param in self.params.items()}
+
+        states = torch.stack([batch[0] for batch in batches])
+        targets = torch.stack([batch[1] for batch in batches])
+        prediction = dqn_batched(states, params).squeeze(-1)
+        loss = ((prediction - targets) ** 2).mean(-1).sum()  # Sum of per-agent MSE losses
+        grads = torch.autograd.grad(loss, [self.params[name] for name in PARAM_NAMES])
+
+        with torch.no_grad():
+            self.adam(index, dict(zip(PARAM_NAMES, grads)))
+        for i in due:
+            self.agents[i].finish_train_step()
+
+    def adam(self, index, grads):
+        """`torch.optim.Adam`'s update with per-agent step counts and learning rates, on the rows in `index`."""
+        beta1, beta2 = self.betas
+        rows = slice(None) if index is None else index
+        self.steps[rows] += 1
+        steps = self.steps[rows]
+        step_size = self.lr[rows] / (1 - beta1 ** steps)
+        bias_correction2_sqrt = (1 - beta2 ** steps).sqrt()
+
+        for name in PARAM_NAMES:
+            param, grad = self.params[name], grads[name][rows]
+            exp_avg, exp_avg_sq = self.exp_avg[name][rows], self.exp_avg_sq[name][rows]
+            shape = (-1,) + (1,) * (param.dim() - 1)
+            if self.weight_decay:
+                grad = grad.add(param[rows], alpha=self.weight_decay)
+            exp_avg.lerp_(grad, 1 - beta1)
+            exp_avg_sq.mul_(beta2).addcmul_(grad, grad, value=1 - beta2)
+            denom = (exp_avg_sq.sqrt() / bias_correction2_sqrt.view(shape)).add_(self.eps)
+            update = exp_avg / denom * step_size.view(shape)
+            if index is None:
+                param.sub_(update)
+            else:
+                param.index_copy_(0, index, param[index] - update)
+                self.exp_avg[name].index_copy_(0, index, exp_avg)
+                self.exp_avg_sq[name].index_copy_(0, index, exp_avg_sq)
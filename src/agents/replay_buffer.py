@@ -0,0 +1,50 @@
+import numpy as np
+
+
+class ReplayBuffer:
+    """Preallocated ring buffer of (state, bid, reward, next_state) transitions.
+
+    Transitions live in fixed NumPy column arrays, so pushing never allocates
+    and sampling a minibatch is a single fancy-indexing gather per column.
+    Once full, the oldest transitions are overwritten.
+    """
+
+    def __init__(self, capacity, state_dim=2):
+        if capacity <= 0:
+            raise ValueError("Replay buffer capacity must be positive.")
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.bids = np.zeros(capacity, dtype=np.float32)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, bid, reward, next_state):
+        """Stores one transition, overwriting the oldest when full."""
+        i = self.position
+        self.states[i] = state
+        self.bids[i] = bid
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def state_dict(self):
+        """Copy of the buffer contents for checkpointing."""
+        return {"states": self.states.copy(), "bids": self.bids.copy(), "rewards": self.rewards.copy(),
+                "next_states": self.next_states.copy(), "position": self.position, "size": self.size}
+
+    def load_state_dict(self, state):
+        self.states[:], self.bids[:], self.rewards[:], self.next_states[:] = (
+            state["states"], state["bids"], state["rewards"], state["next_states"])
+        self.position = state["position"]
+        self.size = state["size"]
+
+    def sample(self, batch_size):
+        """Returns a uniformly sampled minibatch as (states, bids, rewards, next_states)."""
+        idx = np.random.randint(0, self.size, size=batch_size)
+        return self.states[idx], self.bids[idx], self.rewards[idx], self.next_states[idx]
@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class BidHistoryWindow:
+    """
+    Compact in-memory bid history: a (rounds x agents) float64 ring buffer.
+
+    - Agent names are mapped to columns once, so a round costs one array row
+      instead of a dict with string keys.
+    - Only the last `window` rounds are kept (None keeps every round, growing
+      by doubling). Older rounds are dropped from memory; they remain in the
+      on-disk history written by the simulation (CSV/Parquet writer, event log).
+    - Wins and winning-bid totals are tracked over all rounds, so episode
+      summaries do not need the evicted rounds.
+    - Iterating yields `{agent: bid}` dicts for the retained rounds, oldest first.
+    """
+
+    def __init__(self, agent_names, window=10_000, capacity=1024):
+        self.agent_names = list(agent_names)
+        self.index = {name: i for i, name in enumerate(self.agent_names)}
+        self.window = window
+        capacity = window if window else capacity
+        self.values = np.empty((capacity, len(self.agent_names)), dtype=np.float64)
+        self.round_numbers = np.empty(capacity, dtype=np.int64)
+        self.start = 0  # Ring position of the oldest retained round
+        self.size = 0
+        #  Totals over every round ever appended, including evicted ones
+        self.total_rounds = 0
+        self.wins = np.zeros(len(self.agent_names), dtype=np.int64)
+        self.winning_bid_sum = 0.0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, round_num, bids):
+        """Stores one round of `{agent: bid}`, evicting the oldest round when the window is full."""
+        row = np.fromiter((bids[name] for name in self.agent_names), dtype=np.float64, count=len(self.agent_names))
+        capacity = len(self.values)
+        if self.size == capacity:
+            if self.window:
+                self.start = (self.start + 1) % capacity
+                self.size -= 1
+            else:
+                self._grow(capacity * 2)
+                capacity = len(self.values)
+
+        position = (self.start + self.size) % capacity
+        self.values[position] = row
+        self.round_numbers[position] = round_num
+        self.size += 1
+
+        winning_bid = row.min()
+        self.wins += row == winning_bid
+        self.winning_bid_sum += winning_bid
+        self.total_rounds += 1
+
+    def _grow(self, capacity):
+        order = self._order()
+        values = np.empty((capacity, len(self.agent_names)), dtype=np.float64)
+        round_numbers = np.empty(capacity, dtype=np.int64)
+        values[:self.size] = self.values[order]
+        round_numbers[:self.size] = self.round_numbers[order]
+        self.values, self.round_numbers, self.start = values, round_numbers, 0
+
+    def _order(self):
+        return (self.start + np.arange(self.size)) % len(self.values)
+
+    def array(self):
+        """(rounds, bids) of the retained window in round order, as copies."""
+        order = self._order()
+        return self.round_numbers[order], self.values[order]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        row = self.values[(self.start + i) % len(self.values)]
+        return dict(zip(self.agent_names, row.tolist()))
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self[i]
+
+    def mean_winning_bid(self):
+        return self.winning_bid_sum / self.total_rounds if self.total_rounds else None
+
+    def state_dict(self):
+        rounds, values = self.array()
+        return {"agent_names": self.agent_names, "window": self.window, "rounds": rounds, "values": values,
+                "total_rounds": self.total_rounds, "wins": self.wins.copy(), "winning_bid_sum": self.winning_bid_sum}
+
+    def load_state_dict(self, state):
+        self.__init__(state["agent_names"], state["window"], capacity=max(len(state["rounds"]), 1))
+        size = len(state["rounds"])
+        self.values[:size] = state["values"]
+        self.round_numbers[:size] = state["rounds"]
+        self.size = size
+        self.total_rounds = state["total_rounds"]
+        self.wins[:] = state["wins"]
+        self.winning_bid_sum = state["winning_bid_sum"]
@@ -1,113 +1,498 @@
 import os
+import asyncio
 import numpy as np
-import pandas as pd
-import random
-import torch
-import openai
-from dotenv import load_dotenv
-from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
-from src.market.market_threshold import dynamic_market_threshold
-from src.utils.logger import logger
-
-# Load OpenAI API Key from Environment Variables
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    print("⚠️ WARNING: OpenAI API Key not found. AI-powered bidding will be disabled.")
-else:
-    openai.api_key = OPENAI_API_KEY  # Set OpenAI API Key globally
+from src.core.bid_history import BidHistoryWindow
+from src.market.market_threshold import MarketStatistics, dynamic_market_threshold
+from src.utils.data_handler import BidHistoryWriter
+from src.utils.llm_client import BATCH_INSTRUCTION, agent_states_text, get_llm_client, parse_bid_array
+from src.utils.logger import logger, verbose_output
+from src.utils.metrics import RunMetrics
+
+#  Single bid-history file shared with the dashboard
+DATA_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../data/bid_history.csv"))
+PARQUET_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../data/bid_history"))
 
 
 class BiddingSimulation:
     """Runs the multi-agent bidding and negotiation process with AI insights."""
 
-    def __init__(self, agents, rounds=20, initial_threshold=100, data_file="data/bid_history.csv"):
+    def __init__(self, agents, rounds=20, initial_threshold=100, data_file="data/bid_history.csv", vectorized=False,
+                 persist=True, verbose=None, flush_every=100, flush_interval=5.0, writer=None,
+                 async_llm=False, llm_concurrency=16, llm_timeout=30.0, batch_llm=False, event_log=None,
+                 checkpoint=None, history_window=10_000, publisher=None, population_training=False):
         self.agents = agents
         self.rounds = rounds
+        self.initial_threshold = initial_threshold
         self.current_threshold = initial_threshold
-        self.bid_history = []
+        #  Last `history_window` rounds as a (rounds x agents) array; older rounds live in the CSV/event log
+        self.bid_history = BidHistoryWindow([agent.name for agent in agents], history_window)
+        self.market_stats = MarketStatistics()  # Running mean/std of all bids placed
         self.data_file = data_file
+        self.persist = persist  # Write every round to the bid-history CSV
+        self.verbose = verbose_output() if verbose is None else verbose  # Print per-round progress
+        #  Buffered CSV writer: rows are appended every `flush_every` rounds / `flush_interval` seconds
+        if writer is None and persist:
+            writer = BidHistoryWriter(DATA_FILE, flush_every, flush_interval)
+        self.writer = writer if persist else None
+        #  Optional binary event stream (EventLogWriter) with per-round thresholds, bids, rewards, exploration
+        self.event_log = event_log
+        #  Optional CheckpointWriter: state is snapshotted every `checkpoint.every` rounds and saved off-thread
+        self.checkpoint = checkpoint
+        #  Optional live stream (BidStreamPublisher): one non-blocking event per round for the dashboard
+        self.publisher = publisher
+        self.start_round = 1  # Advanced by `load_state_dict` when resuming
+        #  Phase timers and counters of the current run (see `metrics_snapshot`)
+        self.metrics = RunMetrics()
+        self.metrics_base = {}
+        #  Async LLM mode: per-round fan-out bounded by a semaphore and per-call timeouts
+        self.async_llm = async_llm
+        self.llm_concurrency = llm_concurrency
+        self.llm_timeout = llm_timeout
+        #  Batched LLM mode: one structured request per round carries every agent's state
+        self.batch_llm = batch_llm
+        #  Agents that negotiate; duck-typed so torch-free agents never import the torch agents
+        self.negotiators = [agent for agent in agents if hasattr(agent, "negotiate")]
+        #  Batched population engine: one DQN forward pass per round for all agents
+        self.population = None
+        #  Population training: every agent's DQN update in one backward pass and one Adam step per round
+        self.trainer = None
+        if population_training:
+            from src.agents.population import PopulationTrainer
+            self.trainer = PopulationTrainer(agents)
+        if vectorized:
+            from src.agents.population import DQNPopulation  # torch is only imported when agents need it
+            self.population = DQNPopulation(agents, self.trainer.params if self.trainer is not None else None)
         logger.info("Bidding simulation initialized.")
 
     def run_simulation(self):
-        logger.info("Simulation started...")
         """Executes the bidding simulation with AI-powered insights and negotiation steps."""
-        for round_num in range(1, self.rounds + 1):
+        if self.async_llm:
+            return asyncio.run(self.run_simulation_async())
+
+        logger.info("Simulation started...")
+        self.start_metrics()
+        try:
+            for round_num in range(self.start_round, self.rounds + 1):
+                self.run_round(round_num)
+                self.maybe_checkpoint(round_num)
+        finally:
+            self.close()  # Flush buffered bid history even if a round fails
+        logger.info("Simulation completed.")
+
+    async def run_simulation_async(self):
+        """Same simulation, with every agent's LLM calls of a round issued concurrently."""
+        logger.info("Simulation started (async LLM mode)...")
+        semaphore = asyncio.Semaphore(self.llm_concurrency)
+        self.start_metrics()
+        try:
+            for round_num in range(self.start_round, self.rounds + 1):
+                self.announce_round(round_num)
+                with self.metrics.phase("bids"):
+                    bids = await self.collect_bids_async(round_num, semaphore)
+                self.settle_round(round_num, bids)
+                self.maybe_checkpoint(round_num)
+        finally:
+            self.close()
+        logger.info("Simulation completed.")
+
+    def start_metrics(self):
+        """Resets the phase timers; counters are reported relative to this point."""
+        llm = get_llm_client().stats()
+        self.metrics = RunMetrics()
+        self.metrics_base = {"llm_requests": llm["requests"], "llm_cache_hits": llm["hits"],
+                             "llm_request_seconds": llm["request_seconds"], "optimizer_steps": self.optimizer_steps()}
+
+    def optimizer_steps(self):
+        return sum(getattr(agent, "train_steps", 0) for agent in self.agents)
+
+    def metrics_snapshot(self):
+        """
+        Per-run metrics: time and calls per phase (bids, negotiation, rewards,
+        threshold, storage, checkpoint) plus rounds, LLM requests, cache hits,
+        time spent in LLM calls (also counted in the phase that made them)
+        and optimizer steps.
+        """
+        llm = get_llm_client().stats()
+        current = {"llm_requests": llm["requests"], "llm_cache_hits": llm["hits"],
+                   "llm_request_seconds": llm["request_seconds"], "optimizer_steps": self.optimizer_steps()}
+        return self.metrics.snapshot(**{name: value - self.metrics_base.get(name, 0) for name, value in current.items()})
+
+    def run_round(self, round_num):
+        """Runs a single bidding round: bids, negotiation, rewards, threshold update, storage."""
+        self.announce_round(round_num)
+        with self.metrics.phase("bids"):  # RL bids plus AI strategy / suggestion calls
+            bids = self.collect_bids(round_num)
+        self.settle_round(round_num, bids)
+
+    def announce_round(self, round_num):
+        if self.verbose:
             print(f"\n🛒 Round {round_num} - Market Threshold: {self.current_threshold}")
 
-            bids = {}
-            for agent in self.agents:
-                bid = agent.generate_bid(self.current_threshold, self.rounds - round_num)
-                
-                # Integrate AI Assistance for Better Bidding Strategy
-                ai_suggestion = self.get_ai_bid_suggestion(agent.name, self.current_threshold, self.rounds - round_num)
-                if ai_suggestion:
-                    bid = (bid + ai_suggestion) / 2  # Hybrid AI + RL bidding strategy
-                
-                bids[agent.name] = bid
-
-            self.bid_history.append(bids)
-
-            #  Fix: AI-Assisted Negotiation
-            for agent in self.agents:
-                if isinstance(agent, NegotiationAgent): 
+    def collect_bids(self, round_num):
+        """Gathers every agent's (RL + AI) bid for the round."""
+        rounds_remaining = self.rounds - round_num
+        if self.batch_llm:
+            return self.collect_bids_batched(round_num)
+
+        bids = {}
+        if self.population is not None:
+            policy_bids = self.population.generate_bids(self.current_threshold, rounds_remaining)
+
+        for agent in self.agents:
+            if self.population is not None:
+                bid = policy_bids[agent.name]
+            else:
+                bid = agent.generate_bid(self.current_threshold, rounds_remaining)
+
+            # Integrate AI Assistance for Better Bidding Strategy
+            ai_suggestion = self.get_ai_bid_suggestion(agent.name, self.current_threshold, rounds_remaining)
+            if ai_suggestion:
+                bid = (bid + ai_suggestion) / 2  # Hybrid AI + RL bidding strategy
+            
+            bids[agent.name] = bid
+
+        return bids
+
+    def collect_bids_batched(self, round_num):
+        """
+        `collect_bids` with a single AI request for the whole round.
+
+        RL bids are drawn first (same RNG order as the per-agent path). The
+        batched answer for each agent is both its AI suggestion and, for
+        `ai_enabled` agents, its AI strategy, so agents make no requests of
+        their own. Per-agent calls are only made if the reply cannot be parsed.
+        """
+        threshold = self.current_threshold
+        rounds_remaining = self.rounds - round_num
+        if self.population is not None:
+            self.population.refresh()
+            policy_bids = self.population.policy_bids(threshold, rounds_remaining)
+        else:
+            policy_bids = [agent.policy_bid(threshold, rounds_remaining) for agent in self.agents]
+
+        prompt_bids = [max(1, round(bid, 2)) for bid in policy_bids]  # Same clamp as `blend_bid`
+        suggestions = self.get_ai_batch_suggestions(threshold, rounds_remaining, prompt_bids)
+        if suggestions is None:
+            ai_bids = [agent.get_ai_bid_strategy(threshold, rounds_remaining) if agent.ai_enabled else None
+                       for agent in self.agents]
+            suggestions = [self.get_ai_bid_suggestion(agent.name, threshold, rounds_remaining) for agent in self.agents]
+        else:
+            ai_bids = [suggestion if agent.ai_enabled else None for agent, suggestion in zip(self.agents, suggestions)]
+
+        bids = {}
+        for agent, bid, ai_bid, ai_suggestion in zip(self.agents, policy_bids, ai_bids, suggestions):
+            bid = agent.blend_bid(bid, ai_bid, threshold, rounds_remaining)
+            if ai_suggestion:
+                bid = (bid + ai_suggestion) / 2  # Hybrid AI + RL bidding strategy
+            bids[agent.name] = bid
+        return bids
+
+    async def collect_bids_async(self, round_num, semaphore):
+        """
+        Async `collect_bids`: RL bids are drawn first (same RNG order as the sync
+        path), then all agents' strategy and suggestion calls run concurrently.
+        """
+        threshold = self.current_threshold
+        rounds_remaining = self.rounds - round_num
+        if self.population is not None:
+            self.population.refresh()
+            policy_bids = self.population.policy_bids(threshold, rounds_remaining)
+        else:
+            policy_bids = [agent.policy_bid(threshold, rounds_remaining) for agent in self.agents]
+
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+
+        async def skip():
+            return None
+
+        strategy_calls = [bounded(agent.aget_ai_bid_strategy(threshold, rounds_remaining, self.llm_timeout))
+                          if agent.ai_enabled else skip() for agent in self.agents]
+        suggestion_calls = [bounded(self.aget_ai_bid_suggestion(agent.name, threshold, rounds_remaining))
+                            for agent in self.agents]
+        results = await asyncio.gather(*strategy_calls, *suggestion_calls)
+        ai_bids, suggestions = results[:len(self.agents)], results[len(self.agents):]
+
+        bids = {}
+        for agent, bid, ai_bid, ai_suggestion in zip(self.agents, policy_bids, ai_bids, suggestions):
+            bid = agent.blend_bid(bid, ai_bid, threshold, rounds_remaining)
+            if ai_suggestion:
+                bid = (bid + ai_suggestion) / 2  # Hybrid AI + RL bidding strategy
+            bids[agent.name] = bid
+        return bids
+
+    def settle_round(self, round_num, bids):
+        """Negotiation, rewards, threshold update and storage for a round's bids."""
+        metrics = self.metrics
+        threshold = self.current_threshold
+        offered_bids = dict(bids) if self.event_log is not None else None
+
+        #  Fix: AI-Assisted Negotiation
+        with metrics.phase("negotiation"):
+            if self.batch_llm:
+                self.negotiate_batched(bids)
+            else:
+                for agent in self.negotiators:
                     bid = agent.negotiate(bids, self.current_threshold)
                     bids[agent.name] = bid
 
-            winning_bid = min(bids.values()) if bids else None  # Assume lowest bid wins
+        winning_bid = min(bids.values()) if bids else None  # Assume lowest bid wins
+        self.bid_history.append(round_num, bids)
+
+        #  The last round (no rounds remaining) is terminal: its transition is stored right away,
+        #  with a next state that `compute_targets` never bootstraps from
+        next_state = (threshold, 0) if round_num == self.rounds else None
 
-            # Fix: Move reward update inside the loop
-            for agent in self.agents:
-                reward = 10 if bids[agent.name] == winning_bid else -5
-                agent.update_reward(reward)
+        # Fix: Move reward update inside the loop
+        rewards = []
+        with metrics.phase("rewards"):  # Includes DQN training steps
+            if self.trainer is not None:
+                rewards = [10 if bids[agent.name] == winning_bid else -5 for agent in self.agents]
+                self.trainer.update_rewards(rewards, [next_state] * len(self.agents))
+            else:
+                for agent in self.agents:
+                    reward = 10 if bids[agent.name] == winning_bid else -5
+                    agent.update_reward(reward, next_state)
+                    rewards.append(reward)
 
-            #  Update market threshold dynamically
-            self.current_threshold = dynamic_market_threshold(
-                self.current_threshold, 
-                [b for round_bids in self.bid_history for b in round_bids.values()]
-            )
+        #  Update market threshold dynamically (incremental statistics, O(agents) per round)
+        with metrics.phase("threshold"):
+            self.market_stats.update(list(bids.values()))
+            self.current_threshold = dynamic_market_threshold(self.current_threshold, self.market_stats)
 
+        if self.verbose:
             print(f"📌 Bids: {bids}, 🏆 Winning Bid: {winning_bid}")
-            self.save_bid_data(round_num, bids, winning_bid)
-            logger.info("Simulation completed.")
+
+        with metrics.phase("storage"):
+            if self.event_log is not None:
+                self.event_log.append_round(
+                    round_num, threshold, self.current_threshold, winning_bid,
+                    [bids[agent.name] for agent in self.agents],
+                    [bids[agent.name] - offered_bids[agent.name] for agent in self.agents],  # Negotiation adjustments
+                    rewards,
+                    [agent.exploration_rate for agent in self.agents],
+                )
+
+            if self.publisher is not None:
+                from src.utils.bid_stream import round_event
+                self.publisher.publish(round_event(round_num, threshold, self.current_threshold, winning_bid, bids))
+
+            if self.persist:
+                self.save_bid_data(round_num, bids, winning_bid)
+        metrics.count("rounds")
+
+    def negotiate_batched(self, bids):
+        """
+        Negotiation with every negotiator's AI counter-offer fetched in one request.
+
+        Rule-based moves are applied agent by agent as in the per-agent loop;
+        a counter-offer then replaces the move, like in `NegotiationAgent.negotiate`.
+        """
+        if not self.negotiators:
+            return bids
+        threshold = self.current_threshold
+        lowest_bids = []
+        for agent in self.negotiators:
+            lowest_bids.append(min(bids.values()))
+            bids[agent.name] = agent.negotiate(bids, threshold, use_ai=False)
+
+        counter_offers = self.get_ai_batch_counter_offers(threshold, lowest_bids)
+        if counter_offers is None:
+            counter_offers = [agent.get_ai_negotiation_strategy(lowest_bid, threshold)
+                              for agent, lowest_bid in zip(self.negotiators, lowest_bids)]
+        for agent, counter_offer in zip(self.negotiators, counter_offers):
+            if counter_offer:
+                bids[agent.name] = counter_offer
+        return bids
+
+    @staticmethod
+    def bid_suggestion_messages(llm, market_threshold, rounds_remaining):
+        #  The prompt only carries the market state, so all agents share one cached answer per state
+        return [
+            {"role": "system", "content": "You are an AI expert in competitive market bidding. Return only a number."},
+            {"role": "user", "content": f"An agent is in a bidding war. "
+                                        f"Market threshold: {llm.quantize(market_threshold)}, Rounds left: {rounds_remaining}. "
+                                        f"Suggest an optimal bid."}
+        ]
+
+    @staticmethod
+    def batch_suggestion_messages(llm, market_threshold, rounds_remaining, agent_bids):
+        return [
+            {"role": "system", "content": f"You are an AI expert in competitive market bidding. {BATCH_INSTRUCTION}"},
+            {"role": "user", "content": f"Several agents are in a bidding war, each with its current RL bid. "
+                                        f"Market threshold: {llm.quantize(market_threshold)}, Rounds left: {rounds_remaining}. "
+                                        f"Suggest an optimal bid for every agent. {agent_states_text(agent_bids, llm.bucket)}"}
+        ]
+
+    @staticmethod
+    def batch_negotiation_messages(llm, market_threshold, lowest_bids):
+        return [
+            {"role": "system", "content": f"You are an AI specializing in market negotiations. {BATCH_INSTRUCTION}"},
+            {"role": "user", "content": f"Several agents are negotiating, each facing the lowest competitor bid listed. "
+                                        f"Market threshold: {llm.quantize(market_threshold)}. "
+                                        f"Suggest a counter-offer for every agent. {agent_states_text(lowest_bids, llm.bucket)}"}
+        ]
+
+    def get_ai_batch_suggestions(self, market_threshold, rounds_remaining, agent_bids):
+        """
+        AI bid suggestions for all agents from one request.
+
+        Returns None when AI is disabled or the reply is not a valid JSON
+        array of one bid per agent; callers then fall back to per-agent calls.
+        """
+        suggestions = self.request_bid_array(self.batch_suggestion_messages,
+                                             (market_threshold, rounds_remaining, agent_bids), "suggestion")
+        if suggestions is not None and self.verbose:
+            print(f"🤖 AI Suggested Bids: {dict(zip((agent.name for agent in self.agents), suggestions))}")
+        return suggestions
+
+    def get_ai_batch_counter_offers(self, market_threshold, lowest_bids):
+        """Negotiators' AI counter-offers from one request, or None (see `get_ai_batch_suggestions`)."""
+        counter_offers = self.request_bid_array(self.batch_negotiation_messages, (market_threshold, lowest_bids),
+                                                "negotiation")
+        if counter_offers is not None and self.verbose:
+            print(f"🤖 AI Suggested Counter-Bids: {dict(zip((agent.name for agent in self.negotiators), counter_offers))}")
+        return counter_offers
+
+    @staticmethod
+    def request_bid_array(build_messages, args, kind):
+        """
+        Sends one batched prompt built by `build_messages(llm, *args)`.
+
+        The last of `args` holds one value per agent; returns one parsed bid
+        per agent, or None when AI is off or the reply is invalid.
+        """
+        llm = get_llm_client()
+        if not llm.enabled:
+            return None
+
+        try:
+            return parse_bid_array(llm.complete(build_messages(llm, *args)), len(args[-1]))
+        except Exception as e:
+            print(f"⚠️ Batched AI {kind} failed ({e}), falling back to per-agent calls.")
+            return None
 
     def get_ai_bid_suggestion(self, agent_name, market_threshold, rounds_remaining):
         """AI-powered bidding strategy suggestion."""
-        if not OPENAI_API_KEY:
+        llm = get_llm_client()
+        if not llm.enabled:
             return None  # Skip AI if API Key is missing
 
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an AI expert in competitive market bidding."},
-                    {"role": "user", "content": f"Agent '{agent_name}' is in a bidding war. "
-                                                 f"Market threshold: {market_threshold}, Rounds left: {rounds_remaining}. "
-                                                 f"Suggest an optimal bid."}
-                ]
-            )
-            bid_suggestion = float(response["choices"][0]["message"]["content"])
-            print(f"🤖 AI Suggested Bid for {agent_name}: {bid_suggestion}")
+            reply = llm.complete(self.bid_suggestion_messages(llm, market_threshold, rounds_remaining))
+            bid_suggestion = float(reply)
+            if self.verbose:
+                print(f"🤖 AI Suggested Bid for {agent_name}: {bid_suggestion}")
             return bid_suggestion
         except Exception as e:
             print(f"⚠️ OpenAI API Error: {e}")
             return None
 
+    async def aget_ai_bid_suggestion(self, agent_name, market_threshold, rounds_remaining):
+        """Async variant of `get_ai_bid_suggestion`, bounded by `llm_timeout`."""
+        llm = get_llm_client()
+        if not llm.enabled:
+            return None
+
+        try:
+            reply = await llm.acomplete(self.bid_suggestion_messages(llm, market_threshold, rounds_remaining),
+                                        timeout=self.llm_timeout)
+            bid_suggestion = float(reply)
+            if self.verbose:
+                print(f"🤖 AI Suggested Bid for {agent_name}: {bid_suggestion}")
+            return bid_suggestion
+        except Exception as e:
+            print(f"⚠️ OpenAI API Error: {e!r}")
+            return None
+
     def save_bid_data(self, round_num, bids, winning_bid):
-        """Stores bid data in a CSV file."""
-        data_file = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../data/bid_history.csv"))
+        """Buffers bid data for the CSV file; rows are written in batches by the writer."""
+        self.writer.append_round(round_num, bids, winning_bid)
 
-        if not os.path.exists("data"):  # ✅ Ensure directory exists
-            os.makedirs("data")
+    def maybe_checkpoint(self, round_num):
+        """Snapshots the run after `round_num` when a checkpoint is due; the write happens off-thread."""
+        if self.checkpoint is not None and self.checkpoint.due(round_num):
+            with self.metrics.phase("checkpoint"):  # Snapshot only; the file is written off-thread
+                self.checkpoint.submit(self.state_dict(round_num))
 
-        file_exists = os.path.exists(data_file) and os.stat(data_file).st_size > 0
+    def state_dict(self, round_num):
+        """
+        Everything needed to continue deterministically after `round_num`.
 
-        df = pd.DataFrame([{
-            "Round": round_num, "Agent": agent, "Bid": bid, "Winning_Bid": (bid == winning_bid)
-        } for agent, bid in bids.items()])
+        Buffered history is flushed first so the recorded file positions
+        match the rounds in the snapshot.
+        """
+        from src.core.checkpoint import capture_rng_state
 
-        df.to_csv(data_file, mode='a', header=not file_exists, index=False)  # ✅ Fix header condition
-        print(f" Saved bid data for Round {round_num}")
+        if self.writer is not None:
+            self.writer.flush()
+        if self.trainer is not None:
+            self.trainer.write_back()  # Agent optimizers carry the population's Adam state
+        return {
+            "round": round_num,
+            "rounds": self.rounds,
+            "initial_threshold": self.initial_threshold,
+            "current_threshold": self.current_threshold,
+            "market_stats": self.market_stats.state_dict(),
+            "bid_history": self.bid_history.state_dict(),
+            "agents": [agent.state_dict() for agent in self.agents],
+            "rng": capture_rng_state(),
+            "writer_position": self.writer.position() if self.writer is not None else None,
+            "event_log_position": self.event_log.position() if self.event_log is not None else None,
+        }
+
+    def load_state_dict(self, state):
+        """Resumes from a checkpoint: restores agents, market and RNG state and rolls history files back."""
+        from src.core.checkpoint import restore_rng_state
+
+        names = [agent.name for agent in self.agents]
+        if [agent_state["name"] for agent_state in state["agents"]] != names:
+            raise ValueError(f"Checkpoint agents do not match {names}")
+
+        for agent, agent_state in zip(self.agents, state["agents"]):
+            agent.load_state_dict(agent_state)
+        if self.trainer is not None:
+            self.trainer.load_from_agents()
+        self.initial_threshold = state["initial_threshold"]
+        self.current_threshold = state["current_threshold"]
+        self.market_stats.load_state_dict(state["market_stats"])
+        self.bid_history.load_state_dict(state["bid_history"])
+        if self.writer is not None and state["writer_position"] is not None:
+            self.writer.truncate(state["writer_position"])
+        if self.event_log is not None and state["event_log_position"] is not None:
+            self.event_log.truncate(state["event_log_position"])
+        restore_rng_state(state["rng"])
+        self.start_round = state["round"] + 1
+        logger.info("Resuming simulation after round %d.", state["round"])
+
+    def close(self):
+        """Flushes buffered bid history, the event log and pending checkpoints to disk."""
+        if self.checkpoint is not None:
+            with self.metrics.phase("checkpoint"):
+                self.checkpoint.flush()
+        with self.metrics.phase("storage"):
+            if self.event_log is not None:
+                self.event_log.flush()
+            if self.writer is not None:
+                self.writer.flush()
+        if self.writer is not None:
+            if self.verbose:
+                print(f" Saved bid data to {self.writer.data_file} ({self.writer.rows_written} rows)")
+
+    def summary(self):
+        """Returns the outcome of the episode as a plain dict."""
+        #  Totals cover every round played, not just the retained window
+        history = self.bid_history
+        mean_winning_bid = history.mean_winning_bid()
+        return {
+            "rounds": history.total_rounds,
+            "initial_threshold": self.initial_threshold,
+            "final_threshold": float(self.current_threshold),
+            "rewards": {agent.name: agent.reward for agent in self.agents},
+            "wins": {name: int(wins) for name, wins in zip(history.agent_names, history.wins)},
+            "mean_winning_bid": float(mean_winning_bid) if mean_winning_bid is not None else None,
+        }
 
     def summarize_results(self):
         """Displays final results of the bidding simulation."""
@@ -115,17 +500,15 @@ class BiddingSimulation:
         print("\n🏁 Final Rewards:", results)
 
         for agent in self.agents:
-            sample_states = [torch.tensor([100, 10], dtype=torch.float32),
-                             torch.tensor([80, 5], dtype=torch.float32),
-                             torch.tensor([50, 1], dtype=torch.float32)]
-
-            q_values = [agent.model(state).item() for state in sample_states]
+            q_values = agent.sample_q_values()
             print(f"📊 Agent {agent.name} Sample Q-Values: {q_values}")
 
         print("\n📈 Q-Value Evolution Tracking Done!")
 
 
 if __name__ == "__main__":
+    from src.agents.bidding_agent import DQNBiddingAgent
+
     # Fix: Use DQNBiddingAgent instead of NegotiationAgent
     agents = [DQNBiddingAgent(name=f"Agent {i}") for i in range(1, 6)]
     
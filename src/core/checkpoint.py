@@ -0,0 +1,111 @@
+import os
+import random
+import threading
+import numpy as np
+import torch
+
+CHECKPOINT_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../data/checkpoint.pt"))
+
+
+def capture_rng_state():
+    """States of every random stream the simulation draws from."""
+    return {"random": random.getstate(), "numpy": np.random.get_state(), "torch": torch.get_rng_state()}
+
+
+def restore_rng_state(state):
+    random.setstate(state["random"])
+    np.random.set_state(state["numpy"])
+    torch.set_rng_state(state["torch"])
+
+
+def save_checkpoint(state, path):
+    """Writes a checkpoint atomically: a crash mid-write leaves the previous checkpoint intact."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        torch.save(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """Loads a checkpoint written by `save_checkpoint` (trusted local file: contains RNG and optimizer state)."""
+    return torch.load(path, weights_only=False)
+
+
+class CheckpointWriter:
+    """
+    Background thread that saves checkpoints without stalling the round loop.
+
+    - `submit` hands over an already-copied state and returns immediately.
+    - If a newer state arrives while one is still waiting, only the newest
+      is written.
+    - `flush` blocks until everything submitted is on disk; errors from the
+      writer thread are re-raised there and on the next `submit`.
+    """
+
+    def __init__(self, path=CHECKPOINT_FILE, every=1000):
+        self.path = path
+        self.every = every  # Rounds between checkpoints
+        self.pending = None
+        self.busy = False
+        self.error = None
+        self.written = 0
+        self.last_round = None
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self.thread.start()
+
+    def due(self, round_num):
+        return bool(self.every) and round_num % self.every == 0
+
+    def submit(self, state):
+        with self.condition:
+            self._raise_error()
+            self.pending = state
+            self.condition.notify_all()
+
+    def flush(self):
+        with self.condition:
+            while self.pending is not None or self.busy:
+                self.condition.wait()
+            self._raise_error()
+
+    def close(self):
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                state, self.pending, self.busy = self.pending, None, True
+
+            try:
+                save_checkpoint(state, self.path)
+            except Exception as e:
+                error = e
+            else:
+                error = None
+
+            with self.condition:
+                self.busy = False
+                if error is None:
+                    self.written += 1
+                    self.last_round = state["round"]
+                else:
+                    self.error = error
+                self.condition.notify_all()
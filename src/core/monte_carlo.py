@@ -0,0 +1,73 @@
+import os
+import time
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from src.core.bidding_simulation import BiddingSimulation
+
+DEFAULT_EPISODE = {
+    "seed": 0,
+    "rounds": 50,
+    "initial_threshold": 100,
+    "num_agents": 5,
+    "agent_kwargs": {},
+    "vectorized": False,
+    "population_training": False,
+}
+
+
+def _init_worker():
+    """Pins each worker to one intra-op thread so episodes scale with processes, not threads."""
+    import torch
+    torch.set_num_threads(1)
+
+
+def run_episode(config):
+    """Runs one seeded BiddingSimulation episode and returns its summary."""
+    import torch
+    from src.agents.bidding_agent import DQNBiddingAgent
+
+    config = {**DEFAULT_EPISODE, **config}
+    seed = config["seed"]
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    start = time.perf_counter()
+    agents = [DQNBiddingAgent(name=f"Agent {i}", **config["agent_kwargs"])
+              for i in range(1, config["num_agents"] + 1)]
+    simulation = BiddingSimulation(agents=agents, rounds=config["rounds"],
+                                   initial_threshold=config["initial_threshold"],
+                                   vectorized=config["vectorized"], population_training=config["population_training"],
+                                   persist=False, verbose=False)
+    simulation.run_simulation()
+
+    summary = simulation.summary()
+    summary["seed"] = seed
+    summary["elapsed"] = time.perf_counter() - start
+    return summary
+
+
+def run_many(configs, workers=None, mp_context="spawn"):
+    """
+    Runs many independent episodes across a process pool.
+
+    - `configs` is an iterable of episode dicts (see DEFAULT_EPISODE).
+    - Summaries are yielded as episodes finish, not in submission order.
+    - Each episode seeds `random`, NumPy and torch from its own `seed`, so
+      results do not depend on which worker ran it.
+    """
+    workers = workers or os.cpu_count()
+    context = multiprocessing.get_context(mp_context) if mp_context else None
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        futures = [pool.submit(run_episode, config) for config in configs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def scenario_grid(seeds, thresholds, **episode):
+    """Builds one episode config per (seed, initial threshold) pair."""
+    return [{**episode, "seed": seed, "initial_threshold": threshold}
+            for threshold in thresholds for seed in seeds]
@@ -1,59 +1,142 @@
-import os
+import time
 import numpy as np
-import openai
-from dotenv import load_dotenv
-from src.agents.bidding_agent import NegotiationAgent
-
-#  Load OpenAI API Key from Environment Variables
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    print("⚠️ WARNING: OpenAI API Key not found. AI-powered negotiation will be disabled.")
-else:
-    openai.api_key = OPENAI_API_KEY  # Set OpenAI API Key globally
+from src.utils.llm_client import BATCH_INSTRUCTION, agent_states_text, get_llm_client, parse_bid_array
+from src.utils.logger import logger, verbose_output
 
 
 class NegotiationLogic:
     """Implements AI-powered negotiation strategies for contract bidding."""
 
-    def __init__(self, agents, negotiation_rounds=20):
+    def __init__(self, agents, negotiation_rounds=20, batch_llm=False, epsilon=0.0, rank_patience=None):
         self.agents = agents
-        self.negotiation_rounds = negotiation_rounds
+        self.negotiation_rounds = negotiation_rounds  # Upper bound on passes over the agents
+        self.batch_llm = batch_llm  # One AI request per negotiation round instead of one per agent
+        #  Convergence: stop once no bid moves more than `epsilon` in a pass (None disables),
+        #  or once the rank order has not changed for `rank_patience` passes.
+        #  The rule-based NegotiationAgent undercuts the lowest bid by 1 every pass, so its bids
+        #  only reach a fixed point at the floor of 1; `epsilon` pays off for agents that settle sooner.
+        self.epsilon = epsilon
+        self.rank_patience = rank_patience
+        self.last_report = None
 
     def negotiate_bids(self, market_threshold, competitor_bids):
         """Runs negotiation rounds where agents adjust bids based on competition & AI insights."""
-        for _ in range(self.negotiation_rounds):
-            for agent in self.agents:
-                #  Step 1: Get RL-Based Negotiation Bid
-                new_bid = agent.negotiate(competitor_bids, market_threshold)
-
-                #  Step 2: Get AI-Powered Negotiation Assistance
-                ai_negotiation = self.get_ai_negotiation_bid(agent.name, new_bid, competitor_bids, market_threshold)
-                if ai_negotiation:
-                    new_bid = (new_bid + ai_negotiation) / 2  # Hybrid AI + RL adjustment
-                
-                competitor_bids[agent.name] = new_bid  # ✅ Update bid after AI & RL processing
+        report = {"passes": 0, "max_passes": self.negotiation_rounds, "passes_saved": 0, "converged": None,
+                  "pass_times": [], "agent_calls": 0}
+        ranking, stable_passes = None, 0
+
+        for pass_num in range(1, self.negotiation_rounds + 1):
+            start = time.perf_counter()
+            previous_bids = dict(competitor_bids)
+
+            if self.batch_llm:
+                self.negotiate_round_batched(market_threshold, competitor_bids)
+            else:
+                self.negotiate_round(market_threshold, competitor_bids)
+
+            report["passes"] = pass_num
+            report["pass_times"].append(time.perf_counter() - start)
+            report["agent_calls"] += len(self.agents)
+
+            max_delta = max((abs(bid - previous_bids.get(name, bid)) for name, bid in competitor_bids.items()),
+                            default=0.0)
+            new_ranking = sorted(competitor_bids, key=competitor_bids.get)
+            stable_passes = stable_passes + 1 if new_ranking == ranking else 0
+            ranking = new_ranking
+
+            if self.epsilon is not None and max_delta <= self.epsilon:
+                report["converged"] = "epsilon"
+                break
+            if self.rank_patience and stable_passes >= self.rank_patience:
+                report["converged"] = "rank_order"
+                break
+
+        report["passes_saved"] = self.negotiation_rounds - report["passes"]
+        self.last_report = report
+        logger.info("Negotiation finished after %d/%d passes (converged: %s).",
+                    report["passes"], self.negotiation_rounds, report["converged"])
+        return competitor_bids
+
+    def negotiate_round(self, market_threshold, competitor_bids):
+        """One negotiation pass with a per-agent AI request."""
+        for agent in self.agents:
+            #  Step 1: Get RL-Based Negotiation Bid
+            new_bid = agent.negotiate(competitor_bids, market_threshold)
+
+            #  Step 2: Get AI-Powered Negotiation Assistance
+            ai_negotiation = self.get_ai_negotiation_bid(agent.name, new_bid, competitor_bids, market_threshold)
+            if ai_negotiation:
+                new_bid = (new_bid + ai_negotiation) / 2  # Hybrid AI + RL adjustment
+
+            competitor_bids[agent.name] = new_bid  # ✅ Update bid after AI & RL processing
+        return competitor_bids
 
+    def negotiate_round_batched(self, market_threshold, competitor_bids):
+        """
+        One negotiation round with a single AI request for all agents.
+
+        Rule-based bids are updated agent by agent as in the per-agent loop,
+        without the agents' own AI strategy requests; the AI counter-offers
+        for the resulting bids are then fetched together in one request.
+        """
+        competitor_bids_before = dict(competitor_bids)
+        new_bids = []
+        for agent in self.agents:
+            new_bid = agent.negotiate(competitor_bids, market_threshold, use_ai=False)
+            competitor_bids[agent.name] = new_bid
+            new_bids.append(new_bid)
+
+        counter_offers = self.get_ai_negotiation_bids(new_bids, competitor_bids_before, market_threshold)
+        for agent, new_bid, ai_negotiation in zip(self.agents, new_bids, counter_offers):
+            if ai_negotiation:
+                new_bid = (new_bid + ai_negotiation) / 2  # Hybrid AI + RL adjustment
+            competitor_bids[agent.name] = new_bid
         return competitor_bids
 
+    def get_ai_negotiation_bids(self, current_bids, competitor_bids, market_threshold):
+        """Batched `get_ai_negotiation_bid`; falls back to per-agent calls if the reply cannot be parsed."""
+        llm = get_llm_client()
+        if not llm.enabled:
+            return [None] * len(self.agents)
+
+        try:
+            bids = sorted(llm.quantize(bid) for bid in competitor_bids.values())
+            reply = llm.complete([
+                {"role": "system", "content": f"You are an AI specializing in market negotiations. {BATCH_INSTRUCTION}"},
+                {"role": "user", "content": f"Several agents are negotiating their bids."
+                                            f" Market threshold: {llm.quantize(market_threshold)}, "
+                                            f"Competitor bids: {bids}. Suggest a counter-offer for every agent. "
+                                            f"{agent_states_text(current_bids, llm.bucket)}"}
+            ])
+            suggested_bids = parse_bid_array(reply, len(self.agents))
+        except Exception as e:
+            print(f"⚠️ Batched AI negotiation failed ({e}), falling back to per-agent calls.")
+            return [self.get_ai_negotiation_bid(agent.name, bid, competitor_bids, market_threshold)
+                    for agent, bid in zip(self.agents, current_bids)]
+
+        if verbose_output():
+            print(f"🤖 AI Suggested Counter-Bids: {dict(zip((agent.name for agent in self.agents), suggested_bids))}")
+        return suggested_bids
+
     def get_ai_negotiation_bid(self, agent_name, current_bid, competitor_bids, market_threshold):
         """AI-powered negotiation suggestion."""
-        if not OPENAI_API_KEY:
+        llm = get_llm_client()
+        if not llm.enabled:
             return None  # Skip AI if API Key is missing
 
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an AI specializing in market negotiations."},
-                    {"role": "user", "content": f"Agent '{agent_name}' is negotiating a bid."
-                                                 f" Market threshold: {market_threshold}, "
-                                                 f"Competitor bids: {competitor_bids}, "
-                                                 f"Current bid: {current_bid}. Suggest a counter-offer."}
-                ]
-            )
-            suggested_bid = float(response["choices"][0]["message"]["content"])
-            print(f"🤖 AI Suggested Counter-Bid for {agent_name}: {suggested_bid}")
+            #  Quantised, name-free prompt so identical negotiation states hit the cache
+            bids = sorted(llm.quantize(bid) for bid in competitor_bids.values())
+            reply = llm.complete([
+                {"role": "system", "content": "You are an AI specializing in market negotiations. Return only a number."},
+                {"role": "user", "content": f"An agent is negotiating a bid."
+                                            f" Market threshold: {llm.quantize(market_threshold)}, "
+                                            f"Competitor bids: {bids}, "
+                                            f"Current bid: {llm.quantize(current_bid)}. Suggest a counter-offer."}
+            ])
+            suggested_bid = float(reply)
+            if verbose_output():
+                print(f"🤖 AI Suggested Counter-Bid for {agent_name}: {suggested_bid}")
             return suggested_bid
         except Exception as e:
             print(f"⚠️ OpenAI API Error: {e}")
@@ -65,6 +148,8 @@ class NegotiationLogic:
 
 
 if __name__ == "__main__":
+    from src.agents.bidding_agent import NegotiationAgent
+
     # Initialize AI-powered Negotiation Agents
     agents = [NegotiationAgent(name=f"Agent {i}") for i in range(1, 6)]
     negotiation_logic = NegotiationLogic(agents)
@@ -82,3 +167,6 @@ if __name__ == "__main__":
     finalized_bids = negotiation_logic.finalize_bids(negotiated_bids)
 
     print("\n Final Negotiated Bids (Sorted):", finalized_bids)
+    report = negotiation_logic.last_report
+    print(f" Negotiation passes: {report['passes']}/{report['max_passes']} "
+          f"(saved {report['passes_saved']}, converged: {report['converged']})")
@@ -1,16 +1,52 @@
-import os
 import random
 import numpy as np
-import openai
-from dotenv import load_dotenv
+from src.utils.llm_client import get_llm_client
+from src.utils.logger import verbose_output
 
-# Load OpenAI API Key
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    print("⚠️ WARNING: OpenAI API Key not found. AI-powered threshold prediction will be disabled.")
-else:
-    openai.api_key = OPENAI_API_KEY  # Set OpenAI API Key globally
+
+class MarketStatistics:
+    """
+    Running mean and standard deviation of every bid placed so far.
+
+    - Each round is merged in O(agents) with Chan's parallel form of Welford's
+      algorithm, instead of re-flattening the whole bid history.
+    - Matches `np.mean` / `np.std` (population std) over all bids seen.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+
+    def update(self, bids):
+        """Merges one round of bids into the running statistics."""
+        bids = np.asarray(bids, dtype=np.float64)
+        n = bids.size
+        if n == 0:
+            return
+
+        batch_mean = bids.mean()
+        batch_m2 = np.square(bids - batch_mean).sum()
+        delta = batch_mean - self.mean
+        total = self.count + n
+
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def state_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    def load_state_dict(self, state):
+        self.count, self.mean, self.m2 = state["count"], state["mean"], state["m2"]
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
 
 
 def dynamic_market_threshold(current_threshold, all_bids):
@@ -20,10 +56,15 @@ def dynamic_market_threshold(current_threshold, all_bids):
     - Uses AI to analyze bidding trends.
     - Adds controlled randomness for realistic fluctuations.
     - Prevents extreme dips in market threshold.
+    - `all_bids` is either a sequence of bids or a running `MarketStatistics`.
     """
 
-    avg_bid = np.mean(all_bids)
-    std_dev = np.std(all_bids)  #  Consider bid volatility
+    if isinstance(all_bids, MarketStatistics):
+        avg_bid = all_bids.mean
+        std_dev = all_bids.std
+    else:
+        avg_bid = np.mean(all_bids)
+        std_dev = np.std(all_bids)  #  Consider bid volatility
     fluctuation = random.uniform(-3, 3)  # Minor random fluctuation
 
     #  Step 1: Traditional Statistical Adjustment
@@ -48,25 +89,24 @@ def get_ai_market_adjustment(current_threshold, avg_bid, std_dev):
     Uses OpenAI GPT-4 to analyze bid trends and suggest threshold adjustments.
     """
 
-    if not OPENAI_API_KEY:
+    llm = get_llm_client()
+    if not llm.enabled:
         return None  # Skip AI adjustment if API Key is missing
 
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an AI market analyst."},
-                {"role": "user", "content": f"""
-                The current market threshold is {current_threshold}.
-                - Average bid: {avg_bid}
-                - Standard deviation of bids: {std_dev}
-                
-                Based on these trends, suggest a new market threshold that ensures fair pricing and prevents drastic fluctuations.
-                """}
-            ]
-        )
-        suggested_threshold = float(response["choices"][0]["message"]["content"])
-        print(f" AI-Suggested Market Threshold: {suggested_threshold}")
+        reply = llm.complete([
+            {"role": "system", "content": "You are an AI market analyst. Return only a number."},
+            {"role": "user", "content": f"""
+            The current market threshold is {llm.quantize(current_threshold)}.
+            - Average bid: {llm.quantize(avg_bid)}
+            - Standard deviation of bids: {llm.quantize(std_dev)}
+            
+            Based on these trends, suggest a new market threshold that ensures fair pricing and prevents drastic fluctuations.
+            """}
+        ])
+        suggested_threshold = float(reply)
+        if verbose_output():
+            print(f" AI-Suggested Market Threshold: {suggested_threshold}")
         return suggested_threshold
     except Exception as e:
         print(f"⚠️ OpenAI API Error: {e}")
@@ -0,0 +1,277 @@
+import io
+import os
+import glob
+import threading
+import numpy as np
+import pandas as pd
+from src.utils.data_handler import COLUMNS
+
+
+def _true_values(column):
+    if column.dtype == bool:
+        return column.to_numpy()
+    return (column.astype(str).str.lower() == "true").to_numpy()
+
+
+class BidRollups:
+    """
+    Incremental per-round and per-agent aggregates of the bid history, for the dashboard.
+
+    - CSV: `refresh()` tails the file from the last byte offset, so only
+      appended rows are parsed. A replaced, truncated or rewritten file
+      (e.g. rolled back by a resumed checkpoint) is detected and re-read.
+    - Parquet store: part files are immutable, so only unseen parts are read.
+    - Rollups are (round x agent) matrices of bid sum, squared sum, count and
+      wins; bids of repeated runs in the same file are averaged per round, as
+      the dashboard always did.
+    - A bounded uniform sample of raw bids per agent feeds the distribution plot.
+    - `version` (file mtime, byte offset) changes whenever new rows were folded
+      in, so derived views can be cached on it.
+    """
+
+    def __init__(self, path, sample_size=2000, chunk_bytes=64 << 20, seed=0):
+        self.path = path
+        self.sample_size = sample_size
+        self.chunk_bytes = chunk_bytes  # Bytes parsed per read_csv call while catching up
+        self.seed = seed
+        self.lock = threading.Lock()  # Streamlit sessions share one instance
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.mtime = None
+        self.inode = None
+        self.header = None
+        self.fingerprint = b""  # Bytes just before `offset`, to detect rewritten files
+        self.parts = set()
+        self.rows_read = 0
+        self.agents = []
+        self.agent_index = {}
+        self.sums = np.zeros((0, 0))
+        self.squares = np.zeros((0, 0))
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.wins = np.zeros((0, 0), dtype=np.int64)
+        self.samples = {}  # Agent column -> (keys, rounds, bids), smallest `sample_size` random keys
+        self.rng = np.random.default_rng(self.seed)
+
+    @property
+    def version(self):
+        return self.mtime, self.offset
+
+    # ---------------------------------------------------------------- loading
+
+    def refresh(self):
+        """Folds rows appended since the last call into the rollups; returns True when anything changed."""
+        with self.lock:
+            if os.path.isdir(self.path):
+                return self._refresh_parquet()
+            if not os.path.exists(self.path):
+                changed = self.rows_read > 0
+                self.reset()
+                return changed
+            return self._refresh_csv()
+
+    def _refresh_csv(self):
+        stat = os.stat(self.path)
+        changed = False
+        with open(self.path, "rb") as file:
+            if stat.st_ino != self.inode or stat.st_size < self.offset or not self._same_prefix(file):
+                self.reset()
+                self.inode = stat.st_ino
+                changed = True
+            if stat.st_size == self.offset:
+                self.mtime = stat.st_mtime_ns
+                return changed
+
+            file.seek(self.offset)
+            if self.header is None:
+                line = file.readline()
+                if not line.endswith(b"\n"):
+                    return changed  # Header still being written
+                self.header = line.decode("utf-8").strip().split(",")
+                self.offset = file.tell()
+
+            while True:
+                data = file.read(self.chunk_bytes)
+                end = data.rfind(b"\n") + 1
+                if end == 0:
+                    break  # Nothing new, or only a partial last line: picked up on the next refresh
+                self.add(pd.read_csv(io.BytesIO(data[:end]), header=None, names=self.header))
+                self.offset += end
+                self.fingerprint = data[max(0, end - 64):end]
+                file.seek(self.offset)
+                changed = True
+
+        self.mtime = stat.st_mtime_ns
+        return changed
+
+    def _same_prefix(self, file):
+        if not self.fingerprint:
+            return True
+        file.seek(self.offset - len(self.fingerprint))
+        return file.read(len(self.fingerprint)) == self.fingerprint
+
+    def _refresh_parquet(self):
+        import pyarrow.parquet as pq  # Optional dependency, only needed for the Parquet backend
+
+        paths = set(glob.glob(os.path.join(self.path, "**", "*.parquet"), recursive=True))
+        if not self.parts <= paths:
+            self.reset()  # Parts were removed: rebuild from what is left
+        new = sorted(paths - self.parts)
+        for path in new:
+            self.add(pq.read_table(path, columns=COLUMNS).to_pandas())
+            self.parts.add(path)
+        self.offset = len(self.parts)
+        self.mtime = max((os.path.getmtime(path) for path in paths), default=None)
+        return bool(new)
+
+    def add(self, df):
+        """Folds a DataFrame with the bid-history columns into the rollups."""
+        rounds = pd.to_numeric(df["Round"], errors="coerce")
+        bids = pd.to_numeric(df["Bid"], errors="coerce")
+        valid = (rounds.notna() & bids.notna()).to_numpy()
+        if not valid.any():
+            return
+
+        rounds = rounds.to_numpy()[valid].astype(np.int64)
+        bids = bids.to_numpy()[valid].astype(np.float64)
+        won = _true_values(df["Winning_Bid"])[valid]
+        codes, names = pd.factorize(df["Agent"].astype(str).to_numpy()[valid])
+        columns = np.array([self._agent_column(name) for name in names], dtype=np.int64)[codes]
+        self._ensure(int(rounds.max()) + 1, len(self.agents))
+
+        #  One bincount per rollup over the touched span of the flattened matrix
+        width = self.sums.shape[1]
+        flat = rounds * width + columns
+        low = int(flat.min())
+        span = int(flat.max()) - low + 1
+        window = slice(low, low + span)
+        self.sums.reshape(-1)[window] += np.bincount(flat - low, weights=bids, minlength=span)
+        self.squares.reshape(-1)[window] += np.bincount(flat - low, weights=bids * bids, minlength=span)
+        self.counts.reshape(-1)[window] += np.bincount(flat - low, minlength=span)
+        self.wins.reshape(-1)[window] += np.bincount(flat - low, weights=won, minlength=span).astype(np.int64)
+        self._sample(columns, rounds, bids)
+        self.rows_read += len(bids)
+
+    def _agent_column(self, name):
+        if name not in self.agent_index:
+            self.agent_index[name] = len(self.agents)
+            self.agents.append(name)
+        return self.agent_index[name]
+
+    def _ensure(self, rows, columns):
+        """Grows the matrices (rows by doubling) to hold `rows` rounds and `columns` agents."""
+        current_rows, current_columns = self.sums.shape
+        if rows <= current_rows and columns <= current_columns:
+            return
+        new_rows = max(current_rows, 1)
+        while new_rows < rows:
+            new_rows *= 2
+        shape = (new_rows, max(columns, current_columns))
+        for name in ("sums", "squares", "counts", "wins"):
+            old = getattr(self, name)
+            new = np.zeros(shape, dtype=old.dtype)
+            new[:current_rows, :current_columns] = old
+            setattr(self, name, new)
+
+    def _sample(self, columns, rounds, bids):
+        """Bottom-k sampling: keeping the smallest random keys per agent is a uniform sample of all its bids."""
+        keys = self.rng.random(len(bids))
+        order = np.argsort(columns, kind="stable")
+        present, starts = np.unique(columns[order], return_index=True)
+        for column, chunk in zip(present, np.split(order, starts[1:])):
+            old = self.samples.get(column, (np.empty(0), np.empty(0, dtype=np.int64), np.empty(0)))
+            sample = [np.concatenate([old[0], keys[chunk]]), np.concatenate([old[1], rounds[chunk]]),
+                      np.concatenate([old[2], bids[chunk]])]
+            if len(sample[0]) > self.sample_size:
+                keep = np.argpartition(sample[0], self.sample_size)[:self.sample_size]
+                sample = [values[keep] for values in sample]
+            self.samples[column] = tuple(sample)
+
+    # ---------------------------------------------------------------- views
+
+    def round_range(self):
+        """(first, last) round with any bids, or None."""
+        played = np.flatnonzero(self.counts.sum(axis=1))
+        return (int(played[0]), int(played[-1])) if len(played) else None
+
+    def _select(self, rounds=None, agents=None):
+        first, last = rounds if rounds is not None else (self.round_range() or (0, -1))
+        first, last = max(int(first), 0), min(int(last), len(self.sums) - 1)
+        names = [name for name in (agents if agents is not None else self.agents) if name in self.agent_index]
+        columns = [self.agent_index[name] for name in names]
+        return first, max(last + 1, first), names, columns
+
+    def trend(self, rounds=None, agents=None, max_points=500):
+        """
+        Mean bid per round and agent as a wide frame (index Round, one column per agent).
+
+        Ranges longer than `max_points` rounds are downsampled to buckets of
+        consecutive rounds; each bucket holds the exact mean of its bids and is
+        labelled by its first round.
+        """
+        first, stop, names, columns = self._select(rounds, agents)
+        sums = self.sums[first:stop, columns]
+        counts = self.counts[first:stop, columns]
+        labels = np.arange(first, stop)
+
+        bucket = max(1, -(-len(labels) // max_points))
+        if bucket > 1:
+            padded = -(-len(labels) // bucket) * bucket
+            sums = np.pad(sums, ((0, padded - len(labels)), (0, 0))).reshape(-1, bucket, len(columns)).sum(axis=1)
+            counts = np.pad(counts, ((0, padded - len(labels)), (0, 0))).reshape(-1, bucket, len(columns)).sum(axis=1)
+            labels = labels[::bucket]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+        frame = pd.DataFrame(means, index=pd.Index(labels, name="Round"), columns=pd.Index(names, name="Agent"))
+        return frame[counts.sum(axis=1) > 0]
+
+    def agent_summary(self, rounds=None, agents=None):
+        """
+        Per-agent statistics over a round range: bids, mean, std, min, max and wins.
+
+        Min/max are taken over per-round means, which equal the raw bids unless
+        several runs share the file.
+        """
+        first, stop, names, columns = self._select(rounds, agents)
+        sums = self.sums[first:stop, columns]
+        counts = self.counts[first:stop, columns]
+        total = counts.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sums.sum(axis=0) / total
+            variance = self.squares[first:stop, columns].sum(axis=0) / total - mean ** 2
+            cell_means = sums / np.maximum(counts, 1)
+            lowest = np.where(counts > 0, cell_means, np.inf).min(axis=0, initial=np.inf)
+            highest = np.where(counts > 0, cell_means, -np.inf).max(axis=0, initial=-np.inf)
+            std = np.sqrt(np.maximum(variance, 0) * total / np.maximum(total - 1, 1))
+        return pd.DataFrame({
+            "bids": total,
+            "mean": mean,
+            "std": std,
+            "min": np.where(total > 0, lowest, np.nan),
+            "max": np.where(total > 0, highest, np.nan),
+            "wins": self.wins[first:stop, columns].sum(axis=0),
+        }, index=pd.Index(names, name="Agent"))
+
+    def rows(self, rounds=None, agents=None):
+        """Long frame (Round, Agent, Bid, Winning_Bid) rebuilt from the rollups, in round order."""
+        first, stop, names, columns = self._select(rounds, agents)
+        counts = self.counts[first:stop, columns]
+        index = np.nonzero(counts)
+        return pd.DataFrame({
+            "Round": index[0] + first,
+            "Agent": np.array(names, dtype=object)[index[1]] if names else np.empty(0, dtype=object),
+            "Bid": self.sums[first:stop, columns][index] / counts[index],
+            "Winning_Bid": self.wins[first:stop, columns][index] > 0,
+        }, columns=COLUMNS)
+
+    def bid_sample(self, rounds=None, agents=None):
+        """Long frame (Agent, Bid) of up to `sample_size` sampled bids per agent within the round range."""
+        first, stop, names, columns = self._select(rounds, agents)
+        frames = []
+        for name, column in zip(names, columns):
+            _, sample_rounds, bids = self.samples.get(column, (None, np.empty(0), np.empty(0)))
+            keep = (sample_rounds >= first) & (sample_rounds < stop)
+            frames.append(pd.DataFrame({"Agent": name, "Bid": bids[keep]}))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["Agent", "Bid"])
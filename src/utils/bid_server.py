@@ -0,0 +1,304 @@
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import torch
+from src.agents.population import dqn_batched
+from src.agents.numpy_agent import PARAM_NAMES
+
+REQUIRED_FIELDS = {
+    "/bid": ("agent", "market_threshold", "rounds_remaining"),
+    "/negotiate": ("agent", "competitor_bids", "market_threshold"),
+}
+
+
+class BidBatcher:
+    """
+    Coalesces concurrent bid requests into one batched DQN evaluation.
+
+    - `submit(agent, market_threshold, rounds_remaining)` returns a Future.
+      A background thread collects requests until `max_batch_size` are queued
+      or `max_wait` seconds have passed since the first one.
+    - Each batch is a single forward pass over the stacked weights of the
+      agents it touches. Requests are padded per agent to one (agents, n, 2)
+      tensor.
+    - Bids are greedy (no exploration, no AI blending) and clamped like
+      `DQNBiddingAgent.blend_bid`. Serving never changes an agent's replay
+      or training state; call `refresh()` after the agents train.
+    """
+
+    def __init__(self, agents, max_batch_size=64, max_wait=0.002):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.agents = list(agents)
+        self.index = {agent.name: i for i, agent in enumerate(self.agents)}
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.params = {}
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.refresh()
+        self.thread = threading.Thread(target=self.run, name="bid-batcher", daemon=True)
+        self.thread.start()
+
+    def refresh(self):
+        """Re-stacks the agents' weights (after training or loading a checkpoint)."""
+        with torch.no_grad():
+            models = [dict(agent.model.named_parameters()) for agent in self.agents]
+            params = {name: torch.stack([m[name] for m in models]) for name in PARAM_NAMES}
+        with self.lock:
+            self.params = params
+
+    def submit(self, agent_name, market_threshold, rounds_remaining):
+        """Queues one request; raises KeyError for an unknown agent."""
+        if agent_name not in self.index:
+            raise KeyError(agent_name)
+        future = Future()
+        self.queue.put((future, self.index[agent_name], float(market_threshold), float(rounds_remaining)))
+        return future
+
+    def bid(self, agent_name, market_threshold, rounds_remaining, timeout=5.0):
+        return self.submit(agent_name, market_threshold, rounds_remaining).result(timeout)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self.evaluate(batch)
+            if stopping:
+                return
+
+    def evaluate(self, batch):
+        try:
+            bids = self.policy_bids([request[1:] for request in batch])
+        except Exception as e:
+            for future, *_ in batch:
+                future.set_exception(e)
+            return
+
+        self.requests += len(batch)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for (future, *_), bid in zip(batch, bids):
+            future.set_result(max(1, round(bid, 2)))  # Same clamp as `blend_bid`
+
+    def policy_bids(self, requests):
+        """Raw greedy bids for (agent index, threshold, rounds remaining) requests, in one forward pass."""
+        slots = {}
+        positions = []
+        for agent_id, _, _ in requests:
+            slot = slots.setdefault(agent_id, [len(slots), 0])
+            positions.append((slot[0], slot[1]))
+            slot[1] += 1
+
+        rows = [[] for _ in slots]
+        for (slot, _), (_, threshold, rounds_remaining) in zip(positions, requests):
+            rows[slot].append((threshold, rounds_remaining))
+        width = max(len(row) for row in rows)
+        states = torch.tensor([row + [(0.0, 0.0)] * (width - len(row)) for row in rows], dtype=torch.float32)
+
+        with self.lock:
+            params = self.params
+        agent_ids = torch.tensor(list(slots))
+        with torch.inference_mode():
+            if len(slots) < len(self.agents):
+                params = {name: param.index_select(0, agent_ids) for name, param in params.items()}
+            q_values = dqn_batched(states, params).squeeze(-1).tolist()
+        return [q_values[slot][position] for slot, position in positions]
+
+    def stats(self):
+        return {"requests": self.requests, "batches": self.batches, "largest_batch": self.largest_batch,
+                "mean_batch": self.requests / self.batches if self.batches else 0.0}
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+
+class BidRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API of the bid service.
+
+    - `POST /bid` `{"agent", "market_threshold", "rounds_remaining"}` -> `{"agent", "bid"}` (micro-batched)
+    - `POST /negotiate` `{"agent", "competitor_bids", "market_threshold"}` -> `{"agent", "bid"}`
+      (NegotiationAgents only; may call the strategy LLM)
+    - `GET /health` -> agents and batching statistics
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep-alive: clients reuse one connection for many bids
+    wbufsize = -1  # Headers and body leave in one write; split writes stall ~40 ms on delayed ACKs
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        fields = REQUIRED_FIELDS.get(self.path)
+        if fields is None:
+            self.rfile.read(length)
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            self._send(400, {"error": "Body must be a JSON object"})
+            return
+        missing = [field for field in fields if field not in body]
+        if missing:
+            self._send(400, {"error": f"Missing fields: {', '.join(missing)}"})
+            return
+        agent = server.agents.get(body["agent"]) if isinstance(body["agent"], str) else None
+        if agent is None:
+            self._send(404, {"error": f"Unknown agent {body['agent']!r}"})
+            return
+        if self.path == "/negotiate" and not hasattr(agent, "negotiate"):
+            self._send(404, {"error": f"Agent {agent.name!r} does not negotiate"})
+            return
+
+        try:
+            if self.path == "/bid":
+                bid = server.batcher.bid(agent.name, body["market_threshold"], body["rounds_remaining"],
+                                         timeout=server.timeout)
+            else:
+                bid = agent.negotiate(body["competitor_bids"], body["market_threshold"])
+        except (ValueError, TypeError, AttributeError) as e:
+            self._send(400, {"error": f"Bad request: {e}"})
+            return
+        except FutureTimeoutError:  # Not the builtin TimeoutError before Python 3.11
+            self._send(503, {"error": "Bid evaluation timed out"})
+            return
+        self._send(200, {"agent": agent.name, "bid": bid})
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        self._send(200, {"agents": list(self.server.agents), **self.server.batcher.stats()})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BidServer(ThreadingHTTPServer):
+    """
+    Local HTTP bid service for trained agents.
+
+    - `max_batch_size` / `max_wait`: micro-batching window of the `BidBatcher`.
+    - `timeout`: seconds a request waits for its batch before HTTP 503.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128  # Listen backlog for bursts of new client connections
+
+    def __init__(self, agents, host="127.0.0.1", port=0, max_batch_size=64, max_wait=0.002, timeout=5.0):
+        super().__init__((host, port), BidRequestHandler)
+        self.agents = {agent.name: agent for agent in agents}
+        self.batcher = BidBatcher(agents, max_batch_size, max_wait)
+        self.timeout = timeout
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.batcher.close()
+
+
+def start_bid_server(agents, host="127.0.0.1", port=0, **options):
+    """Starts a BidServer on a daemon thread and returns it (`server.url` is the base URL)."""
+    server = BidServer(agents, host, port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_agents(checkpoint=None, weights_dir=None, count=5, negotiators=None):
+    """
+    Agents from a simulation checkpoint, a directory of exported .npz weights, or fresh (untrained).
+
+    `negotiators` (agent names, or True for all) are loaded as NegotiationAgents,
+    which also answer `POST /negotiate`.
+    """
+    import numpy as np
+    from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
+    from src.core.checkpoint import load_checkpoint
+
+    def make_agent(name):
+        negotiates = negotiators is True or (negotiators and name in negotiators)
+        return (NegotiationAgent if negotiates else DQNBiddingAgent)(name=name)
+
+    if checkpoint:
+        agents = []
+        for state in load_checkpoint(checkpoint)["agents"]:
+            agent = make_agent(state["name"])
+            agent.model.load_state_dict(state["model"])
+            agents.append(agent)
+        return agents
+
+    if weights_dir:
+        agents = []
+        for file_name in sorted(os.listdir(weights_dir)):
+            if file_name.endswith(".npz"):
+                agent = make_agent(file_name[:-4].replace("_", " "))
+                with np.load(os.path.join(weights_dir, file_name)) as data:
+                    agent.model.load_state_dict({name: torch.from_numpy(data[name]) for name in PARAM_NAMES})
+                agents.append(agent)
+        return agents
+
+    return [make_agent(f"Agent {i}") for i in range(1, count + 1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP bid service for trained agents")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8810)
+    parser.add_argument("--checkpoint", default=None, help="Serve the agents of this simulation checkpoint")
+    parser.add_argument("--weights-dir", default=None, help="Serve agents exported with main.py --export-weights")
+    parser.add_argument("--agents", type=int, default=5, help="Untrained agents to serve when no weights are given")
+    parser.add_argument("--negotiators", nargs="*", default=None, metavar="NAME",
+                        help="Serve these agents (all agents if no names are given) as negotiators for /negotiate")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Most requests evaluated in one batch")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Longest a request waits for its batch to fill")
+    args = parser.parse_args()
+
+    negotiators = True if args.negotiators == [] else args.negotiators
+    server = BidServer(load_agents(args.checkpoint, args.weights_dir, args.agents, negotiators), args.host, args.port,
+                       max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1000)
+    print(f" Bid service listening on {server.url} for {', '.join(server.agents)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,171 @@
+import os
+import json
+import errno
+import socket
+import argparse
+import tempfile
+import threading
+import collections
+
+#  Unix socket paths are limited to ~100 bytes, so the default lives in the temp dir
+STREAM_SOCKET = os.environ.get("BID_STREAM_SOCKET", os.path.join(tempfile.gettempdir(), "bid_stream.sock"))
+
+
+class BidStreamPublisher:
+    """
+    Fire-and-forget publisher of round events over a Unix datagram socket.
+
+    - Sends never block. Events the consumer cannot take right now (no
+      dashboard listening, or its queue is full) wait in a bounded backlog
+      and go out batched, as one JSON array per datagram, on the next publish.
+    - When the backlog is full the oldest event is dropped and counted:
+      a slow or absent consumer never slows the simulation.
+    - Events larger than `max_datagram`, or batches the kernel rejects as
+      too long, are dropped and counted as well; send errors never reach
+      the caller.
+    """
+
+    def __init__(self, address=STREAM_SOCKET, backlog=1000, max_datagram=64 * 1024):
+        self.address = address
+        self.backlog = collections.deque()  # Encoded events not yet accepted by the consumer
+        self.max_backlog = backlog
+        self.max_datagram = max_datagram
+        self.sent = 0
+        self.dropped = 0
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def publish(self, event):
+        """Queues one event and sends what the consumer accepts; returns False when some are still waiting."""
+        payload = json.dumps(event).encode("utf-8")
+        if len(payload) + 2 > self.max_datagram:  # Could never be sent, even alone in its array
+            self.dropped += 1
+            return self.flush()
+        if len(self.backlog) == self.max_backlog:
+            self.backlog.popleft()
+            self.dropped += 1
+        self.backlog.append(payload)
+        return self.flush()
+
+    def flush(self):
+        """Sends the backlog in datagram-sized batches until it is empty or the consumer stops accepting."""
+        while self.backlog:
+            batch, size = [], 2
+            for payload in self.backlog:
+                if batch and size + len(payload) + 1 > self.max_datagram:
+                    break
+                batch.append(payload)
+                size += len(payload) + 1
+            try:
+                self.socket.sendto(b"[" + b",".join(batch) + b"]", self.address)
+            except OSError as e:
+                if e.errno != errno.EMSGSIZE:
+                    return False  # No listener or a full queue: retry on the next publish
+                self.dropped += len(batch)  # `max_datagram` is above the kernel's limit
+            else:
+                self.sent += len(batch)
+            for _ in batch:
+                self.backlog.popleft()
+        return True
+
+    def close(self):
+        self.flush()
+        self.socket.close()
+
+
+class BidStreamConsumer:
+    """
+    Receives published round events on a background thread.
+
+    - Binds the stream socket (replacing a stale socket file).
+    - Keeps the last `max_rounds` events in memory; older ones are discarded.
+    - `drain()` hands over the events received since the previous call.
+    """
+
+    def __init__(self, address=STREAM_SOCKET, max_rounds=10_000, receive_buffer=4 << 20):
+        self.address = address
+        self.received = 0
+        self.events = collections.deque(maxlen=max_rounds)
+        self.pending = collections.deque(maxlen=max_rounds)
+        self.lock = threading.Lock()
+        self.closed = False
+
+        if os.path.exists(address):
+            os.unlink(address)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+        self.socket.bind(address)
+        self.socket.settimeout(0.2)  # Lets the thread notice `close`
+        self.thread = threading.Thread(target=self._run, name="bid-stream-consumer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.closed:
+            try:
+                data = self.socket.recv(1 << 20)
+            except socket.timeout:
+                continue
+            except OSError:
+                return  # Socket closed
+            try:
+                events = json.loads(data)
+            except ValueError:
+                continue
+            with self.lock:
+                self.events.extend(events)
+                self.pending.extend(events)
+                self.received += len(events)
+
+    def drain(self):
+        with self.lock:
+            events = list(self.pending)
+            self.pending.clear()
+        return events
+
+    def latest(self):
+        """Retained events, oldest first."""
+        with self.lock:
+            return list(self.events)
+
+    def bids_frame(self):
+        """Wide frame of the retained rounds' bids (index Round, one column per agent)."""
+        import pandas as pd  # Only the dashboard needs frames; the publisher side stays light
+
+        events = self.latest()
+        return pd.DataFrame([event["bids"] for event in events],
+                            index=pd.Index([event["round"] for event in events], name="Round"))
+
+    def close(self):
+        self.closed = True
+        self.thread.join()
+        self.socket.close()
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+def round_event(round_num, threshold, next_threshold, winning_bid, bids):
+    """JSON-friendly round event published by BiddingSimulation."""
+    return {
+        "round": int(round_num),
+        "threshold": float(threshold),
+        "next_threshold": float(next_threshold),
+        "winning_bid": float(winning_bid) if winning_bid is not None else None,
+        "bids": {name: float(bid) for name, bid in bids.items()},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print round events streamed by `main.py --stream`")
+    parser.add_argument("--address", default=STREAM_SOCKET)
+    args = parser.parse_args()
+
+    consumer = BidStreamConsumer(args.address)
+    print(f" Listening on {args.address} (Ctrl+C to stop)")
+    try:
+        while True:
+            consumer.thread.join(1.0)
+            for event in consumer.drain():
+                print(f"🛒 Round {event['round']}: winning bid {event['winning_bid']}, "
+                      f"threshold {event['threshold']:.2f} -> {event['next_threshold']:.2f}")
+    except KeyboardInterrupt:
+        consumer.close()
@@ -1,21 +1,33 @@
 import os
 import json
-import pandas as pd
-from dotenv import load_dotenv
 
 class Config:
     """Handles configuration settings for the bidding system."""
     CONFIG_FILE = "config.json"
     DEFAULT_CONFIG = {
         "OPENAI_API_KEY": None,  # Will be loaded from .env if available
+        "OPENAI_BASE_URL": None,  # Override the API endpoint (e.g. a local mock server)
         "BIDDING_ROUNDS": 20,
         "INITIAL_THRESHOLD": 100,
-        "DATA_FILE": "data/bid_history.csv"  #  Ensure single storage location
+        "DATA_FILE": "data/bid_history.csv",  #  Ensure single storage location
+        "STORAGE_BACKEND": "csv",  # "csv" or "parquet"
+        "PARQUET_DIR": "data/bid_history",  # Partitioned Parquet dataset (run_id / round range)
+        "RUN_ID": "default",
+        "LLM_CACHE_SIZE": 1024,  # In-memory LRU entries for LLM responses
+        "LLM_CACHE_FILE": None,  # Optional SQLite file for the on-disk response cache
+        "LLM_CACHE_TTL": 3600,  # Seconds before an on-disk response expires
+        "LLM_PRICE_BUCKET": 1.0,  # Prices in prompts are quantised to this bucket size
+        "LLM_MAX_RETRIES": 2,  # SDK retries of failed OpenAI requests (0 for reproducible stub runs)
+        "LLM_PROVIDER": "openai",  # "openai" (also any OPENAI_BASE_URL endpoint) or in-process "stub"
+        "LLM_STUB_LATENCY": 0.0,  # Simulated round trip of the stub provider (seconds)
+        "LLM_STUB_JITTER": 0.0,  # Uniform +/- jitter added to the stub latency (seconds)
+        "LLM_STUB_ERROR_RATE": 0.0  # Fraction of stub calls that fail
     }
 
     @staticmethod
     def load_config():
         """Loads configuration from a JSON file or creates a default one."""
+        from dotenv import load_dotenv  # Imported on first use: keeps CLI and test startup fast
         load_dotenv()  # Load .env variables
         config = Config.DEFAULT_CONFIG.copy()  # Start with default settings
 
@@ -32,6 +44,11 @@ class Config:
         if env_api_key:
             config["OPENAI_API_KEY"] = env_api_key
 
+        # Environment overrides for pointing every AI path at a stub
+        for key in ("OPENAI_BASE_URL", "LLM_PROVIDER"):
+            if os.getenv(key):
+                config[key] = os.getenv(key)
+
         return config
 
     @staticmethod
@@ -1,47 +1,214 @@
 import os
-import pandas as pd
-import logging
+import time
+import atexit
+import numpy as np
 from pathlib import Path
 from src.utils.config import Config  # Import config to get the correct path
+from src.utils.logger import logger
+
+COLUMNS = ["Round", "Agent", "Bid", "Winning_Bid"]
+
+
+class BidHistoryWriter:
+    """
+    Long-lived, buffered writer for the bid-history CSV.
+
+    - Rows are collected into preallocated column arrays (grown by doubling).
+    - The buffer is appended to the CSV every `flush_every` rounds or every
+      `flush_interval` seconds, whichever comes first, and once on close.
+    - Use as a context manager to guarantee the final flush.
+    """
+
+    def __init__(self, data_file, flush_every=100, flush_interval=5.0, capacity=1024, bid_decimals=None):
+        self.data_file = data_file
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.bid_decimals = bid_decimals
+        self.rounds = np.empty(capacity, dtype=np.int64)
+        self.agents = np.empty(capacity, dtype=object)
+        self.bids = np.empty(capacity, dtype=np.float64)
+        self.winning = np.empty(capacity, dtype=bool)
+        self.size = 0
+        self.pending_rounds = 0
+        self.last_flush = time.monotonic()
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _grow(self, needed):
+        capacity = len(self.rounds)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("rounds", "agents", "bids", "winning"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append_round(self, round_num, bids, winning_bid):
+        """Buffers one round of bids and flushes when a flush is due."""
+        end = self.size + len(bids)
+        if end > len(self.rounds):
+            self._grow(end)
+
+        values = np.fromiter(bids.values(), dtype=np.float64, count=len(bids))
+        self.rounds[self.size:end] = int(round_num)
+        self.agents[self.size:end] = list(bids.keys())
+        self.bids[self.size:end] = values if self.bid_decimals is None else np.round(values, self.bid_decimals)
+        self.winning[self.size:end] = values == winning_bid
+        self.size = end
+        self.pending_rounds += 1
+
+        if self.pending_rounds >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Appends all buffered rows to the CSV file."""
+        self.last_flush = time.monotonic()
+        if self.size == 0:
+            return
+
+        import pandas as pd  # Imported on first flush: keeps CLI and test startup fast
+        df = pd.DataFrame({
+            "Round": self.rounds[:self.size],
+            "Agent": self.agents[:self.size],
+            "Bid": self.bids[:self.size],
+            "Winning_Bid": self.winning[:self.size],
+        }, columns=COLUMNS)
+        self.write(df)
+
+        logger.debug("Flushed %d bid rows (%d rounds) to %s.", self.size, self.pending_rounds, self.data_file)
+        self.rows_written += self.size
+        self.agents[:self.size] = None  # Drop references to agent names
+        self.size = 0
+        self.pending_rounds = 0
+
+    def write(self, df):
+        """Appends a batch of rows to the CSV file."""
+        Path(os.path.dirname(os.path.abspath(self.data_file))).mkdir(parents=True, exist_ok=True)
+        file_exists = Path(self.data_file).exists() and os.path.getsize(self.data_file) > 0
+        df.to_csv(self.data_file, mode='a', header=not file_exists, index=False)
+
+    def close(self):
+        """Flushes any remaining rows."""
+        self.flush()
+
+    def position(self):
+        """Size of the CSV after the last flush (used to roll back to a checkpoint)."""
+        return os.path.getsize(self.data_file) if os.path.exists(self.data_file) else 0
+
+    def truncate(self, position):
+        """Drops rows written after `position`, e.g. rounds replayed after resuming a checkpoint."""
+        self.flush()
+        if position is not None and os.path.exists(self.data_file):
+            os.truncate(self.data_file, position)
+
+
+class ParquetBidHistoryWriter(BidHistoryWriter):
+    """Buffered writer that flushes batches into the partitioned Parquet store."""
+
+    def __init__(self, root, run_id="default", rounds_per_partition=1000, **kwargs):
+        from src.utils.parquet_store import ParquetBidStore
+
+        super().__init__(root, **kwargs)
+        self.store = ParquetBidStore(root, run_id=run_id, rounds_per_partition=rounds_per_partition)
+
+    def write(self, df):
+        self.store.append(df)
+
+    def position(self):
+        """Part files of this run after the last flush (parts are immutable, so this marks a checkpoint)."""
+        return self.store.part_files()
+
+    def truncate(self, position):
+        """Deletes the parts flushed after `position`, e.g. rounds replayed after resuming a checkpoint."""
+        self.flush()
+        if position is not None:
+            self.store.remove_parts(position)
 
-#  Set up logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 class DataHandler:
     """Handles data storage and retrieval for bidding simulation."""
 
-    @staticmethod
-    def save_bid_data(round_num, bids, winning_bid):
-        """Stores bid data in a single CSV file."""
-        config = Config.load_config()
-        data_file = config["DATA_FILE"]  #  Ensure the same file path is used
+    _config = None
+    _writers = {}
 
-        # Ensure `data/` directory exists before saving
-        Path(os.path.dirname(data_file)).mkdir(parents=True, exist_ok=True)
+    @classmethod
+    def config(cls):
+        """Loads the configuration once and reuses it for every call."""
+        if cls._config is None:
+            cls._config = Config.load_config()
+        return cls._config
 
-        data = [{
-            "Round": int(round_num),  # Ensure Round is always an integer
-            "Agent": agent,
-            "Bid": round(float(bid), 4),  #  Round bids to 4 decimal places
-            "Winning_Bid": bid == winning_bid
-        } for agent, bid in bids.items()]
-        
-        df = pd.DataFrame(data)
+    @classmethod
+    def use_parquet(cls):
+        return cls.config().get("STORAGE_BACKEND", "csv") == "parquet"
 
-        # Check if the CSV file is empty to add headers
-        file_exists = Path(data_file).exists() and os.path.getsize(data_file) > 0
+    @classmethod
+    def store(cls):
+        """Parquet store configured by PARQUET_DIR / RUN_ID."""
+        from src.utils.parquet_store import ParquetBidStore
+
+        config = cls.config()
+        return ParquetBidStore(config["PARQUET_DIR"], run_id=config["RUN_ID"])
+
+    @classmethod
+    def writer(cls, data_file=None):
+        """Returns the shared buffered writer for a bid-history file."""
+        config = cls.config()
+        if data_file is None and cls.use_parquet():
+            data_file = config["PARQUET_DIR"]
+            if data_file not in cls._writers:
+                cls._writers[data_file] = ParquetBidHistoryWriter(data_file, run_id=config["RUN_ID"], bid_decimals=4)
+            return cls._writers[data_file]
+
+        data_file = data_file or config["DATA_FILE"]  #  Ensure the same file path is used
+        if data_file not in cls._writers:
+            cls._writers[data_file] = BidHistoryWriter(data_file, bid_decimals=4)  #  Round bids to 4 decimal places
+        return cls._writers[data_file]
+
+    @classmethod
+    def flush(cls):
+        """Flushes every shared writer (also registered to run at interpreter exit)."""
+        for writer in cls._writers.values():
+            try:
+                writer.flush()
+            except Exception as e:
+                logger.error(" Error saving bid data: %s", e)
 
+    @classmethod
+    def save_bid_data(cls, round_num, bids, winning_bid):
+        """Buffers bid data for the single bid-history CSV file."""
         try:
-            df.to_csv(data_file, mode='a', header=not file_exists, index=False)
-            logging.info(f"Successfully saved bid data for Round {round_num}.")
+            cls.writer().append_round(round_num, bids, winning_bid)
         except Exception as e:
-            logging.error(f" Error saving bid data: {e}")
+            logger.error(" Error saving bid data: %s", e)
+
+    @classmethod
+    def load_bid_data(cls, run_id=None, rounds=None, agents=None):
+        """
+        Loads bid data for analysis.
+
+        - `rounds` is an inclusive `(first, last)` range and `agents` a list of names.
+        - With the Parquet backend both filters (and `run_id`) are pushed down into the scan.
+        """
+        import pandas as pd
+
+        cls.flush()  # Make buffered rows visible to the reader
+        if cls.use_parquet():
+            try:
+                df = cls.store().read(run_id=run_id, rounds=rounds, agents=agents)
+                logger.info(" Bid data loaded successfully.")
+                return df
+            except Exception as e:
+                logger.error("⚠️ Error loading bid data: %s", e)
+                return pd.DataFrame(columns=COLUMNS)
 
-    @staticmethod
-    def load_bid_data():
-        """Loads bid data from a CSV file for analysis."""
-        config = Config.load_config()
-        data_file = config["DATA_FILE"]  # Ensure correct file path
+        data_file = cls.config()["DATA_FILE"]  # Ensure correct file path
         file_path = Path(data_file)
 
         if file_path.exists() and file_path.stat().st_size > 0:
@@ -56,14 +223,24 @@ class DataHandler:
                 if "Bid" in df.columns:
                     df["Bid"] = pd.to_numeric(df["Bid"], errors='coerce')
 
-                logging.info(" Bid data loaded successfully.")
+                if rounds is not None:
+                    first, last = rounds
+                    df = df[df["Round"].between(first if first is not None else -np.inf,
+                                                last if last is not None else np.inf)]
+                if agents is not None:
+                    df = df[df["Agent"].isin(list(agents))]
+
+                logger.info(" Bid data loaded successfully.")
                 return df
             except Exception as e:
-                logging.error(f"⚠️ Error loading bid data: {e}")
-                return pd.DataFrame(columns=["Round", "Agent", "Bid", "Winning_Bid"])
+                logger.error("⚠️ Error loading bid data: %s", e)
+                return pd.DataFrame(columns=COLUMNS)
         else:
-            logging.warning("⚠️ No bid data found. Returning an empty DataFrame.")
-            return pd.DataFrame(columns=["Round", "Agent", "Bid", "Winning_Bid"])
+            logger.warning("⚠️ No bid data found. Returning an empty DataFrame.")
+            return pd.DataFrame(columns=COLUMNS)
+
+
+atexit.register(DataHandler.flush)
 
 if __name__ == "__main__":
     test_bids = {"Agent 1": 95.2356, "Agent 2": 100.5678, "Agent 3": 98.345}
@@ -0,0 +1,225 @@
+import os
+import json
+import mmap
+import struct
+import argparse
+import numpy as np
+
+MAGIC = b"BIDEVT1\n"
+HEADER_LENGTH = struct.Struct("<I")
+RECORD_LENGTH = struct.Struct("<I")
+ROUND_HEADER = struct.Struct("<qddd")  # round, threshold, next threshold, winning bid
+OFFSET = np.dtype("<u8")
+AGENT_FIELDS = ("bids", "adjustments", "rewards", "exploration_rates")
+
+
+class EventLogWriter:
+    """
+    Append-only binary event stream of simulation rounds.
+
+    - File layout: magic, a length-prefixed JSON header (agent names), then
+      one length-prefixed record per round: `ROUND_HEADER` followed by one
+      float64 per agent for each of AGENT_FIELDS.
+    - `<path>.idx` holds the byte offset of every record as uint64, so a
+      reader can seek to any round in O(1).
+    - Records are written before their index entries, so the index never
+      points at a partial record after a crash.
+    """
+
+    def __init__(self, path, agent_names, buffer_size=1 << 20):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.agent_names = list(agent_names)
+        self.record_size = ROUND_HEADER.size + 8 * len(AGENT_FIELDS) * len(self.agent_names)
+        self.last_round = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with EventLogReader(path) as reader:
+                if reader.agent_names != self.agent_names:
+                    raise ValueError(f"{path} was written for agents {reader.agent_names}, not {self.agent_names}")
+                self.last_round = reader.last_round
+                entries, end = len(reader), reader.end_offset()
+            #  Drop a partially written tail left by a crash before appending
+            os.truncate(path, end)
+            os.truncate(self.index_path, entries * OFFSET.itemsize)
+        else:
+            header = json.dumps({"version": 1, "agents": self.agent_names}).encode("utf-8")
+            with open(path, "wb") as file:
+                file.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+            open(self.index_path, "wb").close()
+        #  Append mode: writes always land at the end, also after `truncate`
+        self.file = open(path, "ab", buffering=buffer_size)
+        self.index = open(self.index_path, "ab", buffering=buffer_size)
+        self.offset = self.file.tell()
+
+    def append_round(self, round_num, threshold, next_threshold, winning_bid, bids, adjustments, rewards,
+                     exploration_rates):
+        """Appends one round; the per-agent sequences follow `agent_names` order."""
+        values = np.array([bids, adjustments, rewards, exploration_rates], dtype="<f8")
+        payload = ROUND_HEADER.pack(round_num, threshold, next_threshold, winning_bid) + values.tobytes()
+        self.file.write(RECORD_LENGTH.pack(len(payload)) + payload)
+        self.index.write(OFFSET.type(self.offset).tobytes())
+        self.offset += RECORD_LENGTH.size + len(payload)
+        self.last_round = round_num
+
+    def flush(self):
+        self.file.flush()
+        self.index.flush()
+
+    def position(self):
+        """Byte offset, record count and last round after a flush (used to roll back to a checkpoint)."""
+        self.flush()
+        return {"offset": self.offset, "entries": os.path.getsize(self.index_path) // OFFSET.itemsize,
+                "last_round": self.last_round}
+
+    def truncate(self, position):
+        """Drops records appended after `position`."""
+        self.flush()
+        os.truncate(self.path, position["offset"])
+        os.truncate(self.index_path, position["entries"] * OFFSET.itemsize)
+        self.offset = position["offset"]
+        self.last_round = position["last_round"]
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+            self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventLogReader:
+    """
+    Memory-mapped reader for an EventLogWriter file.
+
+    - `read_round(n)` / `seek(n)` locate a round through the offset index in
+      O(1) without parsing the rest of the file.
+    - `column(field)` returns a zero-copy (rounds x agents) view of one
+      per-agent field, for vectorised analysis of long runs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a bid event log")
+
+        header_length, = HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        start = len(MAGIC) + HEADER_LENGTH.size
+        self.header = json.loads(self._map[start:start + header_length])
+        self.data_start = start + header_length
+        self.agent_names = self.header["agents"]
+        self.record_size = ROUND_HEADER.size + 8 * len(AGENT_FIELDS) * len(self.agent_names)
+
+        index_path = path + ".idx"
+        entries = os.path.getsize(index_path) // OFFSET.itemsize if os.path.exists(index_path) else 0
+        self.offsets = np.memmap(index_path, dtype=OFFSET, mode="r") if entries else np.empty(0, dtype=OFFSET)
+        #  Ignore index entries whose record did not reach the data file (crash mid-flush)
+        complete = len(self._map)
+        while entries and int(self.offsets[entries - 1]) + RECORD_LENGTH.size + self.record_size > complete:
+            entries -= 1
+        self.offsets = self.offsets[:entries]
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def end_offset(self):
+        """Byte offset just past the last complete record."""
+        if not len(self):
+            return self.data_start
+        return int(self.offsets[-1]) + RECORD_LENGTH.size + self.record_size
+
+    def close(self):
+        self.offsets = np.empty(0, dtype=OFFSET)
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _round_at(self, position):
+        return ROUND_HEADER.unpack_from(self._map, int(self.offsets[position]) + RECORD_LENGTH.size)[0]
+
+    @property
+    def first_round(self):
+        return self._round_at(0) if len(self) else None
+
+    @property
+    def last_round(self):
+        return self._round_at(len(self) - 1) if len(self) else None
+
+    def seek(self, round_num):
+        """Index position of `round_num`: direct for consecutive rounds, binary search otherwise."""
+        if not len(self):
+            raise KeyError(round_num)
+        position = round_num - self.first_round
+        if 0 <= position < len(self) and self._round_at(position) == round_num:
+            return position
+
+        low, high = 0, len(self) - 1
+        while low <= high:
+            middle = (low + high) // 2
+            found = self._round_at(middle)
+            if found == round_num:
+                return middle
+            low, high = (middle + 1, high) if found < round_num else (low, middle - 1)
+        raise KeyError(round_num)
+
+    def record(self, position):
+        """Decodes the record at an index position."""
+        start = int(self.offsets[position]) + RECORD_LENGTH.size
+        round_num, threshold, next_threshold, winning_bid = ROUND_HEADER.unpack_from(self._map, start)
+        values = np.frombuffer(self._map, dtype="<f8", count=len(AGENT_FIELDS) * len(self.agent_names),
+                               offset=start + ROUND_HEADER.size).reshape(len(AGENT_FIELDS), -1)
+        event = {"round": round_num, "threshold": threshold, "next_threshold": next_threshold,
+                 "winning_bid": winning_bid}
+        for field, row in zip(AGENT_FIELDS, values):
+            event[field] = dict(zip(self.agent_names, row.tolist()))
+        return event
+
+    def read_round(self, round_num):
+        return self.record(self.seek(round_num))
+
+    def replay(self, start_round=None, stop_round=None):
+        """Yields round events from `start_round` up to and including `stop_round`."""
+        first = self.seek(start_round) if start_round is not None else 0
+        for position in range(first, len(self)):
+            event = self.record(position)
+            if stop_round is not None and event["round"] > stop_round:
+                return
+            yield event
+
+    def column(self, field):
+        """Zero-copy (rounds x agents) view of one of AGENT_FIELDS."""
+        stride = RECORD_LENGTH.size + self.record_size
+        if not len(self):
+            return np.empty((0, len(self.agent_names)))
+        first = int(self.offsets[0])
+        if int(self.offsets[-1]) - first != stride * (len(self) - 1):
+            raise ValueError("Records are not contiguous")
+        start = first + RECORD_LENGTH.size + ROUND_HEADER.size + 8 * len(self.agent_names) * AGENT_FIELDS.index(field)
+        return np.ndarray((len(self), len(self.agent_names)), dtype="<f8", buffer=self._map, offset=start,
+                          strides=(stride, 8))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect a binary bid event log")
+    parser.add_argument("path", help="Event log written with --event-log")
+    parser.add_argument("--round", type=int, help="Print a single round")
+    args = parser.parse_args()
+
+    with EventLogReader(args.path) as reader:
+        if args.round is not None:
+            print(json.dumps(reader.read_round(args.round), indent=4))
+        else:
+            print(f" {len(reader)} rounds ({reader.first_round}-{reader.last_round}), agents: {reader.agent_names}")
@@ -0,0 +1,83 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.llm_client import get_llm_client, prompt_key
+
+
+class BackgroundLLM:
+    """
+    Runs `LLMClient.complete` calls on a thread pool so the caller never waits on them.
+
+    - `get(messages)` returns the reply once it has arrived and None while it
+      is pending; it never blocks.
+    - Replies are kept per prompt (LRU, `max_entries`); the same prompt is
+      only requested once, however often the page reruns.
+    - `timeout` is also the request timeout, so a hung call frees its worker;
+      a call still running after it raises TimeoutError from `get`.
+    - Failures are re-raised for `retry_after` seconds, then retried; a late
+      reply still lands in the LLM client's response cache.
+    """
+
+    def __init__(self, llm=None, workers=2, timeout=20.0, retry_after=30.0, max_entries=256):
+        self.llm = llm
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.max_entries = max_entries
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-background")
+        self.lock = threading.Lock()
+        self.replies = OrderedDict()
+        self.jobs = {}  # Prompt key -> (future, submitted at)
+        self.failures = {}  # Prompt key -> (exception, failed at)
+
+    def client(self):
+        return self.llm if self.llm is not None else get_llm_client()
+
+    def get(self, messages):
+        """Reply for `messages`, or None while it is still being fetched."""
+        llm = self.client()
+        key = prompt_key(llm.model, messages)
+        now = time.monotonic()
+        with self.lock:
+            if key in self.replies:
+                self.replies.move_to_end(key)
+                return self.replies[key]
+
+            if key in self.failures:
+                error, failed_at = self.failures[key]
+                if now - failed_at < self.retry_after:
+                    raise error
+                del self.failures[key]
+
+            if key not in self.jobs:
+                self.jobs[key] = (self.executor.submit(llm.complete, messages, timeout=self.timeout), now)
+                return None
+
+            future, submitted = self.jobs[key]
+            if future.done():
+                del self.jobs[key]
+                error = future.exception()
+                if error is not None:
+                    self.failures[key] = (error, now)
+                    raise error
+                self._remember(key, future.result())
+                return self.replies[key]
+
+            if now - submitted >= self.timeout:
+                del self.jobs[key]  # The call keeps running; its reply still fills the LLM cache
+                error = TimeoutError(f"No reply within {self.timeout:.0f}s")
+                self.failures[key] = (error, now)
+                raise error
+            return None
+
+    def _remember(self, key, reply):
+        self.replies[key] = reply
+        if len(self.replies) > self.max_entries:
+            self.replies.popitem(last=False)
+
+    def pending(self):
+        with self.lock:
+            return len(self.jobs)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
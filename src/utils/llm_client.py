@@ -0,0 +1,253 @@
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from src.utils.config import Config
+from src.utils.llm_providers import OpenAIProvider, StubProvider
+
+
+def quantize(value, bucket):
+    """Snaps a numeric prompt input to the nearest multiple of `bucket` (no-op when bucket is falsy)."""
+    if not bucket:
+        return value
+    snapped = round(value / bucket) * bucket
+    return int(snapped) if float(snapped).is_integer() else round(snapped, 6)
+
+
+def prompt_key(model, messages):
+    """Cache key of a chat request: model plus whitespace-normalised messages."""
+    normalised = [(m["role"], " ".join(str(m["content"]).split())) for m in messages]
+    return hashlib.sha256(json.dumps([model, normalised]).encode("utf-8")).hexdigest()
+
+
+BATCH_INSTRUCTION = "Return only a JSON array with one number per agent, in the order the agents are listed."
+
+
+def agent_states_text(bids, bucket=None):
+    """Numbered per-agent states for a batched prompt (`bid` quantised into `bucket`)."""
+    return "Agents: " + json.dumps([{"agent": index, "bid": quantize(bid, bucket)}
+                                    for index, bid in enumerate(bids, start=1)])
+
+
+def parse_bid_array(reply, count):
+    """
+    Parses a batched reply into `count` positive bids.
+
+    - Accepts a bare JSON array (surrounding prose or code fences are ignored)
+      of numbers or of `{"bid": x}` objects.
+    - Raises ValueError when the reply is not a valid array of `count` bids.
+    """
+    start, end = reply.find("["), reply.rfind("]")
+    if start < 0 or end < start:
+        raise ValueError("Reply does not contain a JSON array")
+    values = json.loads(reply[start:end + 1])
+    if not isinstance(values, list) or len(values) != count:
+        raise ValueError(f"Expected {count} bids, got {values!r}")
+
+    bids = []
+    for value in values:
+        if isinstance(value, dict):
+            value = value.get("bid")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value <= 0:
+            raise ValueError(f"Invalid bid in reply: {value!r}")
+        bids.append(float(value))
+    return bids
+
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM answers.
+
+    - In-memory LRU tier bounded to `max_entries`.
+    - Optional on-disk SQLite tier (`disk_path`) whose entries expire after
+      `ttl` seconds; it is shared by every process pointing at the same file.
+    """
+
+    def __init__(self, max_entries=1024, disk_path=None, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.disk_path = disk_path
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            with closing(self._connect()) as db, db:
+                db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.disk_path, timeout=10)
+
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return self.memory[key]
+
+        if self.disk_path:
+            with closing(self._connect()) as db, db:
+                row = db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row and time.time() - row[1] <= self.ttl:
+                    self._remember(key, row[0])
+                    with self.lock:
+                        self.hits += 1
+                        self.disk_hits += 1
+                    return row[0]
+                if row:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        self._remember(key, value)
+        if self.disk_path:
+            with closing(self._connect()) as db, db:
+                db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, value, time.time()))
+
+    def _remember(self, key, value):
+        with self.lock:
+            self.memory[key] = value
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+    def stats(self):
+        """Hit/miss counters of the cache."""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "disk_hits": self.disk_hits,
+                    "size": len(self.memory)}
+
+
+class LLMClient:
+    """Shared chat-completion client: every strategy prompt goes through its response cache."""
+
+    def __init__(self, api_key=None, model="gpt-4", cache=None, bucket=1.0, base_url=None, provider=None,
+                 max_retries=2):
+        if provider is None:
+            api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY")
+            provider = OpenAIProvider(api_key=api_key, base_url=base_url, max_retries=max_retries)
+        self.provider = provider  # OpenAI endpoint, local stub server, or in-process stub
+        self.model = model
+        self.cache = cache if cache is not None else ResponseCache()
+        self.bucket = bucket
+        self.requests = 0
+        self.request_seconds = 0.0  # Summed duration of provider calls (concurrent async calls overlap)
+        self._inflight = {}
+        self._inflight_loop = None
+
+    @property
+    def enabled(self):
+        return self.provider.enabled
+
+    def ping(self):
+        """Health check of the provider without spending a completion."""
+        return self.provider.ping()
+
+    def quantize(self, value):
+        """Quantises a price-like prompt input into the configured bucket."""
+        return quantize(value, self.bucket)
+
+    def complete(self, messages, model=None, timeout=None):
+        """
+        Returns the stripped reply text, from cache when the same prompt was seen before.
+
+        `timeout` (seconds) is passed on as the provider's request timeout.
+        """
+        model = model or self.model
+        key = prompt_key(model, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        self.requests += 1
+        options = {"timeout": timeout} if timeout is not None else {}
+        start = time.perf_counter()
+        try:
+            content = self.provider.complete(model, messages, **options).strip()
+        finally:
+            self.request_seconds += time.perf_counter() - start
+        self.cache.set(key, content)
+        return content
+
+    async def acomplete(self, messages, model=None, timeout=None):
+        """
+        Async variant of `complete`.
+
+        - Concurrent requests for the same prompt share one in-flight call.
+        - `timeout` (seconds) bounds the wait; a timeout raises `asyncio.TimeoutError`.
+        """
+        model = model or self.model
+        key = prompt_key(model, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if self._inflight_loop is not loop:
+            self._inflight = {}
+            self._inflight_loop = loop
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._afetch(key, model, messages))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    async def _afetch(self, key, model, messages):
+        self.requests += 1
+        start = time.perf_counter()
+        try:
+            content = (await self.provider.acomplete(model, messages)).strip()
+        finally:
+            self.request_seconds += time.perf_counter() - start
+        self.cache.set(key, content)
+        return content
+
+    def stats(self):
+        return {**self.cache.stats(), "requests": self.requests, "request_seconds": self.request_seconds}
+
+
+_llm_client = None
+
+
+def get_llm_client():
+    """Process-wide LLM client configured from config.json (created on first use)."""
+    global _llm_client
+    if _llm_client is None:
+        config = Config.load_config()
+        cache = ResponseCache(
+            max_entries=config["LLM_CACHE_SIZE"],
+            disk_path=config["LLM_CACHE_FILE"],
+            ttl=config["LLM_CACHE_TTL"],
+        )
+        _llm_client = LLMClient(cache=cache, bucket=config["LLM_PRICE_BUCKET"], provider=build_provider(config))
+        if not _llm_client.enabled:
+            print("⚠️ WARNING: OpenAI API Key not found. AI-powered bidding will be disabled.")
+    return _llm_client
+
+
+def build_provider(config):
+    """Strategy provider selected by LLM_PROVIDER: "openai" (default) or the in-process "stub"."""
+    if config["LLM_PROVIDER"] == "stub":
+        return StubProvider(latency=config["LLM_STUB_LATENCY"], jitter=config["LLM_STUB_JITTER"],
+                            error_rate=config["LLM_STUB_ERROR_RATE"])
+    return OpenAIProvider(api_key=config["OPENAI_API_KEY"], base_url=config["OPENAI_BASE_URL"],
+                          max_retries=config["LLM_MAX_RETRIES"])
+
+
+def set_llm_client(client):
+    """Replaces the process-wide LLM client (e.g. one pointed at a local mock server)."""
+    global _llm_client
+    _llm_client = client
@@ -0,0 +1,147 @@
+import re
+import json
+import time
+import random
+import asyncio
+import threading
+
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+class StrategyProviderError(Exception):
+    """Raised by a provider when a completion fails (e.g. injected stub errors)."""
+
+
+class StrategyProvider:
+    """Interface of the chat-completion backends behind `LLMClient`."""
+
+    enabled = True
+
+    def complete(self, model, messages, **options):
+        """Returns the reply text for a chat request."""
+        raise NotImplementedError
+
+    async def acomplete(self, model, messages, **options):
+        """Async variant of `complete`."""
+        raise NotImplementedError
+
+    def ping(self):
+        """Cheap health check that does not spend completion tokens."""
+        return self.enabled
+
+
+class OpenAIProvider(StrategyProvider):
+    """
+    Real OpenAI (or any chat-completions compatible) endpoint.
+
+    `max_retries` is handed to the SDK clients; use 0 against the stub server
+    so injected errors and latencies are measured as configured.
+    """
+
+    def __init__(self, api_key=None, base_url=None, max_retries=2):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self._client = None
+        self._async_client = None
+        self._async_loop = None
+
+    @property
+    def enabled(self):
+        return bool(self.api_key)
+
+    @property
+    def client(self):
+        if self._client is None:
+            import openai  # Imported on first use: keeps CLI and test startup fast
+            self._client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                         max_retries=self.max_retries)
+        return self._client
+
+    @property
+    def async_client(self):
+        """AsyncOpenAI client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            import openai
+            self._async_client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                                     max_retries=self.max_retries)
+            self._async_loop = loop
+        return self._async_client
+
+    def complete(self, model, messages, **options):
+        response = self.client.chat.completions.create(model=model, messages=messages, **options)
+        return response.choices[0].message.content
+
+    async def acomplete(self, model, messages, **options):
+        response = await self.async_client.chat.completions.create(model=model, messages=messages, **options)
+        return response.choices[0].message.content
+
+    def ping(self):
+        if not self.enabled:
+            return False
+        self.client.models.list()  # Authenticated request without a completion
+        return True
+
+
+def stub_reply(messages):
+    """
+    Deterministic stand-in answer for a chat request.
+
+    - Replies 2% below the first number of the last user message (threshold,
+      lowest competitor bid, ...), or 100 when the prompt has no number.
+    - Batched prompts (system message asks for a JSON array) get a JSON array
+      with each listed agent's bid undercut by 2%.
+    """
+    user_messages = [m["content"] for m in messages if m["role"] == "user"]
+    if user_messages and any("JSON array" in m["content"] for m in messages if m["role"] == "system"):
+        agents = json.loads(user_messages[-1].split("Agents:", 1)[1])
+        return json.dumps([round(float(agent["bid"]) * 0.98, 2) for agent in agents])
+    numbers = NUMBER.findall(user_messages[-1]) if user_messages else []
+    value = float(numbers[0]) * 0.98 if numbers else 100.0
+    return f"{round(value, 2)}"
+
+
+class StubProvider(StrategyProvider):
+    """
+    In-process deterministic provider for offline runs and benchmarks.
+
+    - `latency` / `jitter`: simulated round-trip time in seconds (uniform jitter).
+    - `error_rate`: fraction of calls that raise `StrategyProviderError`.
+    - Latency and error injection draw from a private RNG seeded by `seed`,
+      so they never disturb the simulation's own random streams.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def _draw(self):
+        with self.lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            failed = self.rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def complete(self, model, messages, **options):
+        delay, failed = self._draw()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise StrategyProviderError("Injected stub error")
+        return stub_reply(messages)
+
+    async def acomplete(self, model, messages, **options):
+        delay, failed = self._draw()
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            raise StrategyProviderError("Injected stub error")
+        return stub_reply(messages)
@@ -0,0 +1,119 @@
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.utils.llm_providers import stub_reply
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """Answers `/v1/chat/completions` and `/v1/models` like the OpenAI API, deterministically."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        delay, failed = server.draw()
+
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if delay:
+                time.sleep(delay)
+            if failed:
+                self._send(500, {"error": {"message": "Injected stub error", "type": "server_error"}})
+                return
+            content = stub_reply(body.get("messages", []))
+            self._send(200, {
+                "id": f"chatcmpl-stub-{server.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def do_GET(self):
+        # models.list() is used as the cheap API health check
+        self._send(200, {"object": "list", "data": [{"id": "gpt-4", "object": "model", "owned_by": "stub"}]})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubChatServer(ThreadingHTTPServer):
+    """
+    Localhost chat-completions stand-in for offline runs and benchmarks.
+
+    - `latency` / `jitter`: simulated round-trip time in seconds (uniform jitter).
+    - `error_rate`: fraction of completions answered with HTTP 500.
+    - Tracks `requests`, injected `errors` and `peak` concurrent requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        super().__init__((host, port), StubChatHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/v1"
+
+    def draw(self):
+        with self.lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            failed = self.rng.random() < self.error_rate
+            self.errors += failed
+            return delay, failed
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def start_stub_server(host="127.0.0.1", port=0, **options):
+    """Starts a StubChatServer on a daemon thread and returns it (`server.url` is the base URL)."""
+    server = StubChatServer(host, port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deterministic local stand-in for the chat-completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated round trip (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- latency jitter (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    args = parser.parse_args()
+
+    server = StubChatServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                            error_rate=args.error_rate)
+    print(f" Stub LLM server listening on {server.url} (set OPENAI_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
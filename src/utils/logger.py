@@ -1,21 +1,98 @@
-import logging
 import os
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-#  Ensure logs directory exists
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
-
-#  Configure Logger
 LOG_FILE = os.path.join(LOG_DIR, "bidding_system.log")
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate the log file at 5 MB
+LOG_BACKUP_COUNT = 3
+
+#  Verbosity levels: "normal" logs and prints every bid, "quiet" keeps warnings,
+#  "bench" keeps errors only so logging stays out of round-loop profiles
+VERBOSITY_LEVELS = {"normal": logging.INFO, "quiet": logging.WARNING, "bench": logging.ERROR}
+
+
+class LazyFileHandler(RotatingFileHandler):
+    """Size-rotating file handler that creates the log directory and file on the first record, not on import."""
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for an in-process listener.
+
+    Only merges the `%` arguments into the message; timestamps, formatting and
+    file I/O happen on the listener thread.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_state = {"verbosity": "normal", "handlers": [], "listener": None}
+
+
+def configure_logging(verbosity="normal", async_mode=False, log_file=LOG_FILE,
+                      max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+    """
+    (Re)configures the root logger.
+
+    - `verbosity`: one of VERBOSITY_LEVELS.
+    - `async_mode`: records are handed to a queue and written by a
+      QueueListener thread, so the caller never blocks on the file or console.
+    """
+    stop_logging()
+    root = logging.getLogger()
+    for handler in _state["handlers"]:
+        root.removeHandler(handler)
+        handler.close()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [LazyFileHandler(log_file, max_bytes, backup_count), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    listener = None
+    if async_mode:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        installed = [LocalQueueHandler(log_queue)]
+    else:
+        installed = handlers
+
+    for handler in installed:
+        root.addHandler(handler)
+    root.setLevel(VERBOSITY_LEVELS[verbosity])
+    _state.update(verbosity=verbosity, handlers=installed + (handlers if async_mode else []), listener=listener)
+
+
+def stop_logging():
+    """Drains the async log queue and stops its listener thread (no-op in sync mode)."""
+    listener = _state["listener"]
+    if listener is not None:
+        listener.stop()
+        _state["listener"] = None
+
+
+def verbose_output():
+    """True when per-bid and per-round progress should be printed."""
+    return _state["verbosity"] == "normal"
+
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE),  # Save logs to file
-        logging.StreamHandler()  # Print logs to console
-    ]
-)
+configure_logging()
+atexit.register(stop_logging)
 
 # Logger instance
 logger = logging.getLogger("BiddingSystem")
@@ -23,15 +100,15 @@ logger = logging.getLogger("BiddingSystem")
 #  Example function for logging warnings/errors
 def log_error(error_msg):
     """Logs error messages."""
-    logger.error(f" ERROR: {error_msg}")
+    logger.error(" ERROR: %s", error_msg)
 
 def log_info(info_msg):
     """Logs informational messages."""
-    logger.info(f"INFO: {info_msg}")
+    logger.info("INFO: %s", info_msg)
 
 def log_debug(debug_msg):
     """Logs debug messages."""
-    logger.debug(f"DEBUG: {debug_msg}")
+    logger.debug("DEBUG: %s", debug_msg)
 
 if __name__ == "__main__":
     log_info("Logger initialized successfully!")
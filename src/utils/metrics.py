@@ -0,0 +1,89 @@
+import os
+import time
+
+
+class Phase:
+    """Reusable timer for one named phase: `with metrics.phase("bids"): ...`."""
+
+    __slots__ = ("seconds", "calls", "started")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds += time.perf_counter() - self.started
+        self.calls += 1
+
+
+class RunMetrics:
+    """
+    Low-overhead phase timers and counters for one simulation run.
+
+    - Phase objects are created once per name and reused, so timing a phase
+      costs two `perf_counter` calls.
+    - `snapshot()` returns plain dicts; `prometheus_text()` renders the same
+      numbers in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+
+    def phase(self, name):
+        timer = self.phases.get(name)
+        if timer is None:
+            timer = self.phases[name] = Phase()
+        return timer
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self, **counters):
+        """Phase totals, shares of the run's wall time and counters (plus any passed in)."""
+        elapsed = time.perf_counter() - self.started
+        return {
+            "elapsed_seconds": elapsed,
+            "phases": {name: {"seconds": timer.seconds, "calls": timer.calls,
+                              "share": timer.seconds / elapsed if elapsed else 0.0}
+                       for name, timer in self.phases.items()},
+            "counters": {**self.counters, **counters},
+        }
+
+
+def prometheus_text(snapshot, prefix="bidding_", labels=None):
+    """Renders a `RunMetrics.snapshot()` in the Prometheus text format (for node_exporter's textfile collector)."""
+    label_text = ",".join(f'{key}="{value}"' for key, value in (labels or {}).items())
+
+    def sample(name, value, **extra):
+        pairs = [label_text] if label_text else []
+        pairs += [f'{key}="{val}"' for key, val in extra.items()]
+        return f"{prefix}{name}{{{','.join(pairs)}}} {float(value)!r}" if pairs else f"{prefix}{name} {float(value)!r}"
+
+    lines = [f"# HELP {prefix}run_elapsed_seconds Wall time of the run so far.",
+             f"# TYPE {prefix}run_elapsed_seconds gauge",
+             sample("run_elapsed_seconds", snapshot["elapsed_seconds"]),
+             f"# HELP {prefix}phase_seconds_total Time spent per simulation phase.",
+             f"# TYPE {prefix}phase_seconds_total counter"]
+    lines += [sample("phase_seconds_total", phase["seconds"], phase=name) for name, phase in snapshot["phases"].items()]
+    lines += [f"# HELP {prefix}phase_calls_total Timed calls per simulation phase.",
+              f"# TYPE {prefix}phase_calls_total counter"]
+    lines += [sample("phase_calls_total", phase["calls"], phase=name) for name, phase in snapshot["phases"].items()]
+    for name, value in snapshot["counters"].items():
+        lines += [f"# TYPE {prefix}{name}_total counter", sample(f"{name}_total", value)]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(snapshot, path, **options):
+    """Writes the metrics atomically, so a scraper never reads a half-written file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as file:
+        file.write(prometheus_text(snapshot, **options))
+    os.replace(tmp_path, path)
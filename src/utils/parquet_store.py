@@ -0,0 +1,188 @@
+import os
+import json
+import uuid
+import argparse
+import pandas as pd
+from src.utils.logger import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for the Parquet backend
+    pa = ds = pq = None
+
+COLUMNS = ["Round", "Agent", "Bid", "Winning_Bid"]
+DEFAULT_RUN_ID = "default"
+#  Sidecar listing the partition sizes the dataset was written with ("_" files are skipped by dataset discovery)
+PARTITIONING_FILE = "_partitioning.json"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The Parquet storage backend requires pyarrow: pip install pyarrow")
+
+
+def bid_schema():
+    """Typed schema of the partitioned bid-history dataset."""
+    _require_pyarrow()
+    return pa.schema([
+        ("Round", pa.int64()),
+        ("Agent", pa.string()),
+        ("Bid", pa.float64()),
+        ("Winning_Bid", pa.bool_()),
+        ("run_id", pa.string()),
+        ("round_bucket", pa.int64()),
+    ])
+
+
+class ParquetBidStore:
+    """
+    Columnar bid-history storage partitioned by run id and round range.
+
+    - Layout: `<root>/run_id=<id>/round_bucket=<first round>/part-*.parquet`.
+    - Round-range and agent filters are pushed down into the scan, so whole
+      partitions are skipped and row groups are filtered by statistics.
+    - Partitions are pruned with the partition sizes recorded in
+      `_partitioning.json` by the writers, not this reader's
+      `rounds_per_partition`.
+    """
+
+    def __init__(self, root, run_id=DEFAULT_RUN_ID, rounds_per_partition=1000):
+        _require_pyarrow()
+        self.root = root
+        self.run_id = run_id
+        self.rounds_per_partition = rounds_per_partition
+        self.schema = bid_schema()
+        self.partitioning = ds.partitioning(
+            pa.schema([("run_id", pa.string()), ("round_bucket", pa.int64())]), flavor="hive"
+        )
+
+    def append(self, df, run_id=None):
+        """Appends a DataFrame with the bid-history columns as new Parquet files."""
+        if df.empty:
+            return
+
+        df = pd.DataFrame({
+            "Round": df["Round"].astype("int64"),
+            "Agent": df["Agent"].astype(str),
+            "Bid": df["Bid"].astype("float64"),
+            "Winning_Bid": df["Winning_Bid"].astype(bool),
+        })
+        df["run_id"] = run_id or self.run_id
+        df["round_bucket"] = df["Round"] // self.rounds_per_partition * self.rounds_per_partition
+
+        self._record_partition_size()
+        table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        ds.write_dataset(
+            table, self.root, format="parquet", partitioning=self.partitioning,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    def partition_sizes(self):
+        """Partition sizes the stored data was written with (empty for data written before they were recorded)."""
+        try:
+            with open(os.path.join(self.root, PARTITIONING_FILE)) as file:
+                return json.load(file)["rounds_per_partition"]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _record_partition_size(self):
+        sizes = self.partition_sizes()
+        if self.rounds_per_partition in sizes:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, PARTITIONING_FILE)
+        with open(f"{path}.tmp", "w") as file:
+            json.dump({"rounds_per_partition": sorted(sizes + [self.rounds_per_partition])}, file)
+        os.replace(f"{path}.tmp", path)
+
+    def part_files(self, run_id=None):
+        """Parquet files of a run, as paths relative to the store root."""
+        run_dir = os.path.join(self.root, f"run_id={run_id or self.run_id}")
+        return sorted(os.path.relpath(os.path.join(directory, name), self.root)
+                      for directory, _, names in os.walk(run_dir) for name in names if name.endswith(".parquet"))
+
+    def remove_parts(self, keep, run_id=None):
+        """Deletes a run's Parquet files that are not in `keep` (e.g. written after a checkpoint)."""
+        keep = set(keep)
+        removed = [path for path in self.part_files(run_id) if path not in keep]
+        for path in removed:
+            os.remove(os.path.join(self.root, path))
+            try:
+                os.rmdir(os.path.dirname(os.path.join(self.root, path)))  # Drop the partition once it is empty
+            except OSError:
+                pass
+        return len(removed)
+
+    def dataset(self):
+        return ds.dataset(self.root, format="parquet", schema=self.schema, partitioning=self.partitioning)
+
+    def read(self, run_id=None, rounds=None, agents=None, columns=None):
+        """
+        Loads bid rows, pushing filters down into the Parquet scan.
+
+        - `run_id`: a single run (defaults to all runs).
+        - `rounds`: inclusive `(first, last)` round range; either end may be None.
+        - `agents`: iterable of agent names to keep.
+        """
+        columns = columns or COLUMNS
+        if not os.path.isdir(self.root):
+            return pd.DataFrame(columns=columns)
+
+        conditions = []
+        if run_id is not None:
+            conditions.append(ds.field("run_id") == run_id)
+        if rounds is not None:
+            first, last = rounds
+            if first is not None:
+                conditions.append(ds.field("Round") >= first)
+                sizes = self.partition_sizes()
+                if sizes:  # A row of round `first` sits in the lowest of these buckets at most
+                    bucket = min(first // size * size for size in sizes)
+                    conditions.append(ds.field("round_bucket") >= bucket)
+            if last is not None:
+                conditions += [ds.field("round_bucket") <= last, ds.field("Round") <= last]
+        if agents is not None:
+            conditions.append(ds.field("Agent").isin(list(agents)))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table = self.dataset().to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+
+    def run_ids(self):
+        """Lists the run ids present in the store."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name.split("=", 1)[1] for name in os.listdir(self.root) if name.startswith("run_id="))
+
+
+def migrate_csv_to_parquet(csv_file, root, run_id="legacy", rounds_per_partition=1000, chunksize=1_000_000):
+    """One-shot migration of an existing bid-history CSV into the Parquet store."""
+    store = ParquetBidStore(root, run_id=run_id, rounds_per_partition=rounds_per_partition)
+    rows = 0
+    for chunk in pd.read_csv(csv_file, chunksize=chunksize):
+        chunk["Round"] = pd.to_numeric(chunk["Round"], errors="coerce").fillna(0).astype("int64")
+        chunk["Bid"] = pd.to_numeric(chunk["Bid"], errors="coerce")
+        chunk["Winning_Bid"] = chunk["Winning_Bid"].astype(str).str.lower() == "true"
+        store.append(chunk)
+        rows += len(chunk)
+
+    logger.info("Migrated %d bid rows from %s to %s (run_id=%s).", rows, csv_file, root, run_id)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate a bid-history CSV to the partitioned Parquet store")
+    parser.add_argument("csv_file", help="Existing bid_history.csv")
+    parser.add_argument("root", help="Parquet dataset directory")
+    parser.add_argument("--run-id", default="legacy")
+    parser.add_argument("--rounds-per-partition", type=int, default=1000)
+    args = parser.parse_args()
+
+    migrated = migrate_csv_to_parquet(args.csv_file, args.root, args.run_id, args.rounds_per_partition)
+    print(f" Migrated {migrated} rows to {args.root}")
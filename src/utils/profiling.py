@@ -0,0 +1,65 @@
+import os
+import pstats
+import cProfile
+
+
+def frame_name(func):
+    filename, lineno, name = func
+    if filename == "~":
+        return name  # Built-in, e.g. "<built-in method time.sleep>"
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapsed_stacks(stats, max_depth=64, min_seconds=1e-6):
+    """
+    Converts cProfile statistics into collapsed stacks (`root;child;leaf <microseconds>`),
+    the input format of flamegraph.pl, speedscope and inferno.
+
+    cProfile only records caller -> callee edges, so each function's own time
+    is split across its call paths in proportion to the time spent under each
+    edge. Recursive paths are cut where a function repeats, and subtrees
+    below `min_seconds` are dropped to keep the output small.
+    """
+    raw = pstats.Stats(stats).stats if isinstance(stats, cProfile.Profile) else stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))  # edge[3]: cumulative time under this edge
+
+    lines = {}
+
+    def walk(func, path, weight):
+        _, _, own_time, total_time, _ = raw[func]
+        path = path + (frame_name(func),)
+        key = ";".join(path)
+        lines[key] = lines.get(key, 0.0) + own_time * weight
+        if len(path) >= max_depth:
+            return
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = raw[callee][3]
+            if callee_total <= 0 or weight * edge_time < min_seconds or frame_name(callee) in path:
+                continue
+            walk(callee, path, weight * min(1.0, edge_time / callee_total))
+
+    for func, (_, _, _, _, callers) in raw.items():
+        if not callers:
+            walk(func, (), 1.0)
+
+    return [f"{key} {round(seconds * 1e6)}" for key, seconds in sorted(lines.items()) if round(seconds * 1e6) > 0]
+
+
+def profile_call(function, output, *args, **kwargs):
+    """
+    Runs `function` under cProfile.
+
+    Writes collapsed stacks to `output` (for a flamegraph) and the raw
+    statistics to `<output>.prof` (for pstats or snakeviz).
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *args, **kwargs)
+    finally:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        profiler.dump_stats(f"{output}.prof")
+        with open(output, "w") as file:
+            file.write("\n".join(collapsed_stacks(profiler)) + "\n")
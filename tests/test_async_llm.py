@@ -0,0 +1,124 @@
+import json
+import time
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.utils.llm_client import LLMClient, set_llm_client
+
+
+class MockChatServer(ThreadingHTTPServer):
+    """Local chat-completions endpoint with a fixed delay that tracks peak concurrency."""
+
+    daemon_threads = True
+
+    def __init__(self, delay, reply="100"):
+        super().__init__(("127.0.0.1", 0), MockChatHandler)
+        self.delay = delay
+        self.reply = reply
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.requests = 0
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.active += 1
+            server.requests += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+
+        payload = json.dumps({
+            "id": "chatcmpl-mock", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": server.reply}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncLLMFanOut(unittest.TestCase):
+    """Async simulation mode against a local mock chat-completions server."""
+
+    def start_server(self, delay):
+        self.server = MockChatServer(delay)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.llm = LLMClient(api_key="test-key", base_url=f"http://127.0.0.1:{self.server.server_port}/v1", bucket=None)
+        self.llm.provider.client  # openai is imported lazily; keep that one-off cost out of the timings
+        set_llm_client(self.llm)
+
+    def tearDown(self):
+        set_llm_client(None)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_distinct_prompts_run_concurrently(self):
+        """Eight different prompts finish in about one round trip."""
+        self.start_server(delay=0.3)
+
+        async def fan_out():
+            calls = [self.llm.acomplete([{"role": "user", "content": f"prompt {i}"}]) for i in range(8)]
+            return await asyncio.gather(*calls)
+
+        start = time.perf_counter()
+        replies = asyncio.run(fan_out())
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(replies, ["100"] * 8)
+        self.assertGreaterEqual(self.server.peak, 2)  # Exact overlap at the server depends on scheduling
+        self.assertLess(elapsed, 0.3 * 4)
+
+    def test_identical_prompts_share_one_request(self):
+        self.start_server(delay=0.2)
+
+        async def fan_out():
+            calls = [self.llm.acomplete([{"role": "user", "content": "same"}]) for _ in range(5)]
+            return await asyncio.gather(*calls)
+
+        self.assertEqual(asyncio.run(fan_out()), ["100"] * 5)
+        self.assertEqual(self.server.requests, 1)
+
+    def test_async_simulation_round_latency(self):
+        """Strategy and suggestion calls of a round overlap instead of running back to back."""
+        self.start_server(delay=0.3)
+        agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=True, exploration_rate=0) for i in range(5)]
+        simulation = BiddingSimulation(agents, rounds=2, initial_threshold=600, persist=False, verbose=False,
+                                       async_llm=True)
+
+        start = time.perf_counter()
+        simulation.run_simulation()
+        elapsed = time.perf_counter() - start
+
+        #  Per round: one overlapped fan-out plus the market-threshold call => ~2 round trips
+        self.assertLess(elapsed, 2 * 3 * 0.3)
+        self.assertEqual(len(simulation.bid_history), 2)
+
+    def test_timeout_falls_back_to_rl_bid(self):
+        """Slow LLM replies are abandoned after llm_timeout and the RL bid is used."""
+        self.start_server(delay=1.0)
+        agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=True, exploration_rate=0) for i in range(3)]
+        simulation = BiddingSimulation(agents, rounds=1, persist=False, verbose=False,
+                                       async_llm=True, llm_timeout=0.1)
+
+        bids = asyncio.run(simulation.collect_bids_async(1, asyncio.Semaphore(4)))
+        self.assertEqual(set(bids), {"Agent 0", "Agent 1", "Agent 2"})
+        self.assertTrue(all(bid >= 1 for bid in bids.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
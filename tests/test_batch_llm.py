@@ -0,0 +1,111 @@
+import random
+import unittest
+from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.core.negotiation_logic import NegotiationLogic
+from src.utils.llm_client import BATCH_INSTRUCTION, LLMClient, ResponseCache, parse_bid_array, set_llm_client
+from src.utils.llm_providers import StubProvider
+
+
+class ScalarOnlyProvider(StubProvider):
+    """Provider that ignores the batch format and always answers with one number."""
+
+    def complete(self, model, messages, **options):
+        self.calls += 1
+        return "95"
+
+
+class RecordingProvider(StubProvider):
+    """Stub provider that also records whether each request was a batched prompt."""
+
+    def __init__(self):
+        super().__init__()
+        self.batched = []
+
+    def complete(self, model, messages, **options):
+        self.batched.append(BATCH_INSTRUCTION in messages[0]["content"])
+        return super().complete(model, messages, **options)
+
+
+class TestParseBidArray(unittest.TestCase):
+    def test_valid_replies(self):
+        self.assertEqual(parse_bid_array("[98, 97.5]", 2), [98.0, 97.5])
+        self.assertEqual(parse_bid_array('```json\n[{"bid": 90}, {"bid": 91}]\n```', 2), [90.0, 91.0])
+
+    def test_invalid_replies(self):
+        for reply in ["98", "[98]", "[98, \"low\"]", "[98, -1]", "[98, true]", "{\"bids\": 2}"]:
+            with self.assertRaises(ValueError):
+                parse_bid_array(reply, 2)
+
+
+class TestBatchedPrompting(unittest.TestCase):
+    """One LLM request per round instead of one per agent."""
+
+    def setUp(self):
+        random.seed(0)
+        self.provider = StubProvider()
+        set_llm_client(LLMClient(provider=self.provider, bucket=None))
+
+    def tearDown(self):
+        set_llm_client(None)
+
+    def test_simulation_sends_one_request_per_round(self):
+        agents = [DQNBiddingAgent(name=f"Agent {i}") for i in range(1, 6)]
+        simulation = BiddingSimulation(agents=agents, rounds=4, persist=False, verbose=False, batch_llm=True)
+        simulation.run_simulation()
+        # One batched suggestion request plus the market-threshold adjustment per round
+        self.assertEqual(self.provider.calls, 2 * 4)
+        self.assertEqual(len(simulation.bid_history), 4)
+
+    def test_ai_enabled_agents_share_the_round_request(self):
+        provider = RecordingProvider()
+        set_llm_client(LLMClient(provider=provider, bucket=None, cache=ResponseCache(max_entries=0)))
+        agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=True) for i in range(1, 6)]
+        simulation = BiddingSimulation(agents=agents, rounds=4, persist=False, verbose=False, batch_llm=True)
+        simulation.run_simulation()
+        #  Per round: exactly one request for all agents, plus the market-threshold adjustment
+        self.assertEqual(provider.batched, [True, False] * 4)
+
+    def test_negotiators_share_one_request_per_round(self):
+        provider = RecordingProvider()
+        set_llm_client(LLMClient(provider=provider, bucket=None, cache=ResponseCache(max_entries=0)))
+        agents = [NegotiationAgent(name=f"Agent {i}", ai_enabled=True) for i in range(1, 6)]
+        simulation = BiddingSimulation(agents=agents, rounds=4, persist=False, verbose=False, batch_llm=True)
+        simulation.run_simulation()
+        #  Per round: bids, negotiation counter-offers, market-threshold adjustment
+        self.assertEqual(provider.batched, [True, True, False] * 4)
+        self.assertEqual(len(simulation.bid_history), 4)
+
+    def test_batch_suggestions_map_back_to_agents(self):
+        agents = [DQNBiddingAgent(name=f"Agent {i}") for i in range(1, 4)]
+        simulation = BiddingSimulation(agents=agents, rounds=1, persist=False, verbose=False, batch_llm=True)
+        self.assertEqual(simulation.get_ai_batch_suggestions(100, 5, [100, 50, 10]), [98.0, 49.0, 9.8])
+
+    def test_unparseable_reply_falls_back_to_per_agent_calls(self):
+        provider = ScalarOnlyProvider()
+        set_llm_client(LLMClient(provider=provider, bucket=None))
+        agents = [DQNBiddingAgent(name=f"Agent {i}") for i in range(1, 4)]
+        simulation = BiddingSimulation(agents=agents, rounds=1, persist=False, verbose=False, batch_llm=True)
+        self.assertIsNone(simulation.get_ai_batch_suggestions(100, 5, [100, 50, 10]))
+
+        provider.calls = 0
+        simulation.collect_bids_batched(1)
+        self.assertEqual(provider.calls, 1 + 1)  # Failed batch, then the shared per-agent suggestion (cached)
+
+    def test_negotiation_batches_counter_offers(self):
+        def negotiation_requests(batch_llm):
+            provider = StubProvider()
+            set_llm_client(LLMClient(provider=provider, bucket=None))
+            agents = [NegotiationAgent(name=f"Agent {i}") for i in range(1, 6)]
+            bids = {agent.name: 100 + i for i, agent in enumerate(agents)}
+            logic = NegotiationLogic(agents, negotiation_rounds=3, epsilon=None, batch_llm=batch_llm)
+            logic.negotiate_bids(100, bids)
+            self.assertEqual(logic.last_report["passes"], 3)
+            return provider.calls
+
+        self.assertEqual(negotiation_requests(True), 3)  # Exactly one request per pass
+        self.assertGreater(negotiation_requests(False), 3 * 5)  # Agent strategy + counter-offer per agent, less cache hits
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from src.core.bid_history import BidHistoryWindow
+
+NAMES = [f"Agent {i}" for i in range(1, 4)]
+
+
+def round_bids(round_num):
+    return {name: 100.0 - round_num % 7 + i for i, name in enumerate(NAMES)}
+
+
+class TestBidHistoryWindow(unittest.TestCase):
+    """Windowed (rounds x agents) bid history."""
+
+    def test_keeps_last_window_in_order(self):
+        history = BidHistoryWindow(NAMES, window=5)
+        for round_num in range(1, 13):
+            history.append(round_num, round_bids(round_num))
+
+        self.assertEqual(len(history), 5)
+        rounds, values = history.array()
+        self.assertEqual(rounds.tolist(), list(range(8, 13)))
+        self.assertEqual(list(history), [round_bids(n) for n in range(8, 13)])
+        self.assertEqual(history[-1], round_bids(12))
+        self.assertEqual(values.shape, (5, 3))
+
+    def test_memory_stays_flat(self):
+        history = BidHistoryWindow(NAMES, window=100)
+        for round_num in range(1, 101):
+            history.append(round_num, round_bids(round_num))
+        allocated = history.values.nbytes + history.round_numbers.nbytes
+        for round_num in range(101, 10_001):
+            history.append(round_num, round_bids(round_num))
+
+        self.assertEqual(history.values.nbytes + history.round_numbers.nbytes, allocated)
+        self.assertEqual(len(history), 100)
+
+    def test_totals_cover_evicted_rounds(self):
+        bounded = BidHistoryWindow(NAMES, window=4)
+        unbounded = BidHistoryWindow(NAMES, window=None, capacity=2)
+        for round_num in range(1, 51):
+            bids = round_bids(round_num)
+            bids["Agent 3"] = 90.0 if round_num % 5 == 0 else bids["Agent 3"]
+            bounded.append(round_num, bids)
+            unbounded.append(round_num, bids)
+
+        self.assertEqual(len(unbounded), 50)
+        winning_bids = [min(bids.values()) for bids in unbounded]
+        self.assertEqual(bounded.total_rounds, 50)
+        self.assertEqual(bounded.wins.tolist(), [40, 0, 10])
+        self.assertAlmostEqual(bounded.mean_winning_bid(), np.mean(winning_bids))
+
+    def test_state_dict_round_trip(self):
+        history = BidHistoryWindow(NAMES, window=3)
+        for round_num in range(1, 8):
+            history.append(round_num, round_bids(round_num))
+
+        restored = BidHistoryWindow(NAMES, window=3)
+        restored.load_state_dict(history.state_dict())
+        history.append(8, round_bids(8))
+        restored.append(8, round_bids(8))
+
+        self.assertEqual(list(restored), list(history))
+        self.assertEqual(restored.wins.tolist(), history.wins.tolist())
+        self.assertEqual(restored.total_rounds, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from src.utils.data_handler import BidHistoryWriter, DataHandler
+
+
+class TestBidHistoryWriter(unittest.TestCase):
+    """Tests for the buffered bid-history CSV writer."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.tmp_dir, "data", "bid_history.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_flushes_every_n_rounds(self):
+        """Rows stay buffered until flush_every rounds have been collected."""
+        writer = BidHistoryWriter(self.data_file, flush_every=3, flush_interval=3600)
+        writer.append_round(1, {"Agent 1": 95.0, "Agent 2": 100.0}, 95.0)
+        writer.append_round(2, {"Agent 1": 97.0, "Agent 2": 96.0}, 96.0)
+        self.assertFalse(os.path.exists(self.data_file))
+
+        writer.append_round(3, {"Agent 1": 90.0, "Agent 2": 99.0}, 90.0)
+        df = pd.read_csv(self.data_file)
+        self.assertEqual(list(df.columns), ["Round", "Agent", "Bid", "Winning_Bid"])
+        self.assertEqual(len(df), 6)
+        self.assertEqual(df["Winning_Bid"].tolist(), [True, False, False, True, True, False])
+
+    def test_context_manager_flushes_on_exit(self):
+        """Leaving the context writes the remaining rows, with a single header."""
+        with BidHistoryWriter(self.data_file, flush_every=2, flush_interval=3600, capacity=1) as writer:
+            for round_num in range(1, 6):
+                writer.append_round(round_num, {"Agent 1": 100.0 + round_num, "Agent 2": 99.0}, 99.0)
+
+        df = pd.read_csv(self.data_file)
+        self.assertEqual(df["Round"].tolist(), [1, 1, 2, 2, 3, 3, 4, 4, 5, 5])
+        self.assertEqual(writer.rows_written, 10)
+
+    def test_time_based_flush(self):
+        """A zero flush interval writes every round immediately."""
+        writer = BidHistoryWriter(self.data_file, flush_every=1000, flush_interval=0)
+        writer.append_round(1, {"Agent 1": 95.123456}, 95.123456)
+        self.assertEqual(len(pd.read_csv(self.data_file)), 1)
+
+
+class TestDataHandlerConfig(unittest.TestCase):
+    """DataHandler reads config.json once, not on every call."""
+
+    def test_config_is_cached(self):
+        with mock.patch.object(DataHandler, "_config", None), \
+                mock.patch("src.utils.config.Config.load_config", return_value={"DATA_FILE": "x.csv"}) as load:
+            DataHandler.config()
+            DataHandler.config()
+            self.assertEqual(load.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.utils.bid_rollups import BidRollups
+from src.utils.data_handler import BidHistoryWriter
+from src.utils.parquet_store import ParquetBidStore
+
+AGENTS = ["Agent 1", "Agent 2", "Agent 3"]
+
+
+def round_bids(round_num):
+    return {name: 100.0 - (round_num * (i + 3)) % 11 + i * 0.25 for i, name in enumerate(AGENTS)}
+
+
+class TestBidRollups(unittest.TestCase):
+    """Incremental dashboard aggregates over the bid-history CSV and Parquet store."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.tmp_dir, "bid_history.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_rounds(self, first, last):
+        with BidHistoryWriter(self.csv_file, flush_every=50) as writer:
+            for round_num in range(first, last + 1):
+                bids = round_bids(round_num)
+                writer.append_round(round_num, bids, min(bids.values()))
+
+    def assert_matches_csv(self, rollups):
+        df = pd.read_csv(self.csv_file)
+        summary = rollups.agent_summary()
+        expected = df.groupby("Agent")["Bid"].agg(["count", "mean", "std", "min", "max"])
+        np.testing.assert_array_equal(summary["bids"], expected["count"])
+        np.testing.assert_allclose(summary[["mean", "std", "min", "max"]], expected[["mean", "std", "min", "max"]])
+        np.testing.assert_array_equal(summary["wins"], df.groupby("Agent")["Winning_Bid"].sum())
+        pivot = df.pivot(index="Round", columns="Agent", values="Bid")
+        np.testing.assert_allclose(rollups.trend(max_points=10_000), pivot)
+
+    def test_tails_only_appended_rows(self):
+        self.write_rounds(1, 200)
+        rollups = BidRollups(self.csv_file)
+        self.assertTrue(rollups.refresh())
+        self.assertEqual(rollups.offset, os.path.getsize(self.csv_file))
+        self.assertFalse(rollups.refresh())
+
+        self.write_rounds(201, 300)
+        parsed = []
+        rollups.add = lambda df, add=rollups.add: (parsed.append(len(df)), add(df))
+        self.assertTrue(rollups.refresh())
+        self.assertEqual(sum(parsed), 300)  # Only the 100 new rounds were parsed
+        self.assertEqual(rollups.round_range(), (1, 300))
+        self.assert_matches_csv(rollups)
+
+    def test_partial_line_waits_for_writer(self):
+        self.write_rounds(1, 10)
+        wins = int(pd.read_csv(self.csv_file).query("Agent == 'Agent 1'")["Winning_Bid"].sum())
+        with open(self.csv_file, "a") as file:
+            file.write("11,Agent 1,9")
+        rollups = BidRollups(self.csv_file)
+        rollups.refresh()
+        self.assertEqual(rollups.rows_read, 30)
+
+        with open(self.csv_file, "a") as file:
+            file.write("9.5,True\n")
+        rollups.refresh()
+        self.assertEqual(rollups.rows_read, 31)
+        self.assertEqual(rollups.agent_summary().loc["Agent 1", "wins"], wins + 1)
+
+    def test_rewritten_file_is_reloaded(self):
+        self.write_rounds(1, 50)
+        rollups = BidRollups(self.csv_file, chunk_bytes=256)  # Small chunks: many read_csv calls
+        rollups.refresh()
+        position = os.path.getsize(self.csv_file)
+        self.write_rounds(51, 80)
+        rollups.refresh()
+
+        os.truncate(self.csv_file, position)  # Checkpoint rollback, then the resumed run appends again
+        self.write_rounds(51, 90)
+        self.assertTrue(rollups.refresh())
+        self.assertEqual(rollups.rows_read, 270)
+        self.assert_matches_csv(rollups)
+
+    def test_downsampled_trend_keeps_bucket_means(self):
+        self.write_rounds(1, 1000)
+        rollups = BidRollups(self.csv_file)
+        rollups.refresh()
+
+        trend = rollups.trend(rounds=(101, 1000), agents=["Agent 2"], max_points=100)
+        self.assertEqual(trend.shape, (100, 1))
+        self.assertEqual(trend.index[1], 110)
+        expected = np.mean([round_bids(n)["Agent 2"] for n in range(110, 119)])
+        self.assertAlmostEqual(trend.iloc[1, 0], expected)
+
+    def test_bid_sample_is_bounded(self):
+        self.write_rounds(1, 500)
+        rollups = BidRollups(self.csv_file, sample_size=100, chunk_bytes=1024)
+        rollups.refresh()
+
+        sample = rollups.bid_sample(agents=["Agent 1", "Agent 3"])
+        self.assertEqual(sample["Agent"].value_counts().to_dict(), {"Agent 1": 100, "Agent 3": 100})
+        late = rollups.bid_sample(rounds=(251, 500), agents=["Agent 1"])
+        self.assertTrue(20 < len(late) < 80)
+
+    def test_parquet_store_reads_new_parts(self):
+        root = os.path.join(self.tmp_dir, "store")
+        store = ParquetBidStore(root, run_id="run")
+        rollups = BidRollups(root)
+        store.append(bid_frame(1, 40))
+        self.assertTrue(rollups.refresh())
+        store.append(bid_frame(41, 60))
+        self.assertTrue(rollups.refresh())
+        self.assertFalse(rollups.refresh())
+
+        self.assertEqual(rollups.rows_read, 180)
+        self.assertEqual(rollups.rows().shape, (180, 4))
+        self.assertEqual(rollups.round_range(), (1, 60))
+
+
+def bid_frame(first, last):
+    rows = []
+    for round_num in range(first, last + 1):
+        bids = round_bids(round_num)
+        rows += [(round_num, name, bid, bid == min(bids.values())) for name, bid in bids.items()]
+    return pd.DataFrame(rows, columns=["Round", "Agent", "Bid", "Winning_Bid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+import torch
+from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
+from src.utils.bid_server import BidBatcher, load_agents, start_bid_server
+from src.utils.llm_client import LLMClient, set_llm_client
+
+
+def greedy_bid(agent, market_threshold, rounds_remaining):
+    with torch.no_grad():
+        bid = agent.model(torch.tensor([market_threshold, rounds_remaining], dtype=torch.float32)).item()
+    return max(1, round(bid, 2))
+
+
+def request(url, body=None):
+    """(status, JSON reply) of a GET, or a POST when `body` is given."""
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class BlockingBatcher(BidBatcher):
+    """Holds every batch until `release` is set."""
+
+    def __init__(self, agents, **kwargs):
+        self.release = threading.Event()
+        super().__init__(agents, **kwargs)
+
+    def policy_bids(self, requests):
+        self.release.wait(10)
+        return super().policy_bids(requests)
+
+
+class TestBidBatcher(unittest.TestCase):
+    """Micro-batched bid evaluation."""
+
+    def setUp(self):
+        torch.manual_seed(0)
+        self.agents = [DQNBiddingAgent(name=f"Agent {i}") for i in range(1, 4)]
+
+    def test_coalesces_requests(self):
+        batcher = BidBatcher(self.agents, max_batch_size=64, max_wait=0.2)
+        self.addCleanup(batcher.close)
+        requests = [(f"Agent {i % 2 + 1}", 60 + 7 * i, i % 5) for i in range(10)]  # Agent 3 is not asked
+        futures = [batcher.submit(*request) for request in requests]
+        bids = [future.result(5) for future in futures]
+
+        self.assertEqual(batcher.stats()["batches"], 1)
+        for (name, threshold, rounds_remaining), bid in zip(requests, bids):
+            agent = self.agents[int(name[-1]) - 1]
+            self.assertAlmostEqual(bid, greedy_bid(agent, threshold, rounds_remaining), delta=0.011)
+
+    def test_max_batch_size(self):
+        batcher = BidBatcher(self.agents, max_batch_size=4, max_wait=0.2)
+        self.addCleanup(batcher.close)
+        futures = [batcher.submit("Agent 1", 100, i) for i in range(10)]
+        for future in futures:
+            future.result(5)
+        self.assertEqual(batcher.stats()["largest_batch"], 4)
+        self.assertEqual(batcher.stats()["batches"], 3)
+
+    def test_unknown_agent(self):
+        batcher = BidBatcher(self.agents)
+        self.addCleanup(batcher.close)
+        with self.assertRaises(KeyError):
+            batcher.submit("Agent 9", 100, 5)
+
+
+class TestBidServer(unittest.TestCase):
+    """HTTP bid service on localhost."""
+
+    def setUp(self):
+        set_llm_client(LLMClient(api_key=""))
+        torch.manual_seed(0)
+        self.agents = [DQNBiddingAgent(name="Agent 1"), NegotiationAgent(name="Negotiator")]
+        self.server = start_bid_server(self.agents, max_wait=0.001)
+
+    def tearDown(self):
+        self.server.stop()
+        set_llm_client(None)
+
+    def request(self, path, body=None):
+        return request(self.server.url + path, body)
+
+    def test_bid(self):
+        status, reply = self.request("/bid", {"agent": "Agent 1", "market_threshold": 120, "rounds_remaining": 3})
+        self.assertEqual(status, 200)
+        self.assertAlmostEqual(reply["bid"], greedy_bid(self.agents[0], 120, 3), delta=0.011)
+
+        status, health = self.request("/health")
+        self.assertEqual((status, health["agents"], health["requests"]), (200, ["Agent 1", "Negotiator"], 1))
+
+    def test_negotiate(self):
+        status, reply = self.request("/negotiate", {"agent": "Negotiator", "competitor_bids": {"Agent 1": 80},
+                                                    "market_threshold": 100})
+        self.assertEqual((status, reply["bid"]), (200, 79))
+        status, _ = self.request("/negotiate", {"agent": "Agent 1", "competitor_bids": {"Agent 1": 80},
+                                                "market_threshold": 100})
+        self.assertEqual(status, 404)
+
+    def test_timeout(self):
+        self.server.batcher.close()
+        self.server.batcher = BlockingBatcher(self.agents)
+        self.server.timeout = 0.05
+        try:
+            status, reply = self.request("/bid", {"agent": "Agent 1", "market_threshold": 120, "rounds_remaining": 3})
+        finally:
+            self.server.batcher.release.set()
+        self.assertEqual((status, reply["error"]), (503, "Bid evaluation timed out"))
+
+    def test_errors(self):
+        self.assertEqual(self.request("/bid", {"agent": "Agent 9", "market_threshold": 1, "rounds_remaining": 1})[0], 404)
+        self.assertEqual(self.request("/bid", {"agent": "Agent 1"})[0], 400)
+        self.assertEqual(self.request("/bid", ["Agent 1"])[0], 400)
+        self.assertEqual(self.request("/bid", {"agent": "Agent 1", "market_threshold": "high",
+                                               "rounds_remaining": 1})[0], 400)
+        self.assertEqual(self.request("/bids", {})[0], 404)
+
+
+class TestLoadAgents(unittest.TestCase):
+    """Agents served from exported weights, with a choice of negotiators."""
+
+    def setUp(self):
+        set_llm_client(LLMClient(api_key=""))
+        self.tmp_dir = tempfile.mkdtemp()
+        torch.manual_seed(0)
+        self.agents = [DQNBiddingAgent(name=f"Agent {i}") for i in range(1, 3)]
+        for agent in self.agents:
+            agent.export_weights(os.path.join(self.tmp_dir, f"{agent.name.replace(' ', '_')}.npz"))
+
+    def tearDown(self):
+        set_llm_client(None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_negotiators(self):
+        agents = load_agents(weights_dir=self.tmp_dir, negotiators=["Agent 2"])
+        self.assertEqual([type(agent) for agent in agents], [DQNBiddingAgent, NegotiationAgent])
+        self.assertEqual(greedy_bid(agents[1], 120, 3), greedy_bid(self.agents[1], 120, 3))
+        self.assertTrue(all(isinstance(agent, NegotiationAgent) for agent in load_agents(count=3, negotiators=True)))
+
+        server = start_bid_server(agents, max_wait=0.001)
+        self.addCleanup(server.stop)
+        body = {"competitor_bids": {"Agent 1": 80}, "market_threshold": 100}
+        self.assertEqual(request(server.url + "/negotiate", {"agent": "Agent 1", **body})[0], 404)
+        status, reply = request(server.url + "/negotiate", {"agent": "Agent 2", **body})
+        self.assertEqual((status, reply["bid"]), (200, 79))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import time
+import shutil
+import socket
+import tempfile
+import unittest
+from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.utils.bid_stream import BidStreamConsumer, BidStreamPublisher
+from src.utils.llm_client import LLMClient, set_llm_client
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestBidStream(unittest.TestCase):
+    """Live round stream from the simulation to the dashboard."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.address = os.path.join(self.tmp_dir, "stream.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_backlog_waits_for_listener(self):
+        publisher = BidStreamPublisher(self.address, backlog=3)
+        for round_num in range(1, 6):
+            self.assertFalse(publisher.publish({"round": round_num}))
+        self.assertEqual((publisher.sent, publisher.dropped, len(publisher.backlog)), (0, 2, 3))
+
+        consumer = BidStreamConsumer(self.address)
+        try:
+            self.assertTrue(publisher.flush())
+            self.assertTrue(wait_for(lambda: consumer.received == 3))
+        finally:
+            publisher.close()
+            consumer.close()
+        self.assertEqual([event["round"] for event in consumer.drain()], [3, 4, 5])
+
+    def test_simulation_streams_rounds(self):
+        consumer = BidStreamConsumer(self.address)
+        publisher = BidStreamPublisher(self.address)
+        set_llm_client(LLMClient(api_key=""))
+        try:
+            agents = [DQNBiddingAgent(name="Agent 1"), NegotiationAgent(name="Agent 2")]
+            simulation = BiddingSimulation(agents=agents, rounds=5, persist=False, verbose=False, publisher=publisher)
+            simulation.run_simulation()
+            self.assertTrue(wait_for(lambda: publisher.flush() and consumer.received == 5))
+        finally:
+            set_llm_client(None)
+            publisher.close()
+            consumer.close()
+
+        events = consumer.drain()
+        self.assertEqual([event["round"] for event in events], [1, 2, 3, 4, 5])
+        self.assertEqual([event["bids"] for event in events], list(simulation.bid_history))
+        self.assertEqual(events[-1]["next_threshold"], simulation.current_threshold)
+        self.assertEqual(consumer.drain(), [])
+        self.assertEqual(consumer.bids_frame().shape, (5, 2))
+        self.assertFalse(os.path.exists(self.address))
+
+    def test_stalled_consumer_never_blocks_publisher(self):
+        stalled = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)  # Bound but never read
+        stalled.bind(self.address)
+        publisher = BidStreamPublisher(self.address)
+        event = {"round": 1, "bids": {f"Agent {i}": 100.0 for i in range(100)}}
+        try:
+            start = time.perf_counter()
+            for _ in range(5000):
+                publisher.publish(event)
+            elapsed = time.perf_counter() - start
+        finally:
+            publisher.close()
+            stalled.close()
+
+        self.assertGreater(publisher.dropped, 0)
+        self.assertEqual(len(publisher.backlog), publisher.max_backlog)
+        self.assertEqual(publisher.sent + publisher.dropped + len(publisher.backlog), 5000)
+        self.assertLess(elapsed, 2.0)
+
+    def test_oversized_events_are_dropped(self):
+        consumer = BidStreamConsumer(self.address)
+        publisher = BidStreamPublisher(self.address, max_datagram=1 << 20)
+        huge = {"round": 1, "bids": {f"Agent {i}": 100.0 for i in range(20_000)}}  # ~400 KB, above the kernel limit
+        try:
+            publisher.publish(huge)
+            self.assertEqual(publisher.dropped, 1)
+            self.assertEqual(len(publisher.backlog), 0)
+            self.assertTrue(publisher.publish({"round": 2}))
+            self.assertTrue(wait_for(lambda: consumer.received == 1))
+
+            publisher.max_datagram = 1024
+            publisher.publish(huge)
+            self.assertEqual((publisher.dropped, len(publisher.backlog)), (2, 0))
+        finally:
+            publisher.close()
+            consumer.close()
+        self.assertEqual([event["round"] for event in consumer.drain()], [2])
+
+    def test_consumer_keeps_latest_rounds(self):
+        consumer = BidStreamConsumer(self.address, max_rounds=10)
+        publisher = BidStreamPublisher(self.address)
+        try:
+            for round_num in range(1, 31):
+                publisher.publish({"round": round_num, "bids": {"Agent 1": float(round_num)}})
+            self.assertTrue(wait_for(lambda: publisher.flush() and consumer.received == 30))
+        finally:
+            publisher.close()
+            consumer.close()
+
+        self.assertEqual([event["round"] for event in consumer.latest()], list(range(21, 31)))
+
+
+if __name__ == "__main__":
+    unittest.main()
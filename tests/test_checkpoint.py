@@ -0,0 +1,128 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import torch
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.core.checkpoint import CheckpointWriter, load_checkpoint, save_checkpoint
+from src.utils.data_handler import BidHistoryWriter, ParquetBidHistoryWriter
+from src.utils.llm_client import LLMClient, set_llm_client
+from src.utils.parquet_store import ParquetBidStore, pa
+
+
+class Crash(Exception):
+    pass
+
+
+class CrashingSimulation(BiddingSimulation):
+    """Fails at `crash_round`, after some checkpoints have been written."""
+
+    crash_round = None
+
+    def run_round(self, round_num):
+        if round_num == self.crash_round:
+            raise Crash(round_num)
+        super().run_round(round_num)
+
+
+class TestCheckpointResume(unittest.TestCase):
+    """Atomic checkpoints and deterministic resume."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.checkpoint_file = os.path.join(self.tmp_dir, "checkpoint.pt")
+        self.csv_file = os.path.join(self.tmp_dir, "bid_history.csv")
+        self.parquet_dir = os.path.join(self.tmp_dir, "bid_history")
+        set_llm_client(LLMClient(api_key=""))
+
+    def tearDown(self):
+        set_llm_client(None)
+        shutil.rmtree(self.tmp_dir)
+
+    def make_simulation(self, cls=BiddingSimulation, checkpoint=None, storage="csv", **options):
+        agents = [DQNBiddingAgent(name=f"Agent {i}", replay_capacity=64, batch_size=8, td_target=True)
+                  for i in range(1, 4)]
+        if storage == "parquet":
+            writer = ParquetBidHistoryWriter(self.parquet_dir, run_id="sim", flush_every=1)
+        else:
+            writer = BidHistoryWriter(self.csv_file, flush_every=1)
+        return cls(agents=agents, rounds=20, verbose=False, writer=writer, checkpoint=checkpoint, **options)
+
+    def outcome(self, simulation):
+        return (list(simulation.bid_history), simulation.current_threshold,
+                [agent.reward for agent in simulation.agents],
+                [agent.sample_q_values() for agent in simulation.agents])
+
+    def stored_history(self, storage):
+        if storage == "parquet":
+            df = ParquetBidStore(self.parquet_dir).read(run_id="sim")
+            return df.sort_values(["Round", "Agent"]).values.tolist()
+        with open(self.csv_file) as file:
+            return file.read()
+
+    def seed(self):
+        random.seed(3)
+        np.random.seed(3)
+        torch.manual_seed(3)
+
+    def test_resume_matches_uninterrupted_run(self):
+        self.check_resume()
+
+    def test_resume_with_population_training(self):
+        self.check_resume(population_training=True)  # Adam state travels through the agents' optimizers
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_resume_with_parquet_storage(self):
+        self.check_resume(storage="parquet")
+
+    def check_resume(self, storage="csv", **options):
+        options["storage"] = storage
+        self.seed()
+        reference = self.make_simulation(**options)
+        reference.run_simulation()
+        reference_history = self.stored_history(storage)
+        if storage == "parquet":
+            shutil.rmtree(self.parquet_dir)
+        else:
+            os.remove(self.csv_file)
+
+        self.seed()
+        checkpoint = CheckpointWriter(self.checkpoint_file, every=5)
+        crashed = self.make_simulation(CrashingSimulation, checkpoint, **options)
+        crashed.crash_round = 13
+        with self.assertRaises(Crash):
+            crashed.run_simulation()
+        checkpoint.close()
+        self.assertEqual(checkpoint.last_round, 10)
+
+        self.seed()  # Resume must not depend on the seed: RNG state comes from the checkpoint
+        random.random()
+        resumed = self.make_simulation(**options)
+        resumed.load_state_dict(load_checkpoint(self.checkpoint_file))
+        self.assertEqual(resumed.start_round, 11)
+        resumed.run_simulation()
+
+        self.assertEqual(self.outcome(resumed), self.outcome(reference))
+        #  Rounds 11-12 from the crashed run were rolled back
+        self.assertEqual(self.stored_history(storage), reference_history)
+
+    def test_atomic_save_keeps_previous_checkpoint(self):
+        save_checkpoint({"round": 1}, self.checkpoint_file)
+        with self.assertRaises(Exception):
+            save_checkpoint({"round": 2, "bad": lambda: None}, self.checkpoint_file)  # Not picklable
+        self.assertEqual(load_checkpoint(self.checkpoint_file)["round"], 1)
+
+    def test_writer_keeps_only_newest_pending_state(self):
+        checkpoint = CheckpointWriter(self.checkpoint_file, every=1)
+        for round_num in range(1, 51):
+            checkpoint.submit({"round": round_num})
+        checkpoint.close()
+        self.assertEqual(load_checkpoint(self.checkpoint_file)["round"], 50)
+        self.assertLessEqual(checkpoint.written, 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.agents.bidding_agent import DQNBiddingAgent, NegotiationAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.utils.event_log import EventLogReader, EventLogWriter
+from src.utils.llm_client import LLMClient, set_llm_client
+
+AGENTS = ["Agent 1", "Agent 2", "Agent 3"]
+
+
+class TestEventLog(unittest.TestCase):
+    """Binary round event stream and its memory-mapped reader."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "events.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_rounds(self, first, last):
+        with EventLogWriter(self.path, AGENTS) as writer:
+            for round_num in range(first, last + 1):
+                bids = [round_num + i for i in range(3)]
+                writer.append_round(round_num, 100.0, 99.0, min(bids), bids, [0, -1, 0], [10, -5, -5], [0.2] * 3)
+
+    def test_seek_and_replay(self):
+        self.write_rounds(1, 1000)
+        with EventLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 1000)
+            event = reader.read_round(500)
+            self.assertEqual(event["round"], 500)
+            self.assertEqual(event["bids"], {"Agent 1": 500.0, "Agent 2": 501.0, "Agent 3": 502.0})
+            self.assertEqual(event["adjustments"]["Agent 2"], -1.0)
+            self.assertEqual([e["round"] for e in reader.replay(998)], [998, 999, 1000])
+            np.testing.assert_array_equal(reader.column("bids")[:, 0], np.arange(1, 1001))
+
+    def test_append_and_crash_tail(self):
+        self.write_rounds(1, 10)
+        with open(self.path, "ab") as file:
+            file.write(b"\x10\x00\x00\x00partial")  # Record cut short by a crash
+        self.write_rounds(11, 20)
+
+        with EventLogReader(self.path) as reader:
+            self.assertEqual((reader.first_round, reader.last_round, len(reader)), (1, 20, 20))
+            self.assertEqual(reader.read_round(15)["winning_bid"], 15.0)
+
+    def test_agent_mismatch(self):
+        self.write_rounds(1, 2)
+        with self.assertRaises(ValueError):
+            EventLogWriter(self.path, ["Someone else"])
+
+    def test_simulation_emits_rounds(self):
+        set_llm_client(LLMClient(api_key=""))
+        try:
+            agents = [DQNBiddingAgent(name="Agent 1"), NegotiationAgent(name="Agent 2")]
+            with EventLogWriter(self.path, [agent.name for agent in agents]) as event_log:
+                simulation = BiddingSimulation(agents=agents, rounds=5, persist=False, verbose=False,
+                                               event_log=event_log)
+                simulation.run_simulation()
+        finally:
+            set_llm_client(None)
+
+        with EventLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 5)
+            for event, bids in zip(reader.replay(), simulation.bid_history):
+                self.assertEqual(event["bids"], bids)
+                self.assertEqual(event["winning_bid"], min(bids.values()))
+            self.assertEqual(reader.read_round(5)["next_threshold"], simulation.current_threshold)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import subprocess
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY_MODULES = {"torch", "openai", "langchain", "pandas", "pyarrow", "dotenv"}
+LIGHT_MODULES = ["src.core.bidding_simulation", "src.core.negotiation_logic", "src.market.market_threshold",
+                 "src.agents.negotiation_agent", "src.agents.numpy_agent", "src.utils.llm_client", "src.utils.data_handler", "src.utils.logger"]
+IMPORT_BUDGET_US = 1_500_000  # Cumulative import time allowed for the modules above
+
+
+def import_profile(args, cwd):
+    """Runs `python -X importtime <args>` and returns (top-level packages imported, cumulative us per module)."""
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=cwd, env=env,
+                            capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise AssertionError(result.stderr[-2000:])
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return {name.split(".")[0] for name in cumulative}, cumulative
+
+
+class TestImportTime(unittest.TestCase):
+    """Modules import without heavy dependencies, clients or files on disk."""
+
+    def test_core_modules_stay_light(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            packages, cumulative = import_profile(["-c", "import " + ", ".join(LIGHT_MODULES)], cwd)
+            self.assertEqual(os.listdir(cwd), [])  # No log files or data directories on import
+
+        self.assertFalse(packages & HEAVY_MODULES, f"Heavy modules imported: {packages & HEAVY_MODULES}")
+        total = sum(cumulative[name] for name in LIGHT_MODULES if name in cumulative)
+        self.assertLess(total, IMPORT_BUDGET_US)
+
+    def test_cli_help_skips_heavy_imports(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            packages, _ = import_profile([os.path.join(REPO_ROOT, "main.py"), "--help"], cwd)
+        self.assertFalse(packages & HEAVY_MODULES, f"Heavy modules imported: {packages & HEAVY_MODULES}")
+
+
+if __name__ == "__main__":
+    unittest.main()
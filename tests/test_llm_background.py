@@ -0,0 +1,66 @@
+import time
+import unittest
+from src.utils.llm_background import BackgroundLLM
+from src.utils.llm_client import LLMClient
+from src.utils.llm_providers import StrategyProviderError, StubProvider
+
+MESSAGES = [{"role": "user", "content": "Market threshold: 120. Suggest an optimal bid."}]
+
+
+def wait_for_reply(background, messages=MESSAGES, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        reply = background.get(messages)
+        if reply is not None:
+            return reply
+        time.sleep(0.01)
+    return None
+
+
+class TestBackgroundLLM(unittest.TestCase):
+    """Dashboard LLM calls off the render path."""
+
+    def make(self, **stub_options):
+        self.provider = StubProvider(**stub_options)
+        self.background = BackgroundLLM(LLMClient(provider=self.provider))
+        self.addCleanup(self.background.close)
+        return self.background
+
+    def test_get_never_blocks(self):
+        background = self.make(latency=0.3)
+        start = time.perf_counter()
+        self.assertIsNone(background.get(MESSAGES))
+        self.assertIsNone(background.get(MESSAGES))
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+        self.assertEqual(wait_for_reply(background), "117.6")
+        self.assertEqual(background.get(MESSAGES), "117.6")
+        self.assertEqual(self.provider.calls, 1)  # Reruns while pending share one call
+        self.assertEqual(background.pending(), 0)
+
+    def test_timeout(self):
+        background = self.make(latency=0.5)
+        background.timeout = 0.05
+        self.assertIsNone(background.get(MESSAGES))
+        time.sleep(0.1)
+        with self.assertRaises(TimeoutError):
+            background.get(MESSAGES)
+        with self.assertRaises(TimeoutError):
+            background.get(MESSAGES)  # Not resubmitted before `retry_after`
+        self.assertEqual(self.provider.calls, 1)
+
+    def test_failure_is_retried_later(self):
+        background = self.make(error_rate=1.0)
+        background.retry_after = 0.1
+        self.assertIsNone(background.get(MESSAGES))
+        with self.assertRaises(StrategyProviderError):
+            wait_for_reply(background)
+
+        self.provider.error_rate = 0.0
+        time.sleep(0.15)
+        self.assertEqual(wait_for_reply(background), "117.6")
+        self.assertEqual(self.provider.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.utils.llm_client import LLMClient, ResponseCache, prompt_key, quantize
+
+
+class FakeCompletions:
+    """Stands in for `client.chat.completions`, counting network calls."""
+
+    def __init__(self, reply="101.5"):
+        self.reply = reply
+        self.calls = 0
+
+    def create(self, model, messages):
+        self.calls += 1
+        message = SimpleNamespace(content=f" {self.reply}\n")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def fake_client(llm, reply="101.5"):
+    completions = FakeCompletions(reply)
+    llm.provider._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return completions
+
+
+class TestLLMClient(unittest.TestCase):
+    """Tests for the cached LLM client layer."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_quantize(self):
+        self.assertEqual(quantize(523.4, 1), 523)
+        self.assertEqual(quantize(523.4, 5), 525)
+        self.assertEqual(quantize(0.26, 0.25), 0.25)
+        self.assertEqual(quantize(523.4, None), 523.4)
+
+    def test_prompt_key_normalises_whitespace(self):
+        a = [{"role": "user", "content": "Market threshold is  500,\n 3 rounds"}]
+        b = [{"role": "user", "content": "Market threshold is 500, 3 rounds "}]
+        self.assertEqual(prompt_key("gpt-4", a), prompt_key("gpt-4", b))
+        self.assertNotEqual(prompt_key("gpt-4", a), prompt_key("gpt-3.5-turbo", a))
+
+    def test_repeated_prompt_costs_one_request(self):
+        """Identical prompts are answered from cache after the first call."""
+        llm = LLMClient(api_key="test-key")
+        completions = fake_client(llm)
+        messages = [{"role": "user", "content": f"Market threshold is {llm.quantize(500.2)}"}]
+
+        self.assertEqual(llm.complete(messages), "101.5")
+        self.assertEqual(llm.complete([{"role": "user", "content": f"Market threshold is {llm.quantize(499.8)}"}]), "101.5")
+        self.assertEqual(completions.calls, 1)
+        self.assertEqual(llm.stats()["hits"], 1)
+        self.assertEqual(llm.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_disk_tier_with_ttl(self):
+        """The SQLite tier survives a new process-level cache and honours the TTL."""
+        disk_path = os.path.join(self.tmp_dir, "llm_cache.sqlite")
+        ResponseCache(disk_path=disk_path, ttl=60).set("k", "42")
+
+        fresh = ResponseCache(disk_path=disk_path, ttl=60)
+        self.assertEqual(fresh.get("k"), "42")
+        self.assertEqual(fresh.stats()["disk_hits"], 1)
+
+        with mock.patch("src.utils.llm_client.time.time", return_value=10 ** 12):
+            self.assertIsNone(ResponseCache(disk_path=disk_path, ttl=60).get("k"))
+
+    def test_disabled_without_key(self):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": ""}):
+            self.assertFalse(LLMClient().enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
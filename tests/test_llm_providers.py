@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from unittest import mock
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.utils.llm_client import LLMClient, get_llm_client, set_llm_client
+from src.utils.llm_providers import StrategyProviderError, StubProvider, stub_reply
+from src.utils.llm_stub_server import start_stub_server
+
+
+def user_prompt(text):
+    return [{"role": "system", "content": "You are a bidding strategist."}, {"role": "user", "content": text}]
+
+
+class TestStubProvider(unittest.TestCase):
+    """In-process deterministic provider."""
+
+    def test_reply_undercuts_first_number(self):
+        self.assertEqual(stub_reply(user_prompt("Threshold 100, 5 rounds left")), "98.0")
+        self.assertEqual(stub_reply(user_prompt("No numbers here")), "100.0")
+
+    def test_error_rate_is_deterministic(self):
+        """Same seed, same injected failures."""
+        def failures(seed):
+            provider = StubProvider(error_rate=0.3, seed=seed)
+            outcome = []
+            for _ in range(50):
+                try:
+                    provider.complete("gpt-4", user_prompt("100"))
+                    outcome.append(False)
+                except StrategyProviderError:
+                    outcome.append(True)
+            return outcome
+
+        self.assertEqual(failures(1), failures(1))
+        self.assertTrue(0 < sum(failures(1)) < 50)
+
+    def test_client_uses_provider_and_cache(self):
+        provider = StubProvider()
+        llm = LLMClient(provider=provider)
+        self.assertEqual(llm.complete(user_prompt("50")), "49.0")
+        self.assertEqual(asyncio.run(llm.acomplete(user_prompt("50"))), "49.0")
+        self.assertEqual(provider.calls, 1)
+
+    def test_config_selects_stub_provider(self):
+        set_llm_client(None)
+        try:
+            with mock.patch.dict("os.environ", {"LLM_PROVIDER": "stub"}):
+                llm = get_llm_client()
+            self.assertIsInstance(llm.provider, StubProvider)
+            self.assertTrue(llm.ping())
+        finally:
+            set_llm_client(None)
+
+
+class TestStubServer(unittest.TestCase):
+    """Localhost chat-completions stand-in."""
+
+    def setUp(self):
+        self.server = start_stub_server(latency=0.01)
+        self.llm = LLMClient(api_key="offline", base_url=self.server.url, bucket=None)
+        set_llm_client(self.llm)
+
+    def tearDown(self):
+        set_llm_client(None)
+        self.server.stop()
+
+    def test_ping_spends_no_completion(self):
+        self.assertTrue(self.llm.ping())
+        self.assertEqual(self.server.requests, 0)
+
+    def test_completion_round_trip(self):
+        self.assertEqual(self.llm.complete(user_prompt("Threshold 200")), "196.0")
+        self.assertEqual(self.server.requests, 1)
+
+    def test_injected_errors_are_not_retried(self):
+        server = start_stub_server(error_rate=1.0)
+        self.addCleanup(server.stop)
+        llm = LLMClient(api_key="offline", base_url=server.url, max_retries=0)
+        with self.assertRaises(Exception):
+            llm.complete(user_prompt("Threshold 200"))
+        self.assertEqual((server.requests, server.errors), (1, 1))
+
+    def test_ai_simulation_runs_offline(self):
+        agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=True) for i in range(1, 4)]
+        simulation = BiddingSimulation(agents=agents, rounds=3, persist=False, verbose=False)
+        simulation.run_simulation()
+        self.assertGreater(self.server.requests, 0)
+        self.assertEqual(len(simulation.bid_history), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
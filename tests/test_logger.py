@@ -0,0 +1,66 @@
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+from src.utils.logger import configure_logging, logger, stop_logging, verbose_output
+
+
+class CountingArg:
+    """Log argument that counts how often it is rendered."""
+
+    def __init__(self):
+        self.renders = 0
+
+    def __str__(self):
+        self.renders += 1
+        return "value"
+
+
+class TestLogging(unittest.TestCase):
+    """Queue-based logging, rotation and quiet/bench verbosity."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.tmp_dir, "logs", "bidding_system.log")
+
+    def tearDown(self):
+        configure_logging()
+        shutil.rmtree(self.tmp_dir)
+
+    def read_log(self):
+        with open(self.log_file) as file:
+            return file.read()
+
+    def test_async_mode_writes_through_listener(self):
+        configure_logging(async_mode=True, log_file=self.log_file)
+        for i in range(100):
+            logger.info("Agent %s placed a bid: %s", f"Agent {i}", 100 - i)
+        stop_logging()  # Drains the queue
+
+        lines = self.read_log().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertTrue(lines[-1].endswith("Agent Agent 99 placed a bid: 1"))
+
+    def test_log_file_rotates(self):
+        configure_logging(log_file=self.log_file, max_bytes=2000, backup_count=2)
+        for i in range(200):
+            logger.warning("rotation line %d", i)
+
+        self.assertTrue(os.path.exists(self.log_file + ".1"))
+        self.assertFalse(os.path.exists(self.log_file + ".3"))
+        self.assertLess(os.path.getsize(self.log_file), 2000)
+
+    def test_bench_verbosity_skips_formatting(self):
+        configure_logging("bench", async_mode=True, log_file=self.log_file)
+        argument = CountingArg()
+        for _ in range(1000):
+            logger.info("Agent %s placed a bid", argument)
+
+        self.assertEqual(argument.renders, 0)
+        self.assertFalse(verbose_output())
+        self.assertEqual(logging.getLogger().level, logging.ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
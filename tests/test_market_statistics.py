@@ -0,0 +1,45 @@
+import unittest
+import random
+import numpy as np
+from src.market.market_threshold import MarketStatistics, dynamic_market_threshold
+
+
+class TestMarketStatistics(unittest.TestCase):
+    """Tests for incremental market statistics."""
+
+    def test_matches_full_recomputation(self):
+        """Running mean/std equal np.mean/np.std over the flattened history."""
+        rng = np.random.default_rng(0)
+        stats = MarketStatistics()
+        history = []
+        for _ in range(200):
+            round_bids = rng.uniform(400, 1200, size=7).tolist()
+            history.extend(round_bids)
+            stats.update(round_bids)
+
+            self.assertEqual(stats.count, len(history))
+            self.assertAlmostEqual(stats.mean, np.mean(history), places=9)
+            self.assertAlmostEqual(stats.std, np.std(history), places=9)
+
+    def test_same_threshold_as_list_input(self):
+        """dynamic_market_threshold gives the same result for a list and a MarketStatistics."""
+        bids = [95, 102, 98, 105, 100, 97, 103]
+        stats = MarketStatistics()
+        stats.update(bids[:3])
+        stats.update(bids[3:])
+
+        random.seed(3)
+        expected = dynamic_market_threshold(600, bids)
+        random.seed(3)
+        self.assertEqual(dynamic_market_threshold(600, stats), expected)
+
+    def test_empty_round_is_ignored(self):
+        """Merging an empty round leaves the statistics untouched."""
+        stats = MarketStatistics()
+        stats.update([])
+        self.assertEqual(stats.count, 0)
+        self.assertEqual(stats.std, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
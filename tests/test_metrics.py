@@ -0,0 +1,86 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import cProfile
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.core.bidding_simulation import BiddingSimulation
+from src.utils.llm_client import LLMClient, set_llm_client
+from src.utils.llm_providers import StubProvider
+from src.utils.metrics import RunMetrics, prometheus_text, write_prometheus_textfile
+from src.utils.profiling import collapsed_stacks, profile_call
+
+
+def inner():
+    time.sleep(0.02)
+
+
+def outer():
+    inner()
+    inner()
+
+
+class TestRunMetrics(unittest.TestCase):
+    """Per-phase timings, counters and their Prometheus rendering."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        set_llm_client(None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_simulation_snapshot(self):
+        set_llm_client(LLMClient(provider=StubProvider()))
+        agents = [DQNBiddingAgent(name=f"Agent {i}", ai_enabled=True) for i in range(1, 4)]
+        simulation = BiddingSimulation(agents=agents, rounds=5, persist=False, verbose=False)
+        simulation.run_simulation()
+
+        snapshot = simulation.metrics_snapshot()
+        counters = snapshot["counters"]
+        self.assertEqual(counters["rounds"], 5)
+        self.assertGreater(counters["llm_requests"], 0)
+        self.assertEqual(counters["optimizer_steps"], simulation.optimizer_steps())
+        for name in ("bids", "negotiation", "rewards", "threshold"):
+            self.assertEqual(snapshot["phases"][name]["calls"], 5)
+        self.assertLessEqual(sum(phase["seconds"] for phase in snapshot["phases"].values()),
+                             snapshot["elapsed_seconds"])
+
+    def test_prometheus_textfile(self):
+        metrics = RunMetrics()
+        with metrics.phase("bids"):
+            pass
+        metrics.count("rounds", 3)
+        snapshot = metrics.snapshot(llm_requests=7)
+
+        text = prometheus_text(snapshot, labels={"run_id": "a"})
+        self.assertIn('bidding_phase_calls_total{run_id="a",phase="bids"} 1.0', text)
+        self.assertIn('bidding_rounds_total{run_id="a"} 3.0', text)
+        self.assertIn('bidding_llm_requests_total{run_id="a"} 7.0', text)
+
+        path = os.path.join(self.tmp_dir, "metrics", "bidding.prom")
+        write_prometheus_textfile(snapshot, path)
+        with open(path) as file:
+            self.assertEqual(file.read(), prometheus_text(snapshot))
+        self.assertFalse(os.path.exists(f"{path}.tmp"))
+
+    def test_collapsed_stacks(self):
+        profiler = cProfile.Profile()
+        profiler.runcall(outer)
+        lines = collapsed_stacks(profiler)
+        stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+        sleep_stack = [stack for stack in stacks if stack.startswith("outer") and "time.sleep" in stack]
+        self.assertEqual(len(sleep_stack), 1)
+        self.assertIn(";inner (test_metrics.py:", sleep_stack[0])
+        self.assertGreaterEqual(stacks[sleep_stack[0]], 35_000)  # Two 20 ms sleeps, in microseconds
+
+        output = os.path.join(self.tmp_dir, "profile.folded")
+        profile_call(outer, output)
+        self.assertTrue(os.path.exists(f"{output}.prof"))
+        with open(output) as file:
+            self.assertTrue(any("time.sleep" in line for line in file))
+
+
+if __name__ == "__main__":
+    unittest.main()
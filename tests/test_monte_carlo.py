@@ -0,0 +1,36 @@
+import unittest
+from src.core.monte_carlo import run_episode, run_many, scenario_grid
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """Tests for the process-pool episode runner."""
+
+    @staticmethod
+    def strip_timing(summary):
+        return {key: value for key, value in summary.items() if key != "elapsed"}
+
+    def test_scenario_grid(self):
+        """One config per seed and threshold pair."""
+        configs = scenario_grid([1, 2], [100, 500], rounds=5)
+        self.assertEqual(len(configs), 4)
+        self.assertIn({"rounds": 5, "seed": 2, "initial_threshold": 500}, configs)
+
+    def test_episode_is_deterministic(self):
+        """The same seed reproduces the same episode."""
+        first = run_episode({"seed": 7, "rounds": 5, "num_agents": 3})
+        second = run_episode({"seed": 7, "rounds": 5, "num_agents": 3})
+        self.assertEqual(self.strip_timing(first), self.strip_timing(second))
+        self.assertEqual(first["rounds"], 5)
+        self.assertGreaterEqual(sum(first["wins"].values()), 5)
+
+    def test_run_many_streams_all_episodes(self):
+        """Pool results match in-process runs regardless of completion order."""
+        configs = scenario_grid([0, 1, 2], [100], rounds=5, num_agents=3)
+        results = {summary["seed"]: summary for summary in run_many(configs, workers=2)}
+
+        self.assertEqual(sorted(results), [0, 1, 2])
+        self.assertEqual(self.strip_timing(results[1]), self.strip_timing(run_episode(configs[1])))
+
+
+if __name__ == "__main__":
+    unittest.main()
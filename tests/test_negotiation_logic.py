@@ -0,0 +1,62 @@
+import unittest
+from src.agents.bidding_agent import NegotiationAgent
+from src.core.negotiation_logic import NegotiationLogic
+from src.utils.llm_client import LLMClient, set_llm_client
+
+
+class ReservePriceAgent(NegotiationAgent):
+    """Undercuts the lowest bid like NegotiationAgent, but never below its reserve price."""
+
+    reserve = 90
+
+    def negotiate(self, competitor_bids, market_threshold, use_ai=True):
+        return max(super().negotiate(competitor_bids, market_threshold, use_ai), self.reserve)
+
+
+class TestConvergingNegotiation(unittest.TestCase):
+    """Early termination in NegotiationLogic."""
+
+    def setUp(self):
+        set_llm_client(LLMClient(api_key=""))  # AI disabled: pure RL negotiation
+
+    def tearDown(self):
+        set_llm_client(None)
+
+    def negotiate(self, initial_bids, agent_class=NegotiationAgent, **kwargs):
+        agents = [agent_class(name=name) for name in initial_bids]
+        logic = NegotiationLogic(agents, **kwargs)
+        return logic.negotiate_bids(100, dict(initial_bids)), logic.last_report
+
+    def test_fixed_point_stops_with_identical_result(self):
+        #  NegotiationAgent undercuts by 1 every pass, so these bids only settle at the floor of 1
+        initial_bids = {f"Agent {i}": 10 + i for i in range(1, 6)}
+        full, full_report = self.negotiate(initial_bids, epsilon=None)
+        early, report = self.negotiate(initial_bids)
+
+        self.assertEqual(early, full)
+        self.assertEqual(full_report["passes"], 20)
+        self.assertEqual(report["converged"], "epsilon")
+        self.assertGreater(report["passes_saved"], 0)
+        self.assertEqual(len(report["pass_times"]), report["passes"])
+
+    def test_rank_patience(self):
+        initial_bids = {f"Agent {i}": 1000 + i for i in range(1, 6)}
+        _, report = self.negotiate(initial_bids, rank_patience=2)
+        self.assertEqual(report["converged"], "rank_order")
+        self.assertEqual(report["passes"], 3)
+
+    def test_reserve_price_converges(self):
+        initial_bids = {f"Agent {i}": 95 + i for i in range(1, 6)}
+        full, full_report = self.negotiate(initial_bids, ReservePriceAgent, epsilon=None)
+        early, report = self.negotiate(initial_bids, ReservePriceAgent)
+
+        self.assertEqual(early, full)
+        self.assertEqual(set(early.values()), {90})
+        self.assertEqual(full_report["passes"], 20)
+        self.assertEqual(report["converged"], "epsilon")
+        self.assertLess(report["passes"], 5)
+        self.assertEqual(report["agent_calls"], report["passes"] * len(initial_bids))
+
+
+if __name__ == "__main__":
+    unittest.main()
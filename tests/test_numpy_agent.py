@@ -0,0 +1,91 @@
+import os
+import sys
+import random
+import shutil
+import subprocess
+import tempfile
+import unittest
+import numpy as np
+import torch
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.agents.numpy_agent import NumpyBiddingAgent, load_dqn_weights
+from src.core.bidding_simulation import BiddingSimulation
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+#  Writes random weights with NumPy only, runs a simulation on them and reports whether torch was imported
+TORCH_FREE_SCRIPT = """
+import sys
+import numpy as np
+from src.agents.numpy_agent import PARAM_SHAPES, NumpyBiddingAgent
+from src.core.bidding_simulation import BiddingSimulation
+
+rng = np.random.default_rng(0)
+np.savez("agent.npz", **{name: rng.normal(size=shape).astype(np.float32) for name, shape in PARAM_SHAPES.items()})
+agents = [NumpyBiddingAgent.from_file(f"Agent {i}", "agent.npz") for i in range(1, 4)]
+simulation = BiddingSimulation(agents, rounds=5, persist=False, verbose=False)
+simulation.run_simulation()
+print(simulation.summary()["rounds"], "torch" in sys.modules)
+"""
+
+
+class TestNumpyBiddingAgent(unittest.TestCase):
+    """Exported DQN weights served without torch."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "agent.npz")
+        torch.manual_seed(0)
+        self.agent = DQNBiddingAgent(name="Agent 1", exploration_rate=0.3)
+        for _ in range(10):
+            self.agent.generate_bid(100, 5)
+            self.agent.update_reward(10)
+        self.agent.export_weights(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_q_values_match_torch(self):
+        numpy_agent = NumpyBiddingAgent.from_file("Agent 1", self.path)
+        states = np.random.default_rng(0).uniform([50, 0], [1000, 50], size=(5000, 2)).astype(np.float32)
+        with torch.no_grad():
+            expected = self.agent.model(torch.from_numpy(states)).squeeze(-1).numpy()
+        np.testing.assert_allclose(numpy_agent.q_values(states), expected, rtol=1e-5, atol=1e-4)
+        np.testing.assert_allclose(numpy_agent.sample_q_values(), self.agent.sample_q_values(), rtol=1e-5)
+
+    def test_generate_bid_matches_torch_agent(self):
+        numpy_agent = NumpyBiddingAgent.from_file("Agent 1", self.path, exploration_rate=self.agent.exploration_rate)
+        random.seed(7)
+        expected = [self.agent.generate_bid(threshold, 5) for threshold in range(80, 130)]
+        random.seed(7)
+        actual = [numpy_agent.generate_bid(threshold, 5) for threshold in range(80, 130)]
+        np.testing.assert_allclose(actual, expected, atol=0.01)
+        self.assertEqual(numpy_agent.last_state, (129, 5))
+
+    def test_rejects_wrong_layout(self):
+        weights = dict(np.load(self.path))
+        weights["fc2.weight"] = weights["fc2.weight"][:32]
+        np.savez(self.path, **weights)
+        with self.assertRaises(ValueError):
+            load_dqn_weights(self.path)
+
+    def test_runs_in_simulation(self):
+        agents = [NumpyBiddingAgent.from_file(f"Agent {i}", self.path) for i in range(1, 4)]
+        simulation = BiddingSimulation(agents, rounds=5, persist=False, verbose=False)
+        simulation.run_simulation()
+        summary = simulation.summary()
+        self.assertEqual(summary["rounds"], 5)
+        for agent in agents:
+            wins = summary["wins"][agent.name]
+            self.assertEqual(agent.reward, 10 * wins - 5 * (5 - wins))
+
+    def test_simulation_without_torch(self):
+        env = {**os.environ, "PYTHONPATH": REPO_ROOT, "OPENAI_API_KEY": ""}
+        result = subprocess.run([sys.executable, "-c", TORCH_FREE_SCRIPT], cwd=self.tmp_dir, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertEqual(result.stdout.split()[-2:], ["5", "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()
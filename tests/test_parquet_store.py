@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from src.utils.parquet_store import ParquetBidStore, migrate_csv_to_parquet, pa
+from src.utils.data_handler import ParquetBidHistoryWriter
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestParquetBidStore(unittest.TestCase):
+    """Tests for the partitioned Parquet bid-history backend."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmp_dir, "bid_history")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_rounds(self, store, first, last, run_id=None):
+        rows = [{"Round": r, "Agent": f"Agent {a}", "Bid": 100.0 + r + a, "Winning_Bid": a == 1}
+                for r in range(first, last + 1) for a in range(1, 4)]
+        store.append(pd.DataFrame(rows), run_id=run_id)
+
+    def test_partitioned_layout_and_typed_schema(self):
+        """Rows land in run_id / round_bucket partitions and read back typed."""
+        store = ParquetBidStore(self.root, run_id="run-a", rounds_per_partition=10)
+        self.write_rounds(store, 1, 25)
+
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root, "run_id=run-a"))),
+                         ["round_bucket=0", "round_bucket=10", "round_bucket=20"])
+        df = store.read()
+        self.assertEqual(len(df), 75)
+        self.assertEqual(str(df["Round"].dtype), "int64")
+        self.assertEqual(str(df["Bid"].dtype), "float64")
+        self.assertEqual(str(df["Winning_Bid"].dtype), "bool")
+
+    def test_filters(self):
+        """Run, round-range and agent filters are applied by the scan."""
+        store = ParquetBidStore(self.root, rounds_per_partition=10)
+        self.write_rounds(store, 1, 30, run_id="run-a")
+        self.write_rounds(store, 1, 5, run_id="run-b")
+
+        df = store.read(run_id="run-a", rounds=(12, 21), agents=["Agent 2"])
+        self.assertEqual(sorted(df["Round"].tolist()), list(range(12, 22)))
+        self.assertEqual(set(df["Agent"]), {"Agent 2"})
+        self.assertEqual(store.run_ids(), ["run-a", "run-b"])
+        self.assertEqual(len(store.read(rounds=(None, 3))), 18)
+
+    def test_reader_with_other_partition_size(self):
+        """Pruning uses the partition size the data was written with, not the reader's."""
+        self.write_rounds(ParquetBidStore(self.root, rounds_per_partition=50), 1, 120)
+        reader = ParquetBidStore(self.root, rounds_per_partition=10)
+
+        df = reader.read(rounds=(25, 60))
+        self.assertEqual(sorted(set(df["Round"])), list(range(25, 61)))
+        self.assertEqual(reader.partition_sizes(), [50])
+
+        self.write_rounds(reader, 121, 130)  # Mixed sizes: both are recorded
+        self.assertEqual(reader.partition_sizes(), [10, 50])
+        self.assertEqual(sorted(set(reader.read(rounds=(99, 125))["Round"])), list(range(99, 126)))
+
+    def test_unrecorded_partition_size(self):
+        """Data written before sizes were recorded is still found (no bucket pruning)."""
+        self.write_rounds(ParquetBidStore(self.root, rounds_per_partition=50), 1, 60)
+        os.remove(os.path.join(self.root, "_partitioning.json"))
+        df = ParquetBidStore(self.root, rounds_per_partition=10).read(rounds=(25, 30))
+        self.assertEqual(sorted(set(df["Round"])), list(range(25, 31)))
+
+    def test_migrate_csv(self):
+        """The CSV history migrates into the store with coerced types."""
+        csv_file = os.path.join(self.tmp_dir, "bid_history.csv")
+        pd.DataFrame({"Round": [1, 1, 2], "Agent": ["Agent 1", "Agent 2", "Agent 1"],
+                      "Bid": [95, 100.5, 97], "Winning_Bid": [True, False, True]}).to_csv(csv_file, index=False)
+
+        self.assertEqual(migrate_csv_to_parquet(csv_file, self.root, run_id="legacy"), 3)
+        df = ParquetBidStore(self.root).read(run_id="legacy")
+        self.assertEqual(sorted(df["Bid"].tolist()), [95.0, 97.0, 100.5])
+
+    def test_buffered_writer(self):
+        """ParquetBidHistoryWriter flushes batches into the store."""
+        with ParquetBidHistoryWriter(self.root, run_id="sim", flush_every=2, flush_interval=3600) as writer:
+            for round_num in range(1, 4):
+                writer.append_round(round_num, {"Agent 1": 90.0, "Agent 2": 95.0}, 90.0)
+
+        df = ParquetBidStore(self.root).read(run_id="sim")
+        self.assertEqual(len(df), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+import random
+import numpy as np
+import torch
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.agents.population import DQNPopulation, PopulationTrainer
+from src.core.bidding_simulation import BiddingSimulation
+
+
+class TestDQNPopulation(unittest.TestCase):
+    """Tests for the batched multi-agent DQN engine."""
+
+    def make_agents(self, count=64):
+        torch.manual_seed(0)
+        return [DQNBiddingAgent(name=f"Agent {i}", exploration_rate=0.3) for i in range(count)]
+
+    def test_bit_identical_to_per_agent_path(self):
+        """Batched bids must match per-agent bids exactly under a fixed seed."""
+        agents = self.make_agents()
+        population = DQNPopulation(agents)
+
+        for threshold, rounds_remaining in [(100, 19), (523.125, 7), (1000.7, 0)]:
+            random.seed(42)
+            expected = {a.name: a.generate_bid(threshold, rounds_remaining) for a in agents}
+            random.seed(42)
+            actual = population.generate_bids(threshold, rounds_remaining)
+            self.assertEqual(expected, actual)
+
+    def test_raw_q_values_match(self):
+        """Greedy raw outputs match bit for bit, not only after rounding."""
+        agents = self.make_agents()
+        for agent in agents:
+            agent.exploration_rate = 0
+        population = DQNPopulation(agents)
+
+        state = torch.tensor([731.3, 12], dtype=torch.float32)
+        with torch.no_grad():
+            expected = [agent.model.greedy(state).item() for agent in agents]
+        self.assertEqual(expected, population.policy_bids(731.3, 12))
+
+    def test_picks_up_training_between_rounds(self):
+        """Weights are re-stacked so trained agents are evaluated with new parameters."""
+        agents = self.make_agents(8)
+        for agent in agents:
+            agent.exploration_rate = 0
+        population = DQNPopulation(agents)
+        before = population.generate_bids(100, 5)
+
+        for agent in agents:
+            agent.update_reward(10)
+            agent.exploration_rate = 0
+
+        random.seed(1)
+        expected = {a.name: a.generate_bid(100, 5) for a in agents}
+        self.assertEqual(expected, population.generate_bids(100, 5))
+        self.assertNotEqual(before, expected)
+
+
+class TestPopulationTrainer(unittest.TestCase):
+    """One backward pass and Adam step for all agents, equivalent to per-agent training."""
+
+    def make_agents(self, count=6, **kwargs):
+        torch.manual_seed(0)
+        return [DQNBiddingAgent(name=f"Agent {i}", learning_rate=0.01 * (1 + i % 3), **kwargs) for i in range(count)]
+
+    def play(self, agents, rounds, update):
+        for round_num in range(rounds):
+            random.seed(round_num)
+            np.random.seed(round_num)
+            for agent in agents:
+                agent.generate_bid(100 + round_num, rounds - round_num)
+            update([10 if i == round_num % len(agents) else -5 for i in range(len(agents))])
+
+    def assert_same_models(self, expected, actual, tolerance):
+        for a, b in zip(expected, actual):
+            self.assertEqual(a.train_steps, b.train_steps)
+            for pa, pb in zip(a.model.parameters(), b.model.parameters()):
+                torch.testing.assert_close(pa, pb, rtol=tolerance, atol=tolerance)
+
+    def compare(self, rounds, tolerance, **kwargs):
+        expected, actual = self.make_agents(**kwargs), self.make_agents(**kwargs)
+        trainer = PopulationTrainer(actual)
+
+        def per_agent(rewards):
+            for agent, reward in zip(expected, rewards):
+                agent.update_reward(reward)
+
+        self.play(expected, rounds, per_agent)
+        self.play(actual, rounds, trainer.update_rewards)
+        self.assert_same_models(expected, actual, tolerance)
+        return expected, actual, trainer
+
+    def test_matches_per_agent_training(self):
+        self.compare(rounds=3, tolerance=1e-4)
+
+    def test_matches_per_agent_replay_training(self):
+        expected, actual, _ = self.compare(rounds=12, tolerance=1e-4, replay_capacity=64, batch_size=4, train_every=2,
+                                           td_target=True, target_tau=0.1)
+        self.assertGreater(actual[0].train_steps, 0)
+        for a, b in zip(expected, actual):
+            for pa, pb in zip(a.target_model.parameters(), b.target_model.parameters()):
+                torch.testing.assert_close(pa, pb, rtol=1e-4, atol=1e-4)
+
+    def test_agents_not_due_are_untouched(self):
+        agents = self.make_agents(3, replay_capacity=64, batch_size=2)
+        agents[1].train_every = 3
+        trainer = PopulationTrainer(agents)
+        self.play(agents, 3, trainer.update_rewards)  # Replay holds two transitions from round 3 on
+
+        before = [p.clone() for p in agents[1].model.parameters()]
+        moments = trainer.exp_avg["fc1.weight"][1].clone()
+        random.seed(3)
+        for agent in agents:
+            agent.generate_bid(100, 1)
+        trainer.update_rewards([10, -5, -5])  # Round 4: agent 1 is not due
+        for p, old in zip(agents[1].model.parameters(), before):
+            self.assertTrue(torch.equal(p, old))
+        self.assertTrue(torch.equal(trainer.exp_avg["fc1.weight"][1], moments))
+        self.assertEqual([agent.train_steps for agent in agents], [2, 1, 2])
+
+    def test_optimizer_state_round_trip(self):
+        """Adam state written back to the agents restarts an identical trainer."""
+        _, agents, trainer = self.compare(rounds=3, tolerance=1e-4)
+        trainer.write_back()
+        restarted = PopulationTrainer(agents)
+        self.assertTrue(torch.equal(restarted.steps, trainer.steps))
+        for name in trainer.exp_avg_sq:
+            self.assertTrue(torch.equal(restarted.exp_avg_sq[name], trainer.exp_avg_sq[name]))
+
+    def test_vectorized_simulation_reads_trained_weights(self):
+        agents = self.make_agents(4)
+        simulation = BiddingSimulation(agents, rounds=5, persist=False, verbose=False, vectorized=True,
+                                       population_training=True)
+        simulation.run_simulation()
+        for agent in agents:
+            agent.exploration_rate = 0
+        random.seed(1)
+        expected = {a.name: a.generate_bid(100, 5) for a in agents}
+        self.assertEqual(expected, simulation.population.generate_bids(100, 5))
+        self.assertEqual(simulation.optimizer_steps(), 4 * 5)
+
+    def test_rejects_mixed_batch_sizes(self):
+        agents = self.make_agents(2, replay_capacity=16)
+        agents[1].batch_size = 8
+        with self.assertRaises(ValueError):
+            PopulationTrainer(agents)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import random
+import numpy as np
+import torch
+from src.agents.bidding_agent import DQNBiddingAgent
+from src.agents.replay_buffer import ReplayBuffer
+from src.core.bidding_simulation import BiddingSimulation
+from src.utils.llm_client import LLMClient, set_llm_client
+
+
+class TestReplayBuffer(unittest.TestCase):
+    """Tests for the ring-buffer replay memory."""
+
+    def test_push_and_wraparound(self):
+        """Buffer keeps only the newest transitions once full."""
+        buffer = ReplayBuffer(capacity=3)
+        for i in range(5):
+            buffer.push((i, i), i, float(i), (i + 1, i))
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(sorted(buffer.bids.tolist()), [2.0, 3.0, 4.0])
+
+    def test_sample_shapes(self):
+        """Sampled minibatches have one row per requested transition."""
+        buffer = ReplayBuffer(capacity=10)
+        for i in range(10):
+            buffer.push((100, i), 95.0, 10.0, (101, i - 1))
+
+        states, bids, rewards, next_states = buffer.sample(4)
+        self.assertEqual(states.shape, (4, 2))
+        self.assertEqual(next_states.shape, (4, 2))
+        self.assertEqual(bids.dtype, np.float32)
+        self.assertTrue(np.all(rewards == 10.0))
+
+
+class TestReplayTraining(unittest.TestCase):
+    """Tests for minibatch training in DQNBiddingAgent.update_reward."""
+
+    def setUp(self):
+        random.seed(0)
+        np.random.seed(0)
+        torch.manual_seed(0)
+
+    def test_stores_state_that_was_bid_on(self):
+        """Transitions hold the real bid state, completed by the next bid."""
+        agent = DQNBiddingAgent("Agent 1", replay_capacity=8, batch_size=4)
+        bid = agent.generate_bid(120, 9)
+        agent.update_reward(10)
+        self.assertEqual(len(agent.replay), 0)
+
+        agent.generate_bid(118, 8)
+        self.assertEqual(len(agent.replay), 1)
+        self.assertEqual(agent.replay.states[0].tolist(), [120, 9])
+        self.assertEqual(agent.replay.next_states[0].tolist(), [118, 8])
+        self.assertAlmostEqual(float(agent.replay.bids[0]), bid, places=2)
+        self.assertEqual(agent.replay.rewards[0], 10)
+
+    def test_trains_every_n_rounds(self):
+        """Optimizer steps only run every train_every updates once a batch is available."""
+        agent = DQNBiddingAgent("Agent 1", replay_capacity=64, batch_size=4, train_every=5)
+        for round_num in range(40):
+            agent.generate_bid(100, 40 - round_num)
+            agent.update_reward(10 if round_num % 2 else -5)
+
+        self.assertEqual(agent.train_steps, 8)  # updates 5, 10, ..., 40
+
+    def test_simulation_stores_terminal_transition(self):
+        """The last round's transition reaches replay memory instead of staying pending."""
+        set_llm_client(LLMClient(api_key=""))
+        self.addCleanup(set_llm_client, None)
+        agent = DQNBiddingAgent("Agent 1", replay_capacity=8, batch_size=4, td_target=True)
+        BiddingSimulation([agent], rounds=3, persist=False, verbose=False).run_simulation()
+
+        self.assertEqual(len(agent.replay), 3)
+        self.assertIsNone(agent.pending_transition)
+        self.assertEqual(agent.replay.states[:3, 1].tolist(), [2, 1, 0])  # Rounds remaining; 0 is terminal
+
+    def test_legacy_mode_unchanged(self):
+        """Without a replay buffer each reward triggers one optimizer step."""
+        agent = DQNBiddingAgent("Agent 1")
+        agent.generate_bid(100, 5)
+        agent.update_reward(10)
+        self.assertIsNone(agent.replay)
+        self.assertEqual(agent.train_steps, 1)
+
+
+class TestTargetNetwork(unittest.TestCase):
+    """Tests for the TD-target mode with a frozen target network."""
+
+    def setUp(self):
+        torch.manual_seed(0)
+
+    def test_requires_replay(self):
+        """TD targets need stored next states."""
+        with self.assertRaises(ValueError):
+            DQNBiddingAgent("Agent 1", td_target=True)
+
+    def test_td_targets_bootstrap_except_terminal(self):
+        """Targets are r + gamma * Q_target(s'), without bootstrapping on the last round."""
+        agent = DQNBiddingAgent("Agent 1", replay_capacity=8, td_target=True, discount_factor=0.5)
+        states = torch.tensor([[100, 3], [100, 0]], dtype=torch.float32)
+        next_states = torch.tensor([[90, 2], [90, 0]], dtype=torch.float32)
+        rewards = torch.tensor([10, -5], dtype=torch.float32)
+
+        targets = agent.compute_targets(rewards, states, next_states)
+        with torch.no_grad():
+            next_q = agent.target_model(next_states[:1]).item()
+        self.assertAlmostEqual(targets[0].item(), 10 + 0.5 * next_q, places=4)
+        self.assertEqual(targets[1].item(), -5)
+
+    def test_hard_sync_every_k_steps(self):
+        """The target network is frozen between hard syncs."""
+        agent = DQNBiddingAgent("Agent 1", replay_capacity=8, batch_size=2, td_target=True, target_sync_every=3)
+        for i in range(4):
+            agent.replay.push((100, 5), 100, 10, (100, 4))
+        frozen = agent.target_model.fc3.bias.clone()
+
+        agent.fit(*agent.replay_batch())
+        agent.fit(*agent.replay_batch())
+        self.assertTrue(torch.equal(frozen, agent.target_model.fc3.bias))
+
+        agent.fit(*agent.replay_batch())
+        self.assertTrue(torch.equal(agent.model.fc3.bias, agent.target_model.fc3.bias))
+
+    def test_polyak_sync(self):
+        """Polyak averaging moves the target a fraction tau towards the online network."""
+        agent = DQNBiddingAgent("Agent 1", replay_capacity=8, batch_size=2, td_target=True, target_tau=0.1)
+        for i in range(4):
+            agent.replay.push((100, 5), 100, 10, (100, 4))
+        before = agent.target_model.fc3.bias.clone()
+
+        agent.fit(*agent.replay_batch())
+        expected = before + 0.1 * (agent.model.fc3.bias.detach() - before)
+        self.assertTrue(torch.allclose(agent.target_model.fc3.bias, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()